@@ -1,27 +1,189 @@
 # benchmark_suite.py
 import os
-import csv
+import sys
 import time
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 from jedi_council.core import TheJediCouncil
+from jedi_council.cache import ResponseCache
+from jedi_council.results import ResultStore
 from jedi_council.utils.council_log import show_banner
 import argparse
 parser = argparse.ArgumentParser()
 parser.add_argument("--verbose", action="store_true", help="Show detailed logs")
+parser.add_argument("--concurrency", type=int, default=1,
+                    help="Max calls in flight across the whole suite (1 runs sequentially)")
+parser.add_argument("--per-provider", type=int, default=2,
+                    help="Max calls in flight per provider when --concurrency > 1")
+parser.add_argument("--cache", metavar="PATH",
+                    help="Serve repeated (task, model) calls from a SQLite response cache at PATH")
+parser.add_argument("--system-prompt", metavar="PATH",
+                    help="Prepend the system prompt in PATH to every task, e.g. to measure prompt caching")
+parser.add_argument("--prompt-cache", action="store_true",
+                    help="Mark the system prompt as a cacheable prefix for providers' prompt caches")
+parser.add_argument("--results", metavar="PATH", default=os.path.join("benchmark_runs", "results.sqlite"),
+                    help="SQLite store each result is appended to as soon as it completes")
+parser.add_argument("--resume", metavar="RUN_ID", nargs="?", const="latest",
+                    help="Continue RUN_ID (default: the latest unfinished run), skipping pairs that already succeeded")
+parser.add_argument("--no-csv", action="store_true", help="Don't export the run to a CSV when it finishes")
+parser.add_argument("--trials", type=int, default=1,
+                    help="Measured calls per (task, model) pair; `jedi-council compare` needs several")
+parser.add_argument("--warmup", type=int, default=0,
+                    help="Unrecorded calls per (task, model) pair before the trials, to warm connections")
+parser.add_argument("--baseline", metavar="RUN_ID",
+                    help="After the run, compare it against RUN_ID and exit non-zero on regressions")
 args = parser.parse_args()
+if args.cache and (args.trials > 1 or args.warmup):
+    # Every trial after the first, and every measured call after a warm-up, would be a cache hit.
+    parser.error("--cache can't be combined with --trials > 1 or --warmup")
 
-import logging
-if not args.verbose:
-    logging.getLogger().setLevel(logging.WARNING)
+from jedi_council.core import configure_logging
+# Honour LOG_LEVEL with --verbose; otherwise only show warnings.
+configure_logging(None if args.verbose else "WARNING")
 # Directory to save logs
 LOG_DIR = "benchmark_runs"
 os.makedirs(LOG_DIR, exist_ok=True)
 
-def save_results_to_csv(results, file_path):
-    with open(file_path, mode="w", newline="") as file:
-        writer = csv.DictWriter(file, fieldnames=results[0].keys())
-        writer.writeheader()
-        writer.writerows(results)
+def error_result(run_id, task, model, error, trial=0):
+    return {
+        "timestamp": datetime.now().isoformat(),
+        "run_id": run_id,
+        "task_name": task["name"],
+        "model": model,
+        "trial": trial,
+        "latency_ms": None,
+        "ttft_ms": None,
+        "tokens_per_sec": None,
+        "input_tokens": 0,
+        "output_tokens": 0,
+        "cost": 0.0,
+        "cache_read_tokens": 0,
+        "cache_write_tokens": 0,
+        "cached": False,
+        "error": str(error),
+        "text": None,
+    }
+
+def task_messages(task, system_prompt=None):
+    messages = [{"role": "user", "content": task["prompt"]}]
+    if system_prompt:
+        messages.insert(0, {"role": "system", "content": system_prompt})
+    return messages
+
+def run_task(council, run_id, task, model, limiter=None, system_prompt=None, trial=0):
+    """Runs one trial of a (task, model) pair. `limiter` caps in-flight calls for the model's provider."""
+    if limiter is not None:
+        limiter.acquire()
+    try:
+        start_time = time.time()
+        # Stream so we can record time-to-first-token, i.e. perceived latency. Setup is retried like get_wisdom.
+        response = council.stream_wisdom(task_messages(task, system_prompt)).final_response()
+        latency = time.time() - start_time
+        if response.failed:
+            return error_result(run_id, task, model, response.error or response.text, trial)
+        return {
+            "timestamp": datetime.now().isoformat(),
+            "run_id": run_id,
+            "task_name": task["name"],
+            "model": model,
+            "trial": trial,
+            "latency_ms": round(latency * 1000),
+            "ttft_ms": round(response.ttft_ms) if response.ttft_ms is not None else None,
+            "tokens_per_sec": round(response.tokens_per_sec, 1) if response.tokens_per_sec else None,
+            "input_tokens": getattr(response.usage, "input_tokens", 0),
+            "output_tokens": getattr(response.usage, "output_tokens", 0),
+            "cost": getattr(response.usage, "cost", 0.0),
+            "cache_read_tokens": response.usage.cache_read_tokens,
+            "cache_write_tokens": response.usage.cache_write_tokens,
+            "cached": response.cached,
+            "error": None,
+            "text": response.text,
+        }
+    except Exception as e:
+        return error_result(run_id, task, model, e, trial)
+    finally:
+        if limiter is not None:
+            limiter.release()
+
+def convene_councils(models, cache=None, prompt_cache=False):
+    """Builds each model's council (and SDK client) once so every task reuses it."""
+    councils, failures = {}, {}
+    for model in models:
+        try:
+            councils[model] = TheJediCouncil(model=model, cache=cache, prompt_cache=prompt_cache)
+        except Exception as e:
+            failures[model] = e
+    return councils, failures
+
+def pending_trials(task, model, trials, done):
+    return [trial for trial in range(trials) if (task["name"], model, trial) not in done]
+
+def warm_up(tasks, models, councils, trials, warmup, done=frozenset(), system_prompt=None):
+    """Makes `warmup` unrecorded calls per pair that still has trials to run, so connection setup isn't timed."""
+    if not warmup:
+        return
+    print(f"Warming up: {warmup} call(s) per (task, model) pair, not recorded\n")
+    for task in tasks:
+        for model in models:
+            if model in councils and pending_trials(task, model, trials, done):
+                for _ in range(warmup):
+                    run_task(councils[model], None, task, model, system_prompt=system_prompt)
+
+def run_sequential(tasks, models, councils, failures, run_id, store, done=frozenset(), system_prompt=None,
+                   trials=1):
+    """Runs the task × model matrix in order, appending each result to `store` as it completes."""
+    for task in tasks:
+        print(f"→ Task: {task['name']}")
+        for model in models:
+            pending = pending_trials(task, model, trials, done)
+            if not pending:
+                print(f"   - {model}: done earlier ⏭")
+                continue
+            print(f"   - {model}: running...", end=" ")
+            for trial in pending:
+                if model in failures:
+                    result = error_result(run_id, task, model, failures[model], trial)
+                else:
+                    result = run_task(councils[model], run_id, task, model, system_prompt=system_prompt, trial=trial)
+                store.append(result)
+                print("❌" if result["error"] is not None else "✅", end="")
+            print()
+
+def run_concurrent(tasks, models, councils, failures, run_id, store, concurrency, per_provider, done=frozenset(),
+                   system_prompt=None, trials=1):
+    """Runs the task × model matrix on a thread pool, capping in-flight calls per provider."""
+    limiters = defaultdict(lambda: threading.BoundedSemaphore(per_provider))
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        futures = []
+        # Trial-major order, so every pair's trials are spread over the run rather than bunched together.
+        for trial in range(trials):
+            for task in tasks:
+                for model in models:
+                    if (task["name"], model, trial) in done:
+                        continue
+                    if model in failures:
+                        store.append(error_result(run_id, task, model, failures[model], trial))
+                        continue
+                    council = councils[model]
+                    futures.append(pool.submit(run_task, council, run_id, task, model,
+                                               limiters[council.provider_name], system_prompt, trial))
+        for future in as_completed(futures):
+            result = future.result()
+            store.append(result)
+            status = "❌" if result["error"] is not None else "✅"
+            print(f"   - {result['task_name']} / {result['model']} #{result['trial']}: {status}")
+
+def print_prompt_cache_ratios(rows):
+    """Share of each model's prompt tokens served from the provider's prefix cache."""
+    totals = defaultdict(lambda: [0, 0])
+    for row in rows:
+        totals[row["model"]][0] += row["cache_read_tokens"] or 0
+        totals[row["model"]][1] += row["input_tokens"] or 0
+    print("Prompt cache hit ratio:")
+    for model, (read, prompt) in totals.items():
+        print(f"   - {model}: {read / prompt:.1%} of {prompt} prompt tokens" if prompt else f"   - {model}: n/a")
 
 def run_benchmark():
     show_banner()
@@ -55,48 +217,66 @@ def run_benchmark():
         "gemini-1.5-pro"
     ]
 
-    all_results = []
-    run_id = datetime.now().strftime("%Y%m%d_%H%M%S")
+    store = ResultStore(args.results)
+    if args.baseline and args.baseline not in {run["run_id"] for run in store.runs()}:
+        parser.error(f"No baseline run {args.baseline!r} in {args.results}")
+    run_id, done = datetime.now().strftime("%Y%m%d_%H%M%S"), set()
+    if args.resume:
+        run_id = store.latest_run_id(unfinished=True) if args.resume == "latest" else args.resume
+        if run_id is None:
+            parser.error(f"No unfinished run to resume in {args.results}")
+        done = store.completed(run_id)
+    store.start_run(run_id, {"tasks": [task["name"] for task in tasks], "models": models,
+                             "trials": args.trials, "warmup": args.warmup})
     print(f"\nRunning benchmark suite – Experiment ID: {run_id}\n")
+    total_calls = len(tasks) * len(models) * args.trials
+    if done:
+        print(f"Resuming: {len(done)} of {total_calls} calls already done\n")
 
-    for task in tasks:
-        print(f"→ Task: {task['name']}")
-        for model in models:
-            print(f"   - {model}: running...", end=" ")
-            council = TheJediCouncil(model=model)
-            try:
-                start_time = time.time()
-                response = council.get_wisdom(task["prompt"])
-                latency = time.time() - start_time
-                all_results.append({
-                    "timestamp": datetime.now().isoformat(),
-                    "run_id": run_id,
-                    "task_name": task["name"],
-                    "model": model,
-                    "latency_ms": f"{latency * 1000:.0f}",
-                    "input_tokens": getattr(response.usage, "input_tokens", 0),
-                    "output_tokens": getattr(response.usage, "output_tokens", 0),
-                    "cost": getattr(response.usage, "cost", 0.0),
-                    "text": response.text.replace("\n", " ")[:500],
-                })
-                print("✅")
-            except Exception as e:
-                all_results.append({
-                    "timestamp": datetime.now().isoformat(),
-                    "run_id": run_id,
-                    "task_name": task["name"],
-                    "model": model,
-                    "latency_ms": -1,
-                    "input_tokens": 0,
-                    "output_tokens": 0,
-                    "cost": 0.0,
-                    "text": f"[ERROR] {str(e)}"
-                })
-                print("❌")
-
-    output_path = os.path.join(LOG_DIR, f"benchmark_{run_id}.csv")
-    save_results_to_csv(all_results, output_path)
-    print(f"\nSaved benchmark results to: {output_path}\n")
+    suite_start = time.perf_counter()
+    cache = ResponseCache(path=args.cache) if args.cache else None
+    system_prompt = None
+    if args.system_prompt:
+        with open(args.system_prompt, encoding="utf-8") as file:
+            system_prompt = file.read()
+    councils, failures = convene_councils(models, cache=cache, prompt_cache=args.prompt_cache)
+    warm_up(tasks, models, councils, args.trials, args.warmup, done, system_prompt)
+    if args.concurrency > 1:
+        print(f"Running {total_calls} calls with concurrency {args.concurrency} "
+              f"({args.per_provider} per provider)\n")
+        run_concurrent(tasks, models, councils, failures, run_id, store,
+                       args.concurrency, args.per_provider, done, system_prompt, args.trials)
+    else:
+        run_sequential(tasks, models, councils, failures, run_id, store, done, system_prompt, args.trials)
+    # On a resumed run this covers the last session only.
+    suite_wall_ms = (time.perf_counter() - suite_start) * 1000
+    store.finish_run(run_id, suite_wall_ms)
+
+    print(f"\nSuite wall-clock: {suite_wall_ms / 1000:.1f}s")
+    if cache is not None:
+        print(f"Cache: {cache.stats.hits} hits, {cache.stats.misses} misses")
+    print_prompt_cache_ratios(store.iter_rows(run_id))
+    print(f"Saved benchmark results to: {args.results} (run {run_id})")
+    if not args.no_csv:
+        output_path = os.path.join(LOG_DIR, f"benchmark_{run_id}.csv")
+        store.export_csv(output_path, run_id)
+        print(f"Exported CSV to: {output_path}")
+    print()
+    regressed = False
+    if args.baseline:
+        from jedi_council.compare import compare_runs, print_comparison
+        try:
+            comparisons = compare_runs(store, args.baseline, run_id)
+        except ValueError as e:
+            print(f"Can't compare: {e}")
+            store.close()
+            return 2
+        print_comparison(comparisons, args.baseline, run_id)
+        regressed = any(c.regressed for c in comparisons)
+    else:
+        print(f"Compare with: jedi-council compare --results {args.results} --baseline <RUN_ID> --candidate {run_id}")
+    store.close()
+    return 1 if regressed else 0
 
 if __name__ == "__main__":
-    run_benchmark()
+    sys.exit(run_benchmark())
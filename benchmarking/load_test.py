@@ -0,0 +1,200 @@
+# load_test.py
+"""
+Load-generation mode: drives many concurrent consultations and reports throughput, latency
+percentiles, error rates and the framework's own client-side overhead.
+
+Without --base-url it starts the bundled mock provider server (jedi_council.mock_server). That way
+capacity can be planned and overhead measured with no network and no API keys.
+
+    python benchmarking/load_test.py --mode open --rps 50 --duration 30 --ramp-up 5
+    python benchmarking/load_test.py --mode closed --users 20 --provider anthropic --mock-sigma 0.8
+"""
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+from collections import Counter
+from dataclasses import dataclass, asdict
+from typing import List, Optional
+
+from jedi_council.core import TheJediCouncil, configure_logging
+from jedi_council.mock_server import MockConfig, MockProviderServer
+
+DEFAULT_MODELS = {
+    "openai": "gpt-4o",
+    "anthropic": "claude-3-haiku-20240307",
+    "mistral": "mistral-large-latest",
+}
+PROMPT = "If all Wookies are strong and Chewbacca is a Wookie, is Chewbacca strong? Explain."
+
+
+@dataclass
+class Sample:
+    sent_s: float  # Seconds after the test started
+    latency_ms: float  # Client-observed, retries and rate-limit waits included
+    failed: bool
+    error_kind: Optional[str]
+    attempts: int
+
+
+async def consult(council, started, samples):
+    sent = time.perf_counter()
+    response = await council.aget_wisdom(PROMPT)
+    samples.append(Sample(sent_s=sent - started, latency_ms=(time.perf_counter() - sent) * 1000,
+                          failed=response.failed, error_kind=response.error.kind.value if response.error else None,
+                          attempts=response.attempts))
+
+
+def arrival_time(k, rps, ramp_up):
+    """When the k-th request (0-based) is sent, for a rate ramping linearly from 0 to `rps` over `ramp_up` seconds."""
+    ramp_arrivals = rps * ramp_up / 2  # The area under the ramp
+    if k < ramp_arrivals:
+        return (2 * ramp_up * k / rps) ** 0.5
+    return ramp_up / 2 + k / rps
+
+
+async def open_loop(council, rps, duration, ramp_up, samples):
+    """Fixed arrival rate: requests are sent on schedule whether or not earlier ones have finished."""
+    started = time.perf_counter()
+    in_flight, k = set(), 0
+    while (send_at := arrival_time(k, rps, ramp_up)) < duration:
+        delay = started + send_at - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        task = asyncio.create_task(consult(council, started, samples))
+        in_flight.add(task)
+        task.add_done_callback(in_flight.discard)
+        k += 1
+    if in_flight:
+        await asyncio.gather(*in_flight)
+
+
+async def closed_loop(council, users, duration, ramp_up, samples):
+    """N concurrent users, each sending its next request as soon as the last one returns."""
+    started = time.perf_counter()
+
+    async def user(index):
+        await asyncio.sleep(ramp_up * index / users)
+        while time.perf_counter() - started < duration:
+            await consult(council, started, samples)
+
+    await asyncio.gather(*(user(i) for i in range(users)))
+
+
+def percentile(values: List[float], q: float) -> Optional[float]:
+    if not values:
+        return None
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+
+def build_report(samples, args, wall_s, server=None):
+    # Only requests sent after the ramp-up count towards steady-state figures.
+    steady = [s for s in samples if s.sent_s >= args.ramp_up]
+    window_s = max(1e-9, args.duration - args.ramp_up)
+    ok = [s.latency_ms for s in steady if not s.failed]
+    report = {
+        "mode": args.mode,
+        "provider": args.provider,
+        "model": args.model,
+        "offered_rps": args.rps if args.mode == "open" else None,
+        "users": args.users if args.mode == "closed" else None,
+        "requests": len(samples),
+        "steady_requests": len(steady),
+        "achieved_rps": round(len([s for s in steady if not s.failed]) / window_s, 2),
+        "error_rate": round(sum(s.failed for s in steady) / len(steady), 4) if steady else None,
+        "errors": dict(Counter(s.error_kind for s in steady if s.failed)),
+        "retried": sum(s.attempts > 1 for s in steady),
+        "latency_ms": {name: round(value, 1) if value is not None else None for name, value in (
+            ("p50", percentile(ok, 0.50)), ("p90", percentile(ok, 0.90)), ("p95", percentile(ok, 0.95)),
+            ("p99", percentile(ok, 0.99)), ("max", max(ok) if ok else None))},
+        "wall_s": round(wall_s, 2),
+    }
+    if server is not None:
+        # Client overhead: what the framework adds on top of the server's own handling time.
+        single = [s.latency_ms for s in samples if not s.failed and s.attempts == 1]
+        mean_client = sum(single) / len(single) if single else 0.0
+        report["server"] = {**asdict(server.stats), "mean_service_ms": round(server.stats.mean_service_ms, 2)}
+        report["client_overhead_ms"] = round(mean_client - server.stats.mean_service_ms, 2) if single else None
+    return report
+
+
+def print_report(report):
+    print(f"\nLoad test ({report['mode']} loop) against {report['provider']}/{report['model']}")
+    if report["offered_rps"]:
+        print(f"   Offered rate:    {report['offered_rps']} req/s")
+    if report["users"]:
+        print(f"   Users:           {report['users']}")
+    print(f"   Requests:        {report['requests']} ({report['steady_requests']} after ramp-up)")
+    print(f"   Throughput:      {report['achieved_rps']} req/s")
+    print(f"   Error rate:      {report['error_rate']} {report['errors'] or ''}")
+    print("   Latency (ms):    " + "  ".join(f"{k}={v}" for k, v in report["latency_ms"].items()))
+    if "client_overhead_ms" in report:
+        print(f"   Server service:  {report['server']['mean_service_ms']} ms mean")
+        print(f"   Client overhead: {report['client_overhead_ms']} ms mean per request")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mode", choices=["open", "closed"], default="open",
+                        help="open: fixed arrival rate; closed: N users back to back")
+    parser.add_argument("--rps", type=float, default=50.0, help="Arrival rate for --mode open")
+    parser.add_argument("--users", type=int, default=10, help="Concurrent users for --mode closed")
+    parser.add_argument("--duration", type=float, default=30.0, help="Seconds of load, ramp-up included")
+    parser.add_argument("--ramp-up", type=float, default=5.0, help="Seconds to ramp up to full load")
+    parser.add_argument("--provider", choices=sorted(DEFAULT_MODELS), default="openai")
+    parser.add_argument("--model", help="Defaults to a model of --provider")
+    parser.add_argument("--base-url", help="Target a real endpoint or proxy instead of the bundled mock server")
+    parser.add_argument("--mock-latency-ms", type=float, default=200.0, help="Mock median response time")
+    parser.add_argument("--mock-sigma", type=float, default=0.5, help="Mock log-normal latency spread (0 = fixed)")
+    parser.add_argument("--mock-error-rate", type=float, default=0.0, help="Share of mock requests failing with 503")
+    parser.add_argument("--mock-rate-limit-rate", type=float, default=0.0, help="Share of mock requests given 429")
+    parser.add_argument("--output-tokens", type=int, default=32, help="Mock tokens per response")
+    parser.add_argument("--json", metavar="PATH", help="Also write the report as JSON to PATH")
+    parser.add_argument("--verbose", action="store_true", help="Show detailed logs")
+    args = parser.parse_args(argv)
+    args.model = args.model or DEFAULT_MODELS[args.provider]
+    args.ramp_up = min(args.ramp_up, args.duration)
+    return args
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    configure_logging(None if args.verbose else "WARNING")
+
+    server = None
+    base_url = args.base_url
+    if base_url is None:
+        server = MockProviderServer(MockConfig(median_ms=args.mock_latency_ms, sigma=args.mock_sigma,
+                                               error_rate=args.mock_error_rate,
+                                               rate_limit_rate=args.mock_rate_limit_rate,
+                                               output_tokens=args.output_tokens)).start()
+        base_url = server.base_url(args.provider)
+        # The mock server accepts any key.
+        for variable in ("OPENAI_API_KEY", "ANTHROPIC_API_KEY", "MISTRAL_API_KEY"):
+            os.environ.setdefault(variable, "mock")
+
+    council = TheJediCouncil(model=args.model, base_url=base_url)
+    samples: List[Sample] = []
+    started = time.perf_counter()
+    try:
+        if args.mode == "open":
+            asyncio.run(open_loop(council, args.rps, args.duration, args.ramp_up, samples))
+        else:
+            asyncio.run(closed_loop(council, args.users, args.duration, args.ramp_up, samples))
+    finally:
+        if server is not None:
+            server.stop()
+    report = build_report(samples, args, time.perf_counter() - started, server)
+
+    print_report(report)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as file:
+            json.dump(report, file, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,115 @@
+# memory_benchmark.py
+"""
+Measures the memory held by many responses under each `raw_response` mode, and by a
+ResponseBatch. No API calls: responses are built from synthetic OpenAI ChatCompletion objects.
+
+    python benchmarking/memory_benchmark.py --responses 50000
+"""
+import sys
+import json
+import random
+import argparse
+import tracemalloc
+import dataclasses
+
+from openai.types.chat import ChatCompletion
+
+from jedi_council.core import CouncilResponse, UsageInfo, trim_raw_response
+from jedi_council.columnar import ResponseBatch
+from jedi_council.utils.utils import estimate_cost
+
+_WORDS = "the council weighs every question with patience and the force guides its answer".split()
+
+
+def _without_slots(cls):
+    """A plain-dataclass copy of `cls`, i.e. the layout before __slots__, for comparison."""
+    fields = [(f.name, f.type, dataclasses.field(default=f.default)) if f.default is not dataclasses.MISSING
+              else (f.name, f.type) for f in dataclasses.fields(cls)]
+    return dataclasses.make_dataclass(f"Dict{cls.__name__}", fields)
+
+
+DictUsageInfo = _without_slots(UsageInfo)
+DictCouncilResponse = _without_slots(CouncilResponse)
+
+
+def completion(index, rng, words):
+    text = " ".join(rng.choice(_WORDS) for _ in range(words))
+    return ChatCompletion.model_validate({
+        "id": f"chatcmpl-{index:08d}", "object": "chat.completion", "created": 1_722_000_000 + index,
+        "model": "gpt-4o-2024-08-06", "system_fingerprint": "fp_mock",
+        "choices": [{"index": 0, "message": {"role": "assistant", "content": text, "refusal": None},
+                     "logprobs": None, "finish_reason": "stop"}],
+        "usage": {"prompt_tokens": 40 + index % 50, "completion_tokens": words, "total_tokens": 40 + index % 50 + words,
+                  "prompt_tokens_details": {"cached_tokens": 0, "audio_tokens": 0},
+                  "completion_tokens_details": {"reasoning_tokens": 0, "audio_tokens": 0}},
+    })
+
+
+def response_from(raw, response_cls=CouncilResponse, usage_cls=UsageInfo):
+    usage = raw.usage
+    return response_cls(
+        text=raw.choices[0].message.content,
+        model="gpt-4o",
+        usage=usage_cls(usage.prompt_tokens, usage.completion_tokens,
+                        estimate_cost("gpt-4o", usage.prompt_tokens, usage.completion_tokens)),
+        latency_ms=800.0 + raw.created % 400,
+        raw_response=raw,
+    )
+
+
+def measure(build):
+    """Bytes still allocated once `build()` has returned its result."""
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    kept = build()
+    held = tracemalloc.get_traced_memory()[0] - baseline
+    tracemalloc.stop()
+    del kept
+    return held
+
+
+def scenarios(count, words, seed):
+    def responses(mode, **classes):
+        rng = random.Random(seed)
+        return [trim_raw_response(response_from(completion(i, rng, words), **classes), mode) for i in range(count)]
+
+    def batch():
+        rng = random.Random(seed)
+        return ResponseBatch.from_responses(trim_raw_response(response_from(completion(i, rng, words)), "drop")
+                                            for i in range(count))
+
+    return [
+        ("raw_response=keep", lambda: responses("keep")),
+        ("raw_response=json", lambda: responses("json")),
+        ("raw_response=drop, no __slots__",
+         lambda: responses("drop", response_cls=DictCouncilResponse, usage_cls=DictUsageInfo)),
+        ("raw_response=drop", lambda: responses("drop")),
+        ("ResponseBatch", batch),
+    ]
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--responses", type=int, default=20_000, help="Responses to build per scenario")
+    parser.add_argument("--words", type=int, default=120, help="Words per response text")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", metavar="PATH", help="Also write the results as JSON to PATH")
+    args = parser.parse_args(argv)
+
+    results = {}
+    print(f"Memory held by {args.responses} responses of ~{args.words} words:")
+    baseline = None
+    for name, build in scenarios(args.responses, args.words, args.seed):
+        held = measure(build)
+        baseline = baseline or held
+        results[name] = {"bytes": held, "bytes_per_response": held / args.responses}
+        print(f"   {name:<34} {held / 2**20:8.1f} MiB  {held / args.responses:8.0f} B/response  "
+              f"({held / baseline:.0%} of keep)")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,104 @@
+# semantic_cache_benchmark.py
+"""
+Measures SemanticCache lookup latency and hit rate at scale. No API calls: the cache is filled
+with synthetic prompts, then queried with lightly reworded copies of stored prompts (which
+should hit) and with unseen prompts (which should miss).
+
+    python benchmarking/semantic_cache_benchmark.py --entries 100000
+    python benchmarking/semantic_cache_benchmark.py --entries 100000 --exact   # No inverted file
+"""
+import sys
+import time
+import random
+import argparse
+import tempfile
+
+import numpy as np
+
+from jedi_council.core import CouncilResponse, UsageInfo
+from jedi_council.semantic_cache import HashingEmbedder, SemanticCache
+
+_TEMPLATES = [
+    "What is the {0} of the {1} {2}?",
+    "Explain how a {0} {1} affects the {2} in three sentences.",
+    "Write a short poem about the {0} {1} and its {2}.",
+    "Compare the {0} and the {1} of a {2}.",
+    "Summarize the history of the {0} {1} for a {2} audience.",
+]
+
+
+def _vocabulary(rng, size):
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    return ["".join(rng.choice(letters) for _ in range(rng.randint(4, 9))) for _ in range(size)]
+
+
+def prompt(rng, words):
+    return rng.choice(_TEMPLATES).format(*(rng.choice(words) for _ in range(3)))
+
+
+def reword(rng, text):
+    """A near-duplicate: changed case and punctuation, sometimes a polite prefix."""
+    text = text.lower().rstrip("?.") + rng.choice(["", "?", "!", " please"])
+    return ("Please " + text) if rng.random() < 0.3 else text
+
+
+def percentiles(samples_ms):
+    values = np.asarray(samples_ms)
+    return {name: float(np.percentile(values, q)) for name, q in (("p50", 50), ("p99", 99), ("max", 100))}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--entries", type=int, default=100_000)
+    parser.add_argument("--queries", type=int, default=2_000)
+    parser.add_argument("--dim", type=int, default=256)
+    parser.add_argument("--nprobe", type=int, default=8)
+    parser.add_argument("--exact", action="store_true", help="Never switch to the inverted file.")
+    parser.add_argument("--persist", action="store_true", help="Memory-map vectors and store responses on disk.")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    words = _vocabulary(rng, 20_000)
+    prompts = list({prompt(rng, words) for _ in range(args.entries)})
+    path = tempfile.mkdtemp(prefix="semantic_cache_") if args.persist else None
+    cache = SemanticCache(HashingEmbedder(dim=args.dim), max_entries=len(prompts), path=path, nprobe=args.nprobe,
+                          ivf_min_entries=0 if args.exact else 4096)
+    response = CouncilResponse(text="Cached wisdom", model="gpt-4o", usage=UsageInfo(12, 3, 0.0001),
+                               latency_ms=800.0, raw_response=None)
+
+    started = time.perf_counter()
+    for text in prompts:
+        cache.put(cache.key("gpt-4o", [{"role": "user", "content": text}], {}), response)
+    fill_s = time.perf_counter() - started
+
+    queries = [(reword(rng, rng.choice(prompts)), True) for _ in range(args.queries // 2)]
+    queries += [(prompt(rng, words), False) for _ in range(args.queries - len(queries))]
+    rng.shuffle(queries)
+    embed_ms, search_ms, correct = [], [], {True: 0, False: 0}
+    for text, should_hit in queries:
+        t0 = time.perf_counter()
+        key = cache.key("gpt-4o", [{"role": "user", "content": text}], {})
+        t1 = time.perf_counter()
+        hit = cache.get(key) is not None
+        t2 = time.perf_counter()
+        embed_ms.append((t1 - t0) * 1000)
+        search_ms.append((t2 - t1) * 1000)
+        correct[should_hit] += hit == should_hit
+
+    hits = sum(1 for _, should_hit in queries if should_hit)
+    mode = "exact" if cache.index.centroids is None else f"IVF, {len(cache.index.centroids)} cells, nprobe={args.nprobe}"
+    print(f"SemanticCache: {len(cache)} entries, dim={args.dim}, {mode}, {'on disk' if path else 'in memory'}")
+    print(f"   Fill:            {fill_s:.1f}s ({len(prompts) / fill_s:,.0f} puts/s)")
+    print(f"   Near-dup hits:   {correct[True]}/{hits} ({correct[True] / max(hits, 1):.1%})")
+    print(f"   Unseen misses:   {correct[False]}/{len(queries) - hits}")
+    for name, samples in (("Embed", embed_ms), ("Lookup", search_ms),
+                          ("Embed + lookup", [a + b for a, b in zip(embed_ms, search_ms)])):
+        stats = percentiles(samples)
+        print(f"   {name + ' (ms):':<20} " + "  ".join(f"{k}={v:.3f}" for k, v in stats.items()))
+    cache.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,82 @@
+# startup_benchmark.py
+"""
+Measures cold-start cost: the time to import jedi_council.core and to construct the
+first TheJediCouncil for each provider. Every sample runs in a fresh interpreter so
+module caches don't hide regressions.
+
+    python benchmarking/startup_benchmark.py --runs 5 --max-import-ms 150
+"""
+import os
+import sys
+import json
+import argparse
+import statistics
+import subprocess
+
+MODELS = [
+    "gpt-4o",
+    "claude-3-haiku-20240307",
+    "mistral-large-latest",
+    "gemini-1.5-pro",
+]
+
+SDK_MODULES = ["openai", "anthropic", "google.generativeai", "mistralai"]
+
+# Runs in the child interpreter; prints one JSON line of timings.
+PROBE = """
+import sys, json, time
+start = time.perf_counter()
+import jedi_council.core as core
+import_ms = (time.perf_counter() - start) * 1000
+sdks_after_import = [m for m in {sdks!r} if m in sys.modules]
+start = time.perf_counter()
+core.TheJediCouncil(model={model!r})
+construct_ms = (time.perf_counter() - start) * 1000
+print(json.dumps({{"import_ms": import_ms, "construct_ms": construct_ms,
+                  "sdks_after_import": sdks_after_import,
+                  "sdks_after_construct": [m for m in {sdks!r} if m in sys.modules]}}))
+"""
+
+
+def probe(model):
+    # Placeholder keys let providers that validate their key at construction start up offline.
+    env = {
+        "OPENAI_API_KEY": "startup-benchmark", "ANTHROPIC_API_KEY": "startup-benchmark",
+        "MISTRAL_API_KEY": "startup-benchmark", "GEMINI_API_KEY": "startup-benchmark",
+        **os.environ,
+    }
+    out = subprocess.run(
+        [sys.executable, "-W", "ignore", "-c", PROBE.format(model=model, sdks=SDK_MODULES)],
+        capture_output=True, text=True, env=env, check=True,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def run_startup_benchmark(runs, max_import_ms=None):
+    print(f"{'model':<26} {'import ms':>10} {'construct ms':>13}  SDKs loaded")
+    regressions = []
+    for model in MODELS:
+        samples = [probe(model) for _ in range(runs)]
+        import_ms = statistics.median(s["import_ms"] for s in samples)
+        construct_ms = statistics.median(s["construct_ms"] for s in samples)
+        loaded = samples[-1]["sdks_after_construct"]
+        print(f"{model:<26} {import_ms:>10.1f} {construct_ms:>13.1f}  {', '.join(loaded)}")
+
+        if samples[-1]["sdks_after_import"]:
+            regressions.append(f"importing jedi_council.core loaded {samples[-1]['sdks_after_import']}")
+        if len(loaded) > 1:
+            regressions.append(f"{model} loaded more than its own SDK: {loaded}")
+        if max_import_ms is not None and import_ms > max_import_ms:
+            regressions.append(f"import took {import_ms:.0f}ms (budget {max_import_ms:.0f}ms)")
+
+    for regression in regressions:
+        print(f"REGRESSION: {regression}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreters per model")
+    parser.add_argument("--max-import-ms", type=float, help="Fail if the median import time exceeds this")
+    args = parser.parse_args()
+    sys.exit(run_startup_benchmark(args.runs, args.max_import_ms))
@@ -9,9 +9,9 @@ parser = argparse.ArgumentParser()
 parser.add_argument("--verbose", action="store_true", help="Show detailed logs")
 args = parser.parse_args()
 
-import logging
-if not args.verbose:
-    logging.getLogger().setLevel(logging.WARNING)
+from jedi_council.core import configure_logging
+# Honour LOG_LEVEL with --verbose; otherwise only show warnings.
+configure_logging(None if args.verbose else "WARNING")
 
 # Make sure you have a .env file with your API keys:
 # OPENAI_API_KEY="sk-..."
@@ -0,0 +1,85 @@
+# jedi_council/batch.py
+
+import json
+from dataclasses import dataclass, field, asdict
+from typing import List, Dict, Any, Iterable, Iterator
+
+
+@dataclass
+class BatchRequest:
+    """One prompt in a batch. `custom_id` is echoed back on its `CouncilResponse.request_id`."""
+    custom_id: str
+    messages: List[Dict[str, str]]
+    params: Dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class BatchJob:
+    """The provider-side batches a `submit_batch` call created. Save it with `to_json` to collect later."""
+    provider: str
+    model: str
+    batch_ids: List[str]
+    request_count: int = 0
+
+    def to_json(self) -> str:
+        return json.dumps(asdict(self))
+
+    @classmethod
+    def from_json(cls, data: str) -> "BatchJob":
+        return cls(**json.loads(data))
+
+
+class BatchSubmitError(Exception):
+    """
+    A chunk failed to submit after earlier ones went through.
+
+    `job` holds the batches already submitted, which keep running and can still be collected.
+    Requests go out in input order, so they cover the first `job.request_count` requests.
+    """
+
+    def __init__(self, message: str, job: BatchJob):
+        super().__init__(message)
+        self.job = job
+
+
+def parse_batch_request(entry: Dict[str, Any], index: int) -> BatchRequest:
+    """
+    Builds a BatchRequest from one JSONL entry.
+
+    The id comes from `custom_id`, `request_id` or `id` (defaulting to the line number). The prompt
+    comes from `messages`, `prompt`, or a `title`/`body` pair like the backlog's requests.jsonl.
+    Optional `params` are passed through as generation parameters.
+    """
+    custom_id = str(entry.get("custom_id") or entry.get("request_id") or entry.get("id") or f"request-{index}")
+    if "messages" in entry:
+        messages = entry["messages"]
+    elif "prompt" in entry:
+        messages = [{"role": "user", "content": entry["prompt"]}]
+    elif "body" in entry:
+        content = f"{entry['title']}\n\n{entry['body']}" if entry.get("title") else entry["body"]
+        messages = [{"role": "user", "content": content}]
+    else:
+        raise ValueError(f"Batch entry {custom_id!r} has no 'messages', 'prompt' or 'body'.")
+    return BatchRequest(custom_id=custom_id, messages=messages, params=entry.get("params", {}))
+
+
+def load_batch_requests(path: str) -> Iterator[BatchRequest]:
+    """Streams BatchRequests from a JSONL file, one per non-blank line."""
+    with open(path, encoding="utf-8") as file:
+        for index, line in enumerate(file):
+            if line.strip():
+                yield parse_batch_request(json.loads(line), index)
+
+
+def chunk_entries(entries: Iterable[Dict[str, Any]], max_requests: int, max_bytes: int) -> Iterator[List[Dict[str, Any]]]:
+    """Groups provider batch entries into chunks that stay within a provider's request and size limits."""
+    chunk, chunk_bytes = [], 0
+    for entry in entries:
+        size = len(json.dumps(entry).encode("utf-8")) + 1  # +1 for the JSONL newline
+        if chunk and (len(chunk) >= max_requests or chunk_bytes + size > max_bytes):
+            yield chunk
+            chunk, chunk_bytes = [], 0
+        chunk.append(entry)
+        chunk_bytes += size
+    if chunk:
+        yield chunk
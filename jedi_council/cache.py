@@ -0,0 +1,237 @@
+# jedi_council/cache.py
+
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import List, Dict, Any, Optional
+
+from jedi_council.core import CouncilResponse, UsageInfo, ERROR_COUNCIL_RESPONSE
+
+
+def request_key(model: str, messages: List[Dict[str, Any]], params: Dict[str, Any]) -> str:
+    """Canonical hash of everything that determines a response: model, messages and generation params."""
+    canonical = json.dumps(
+        {"model": model, "messages": messages, "params": params},
+        sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str,
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class CacheStats:
+    """Hit/miss counters for a `ResponseCache`."""
+    memory_hits: int = 0
+    disk_hits: int = 0
+    misses: int = 0
+
+    @property
+    def hits(self) -> int:
+        return self.memory_hits + self.disk_hits
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+# --- Storage Tiers ---
+class MemoryLRU:
+    """A bounded, thread-safe LRU map of cache key -> serialized response."""
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            payload = self._entries.get(key)
+            if payload is not None:
+                self._entries.move_to_end(key)
+            return payload
+
+    def set(self, key: str, payload: Dict[str, Any]) -> None:
+        with self._lock:
+            self._entries[key] = payload
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SQLiteStore:
+    """
+    A persistent response store backed by a single SQLite file.
+
+    Entries older than `ttl_s` are treated as misses and removed; once the store holds more
+    than `max_entries`, the least recently used entries are evicted.
+    """
+
+    def __init__(self, path: str, ttl_s: Optional[float] = None, max_entries: int = 100_000):
+        self.path = path
+        self.ttl_s = ttl_s
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            " key TEXT PRIMARY KEY, payload TEXT NOT NULL,"
+            " created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS responses_accessed_at ON responses (accessed_at)")
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute("SELECT payload, created_at FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            payload, created_at = row
+            if self.ttl_s is not None and now - created_at > self.ttl_s:
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._conn.commit()
+                return None
+            self._conn.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+        return json.loads(payload)
+
+    def set(self, key: str, payload: Dict[str, Any]) -> None:
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, payload, created_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(payload), now, now),
+            )
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self) -> None:
+        if self.ttl_s is not None:
+            self._conn.execute("DELETE FROM responses WHERE created_at < ?", (time.time() - self.ttl_s,))
+        (count,) = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()
+        if count > self.max_entries:
+            self._conn.execute(
+                "DELETE FROM responses WHERE key IN (SELECT key FROM responses ORDER BY accessed_at LIMIT ?)",
+                (count - self.max_entries,),
+            )
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self._conn.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+# --- The Two-Tier Cache ---
+class ResponseCache:
+    """
+    An opt-in, two-tier response cache: a bounded in-memory LRU in front of an optional SQLite file.
+
+    Pass one to `TheJediCouncil(model, cache=ResponseCache(path="council_cache.db"))`. Responses
+    served from the cache come back with `cached=True` and a `latency_ms` equal to the lookup time.
+    Error responses are never cached.
+    """
+
+    def __init__(self, max_memory_entries: int = 1024, path: Optional[str] = None,
+                 ttl_s: Optional[float] = None, max_disk_entries: int = 100_000):
+        """
+        Args:
+            max_memory_entries (int): Capacity of the in-memory LRU tier.
+            path (str, optional): SQLite file for the persistent tier. Memory-only if omitted.
+            ttl_s (float, optional): Entries older than this many seconds are treated as misses.
+            max_disk_entries (int): Size bound of the persistent tier; LRU entries are evicted past it.
+        """
+        self.ttl_s = ttl_s
+        self.memory = MemoryLRU(max_memory_entries)
+        self.disk = SQLiteStore(path, ttl_s=ttl_s, max_entries=max_disk_entries) if path else None
+        self.stats = CacheStats()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(model: str, messages: List[Dict[str, Any]], params: Dict[str, Any]) -> str:
+        return request_key(model, messages, params)
+
+    def get(self, key: str) -> Optional[CouncilResponse]:
+        start_time = time.perf_counter()
+        payload = self.memory.get(key)
+        if payload is not None and self.ttl_s is not None and time.time() - payload["stored_at"] > self.ttl_s:
+            payload = None
+        tier = "memory"
+        if payload is None and self.disk is not None:
+            payload = self.disk.get(key)
+            tier = "disk"
+            if payload is not None:
+                self.memory.set(key, payload)
+
+        with self._lock:
+            if payload is None:
+                self.stats.misses += 1
+                return None
+            if tier == "memory":
+                self.stats.memory_hits += 1
+            else:
+                self.stats.disk_hits += 1
+        return self._from_payload(payload, latency_ms=(time.perf_counter() - start_time) * 1000)
+
+    def put(self, key: str, response: CouncilResponse) -> None:
+        if response.text == ERROR_COUNCIL_RESPONSE:
+            return
+        payload = self._to_payload(response)
+        self.memory.set(key, payload)
+        if self.disk is not None:
+            self.disk.set(key, payload)
+
+    def clear(self) -> None:
+        self.memory.clear()
+        if self.disk is not None:
+            self.disk.clear()
+
+    @staticmethod
+    def _to_payload(response: CouncilResponse) -> Dict[str, Any]:
+        # raw_response holds live SDK objects, so only the portable fields are stored.
+        return {
+            "text": response.text,
+            "model": response.model,
+            "input_tokens": response.usage.input_tokens,
+            "output_tokens": response.usage.output_tokens,
+            "cost": response.usage.cost,
+            "cache_read_tokens": response.usage.cache_read_tokens,
+            "cache_write_tokens": response.usage.cache_write_tokens,
+            "stored_at": time.time(),
+        }
+
+    @staticmethod
+    def _from_payload(payload: Dict[str, Any], latency_ms: float) -> CouncilResponse:
+        return CouncilResponse(
+            text=payload["text"],
+            model=payload["model"],
+            usage=UsageInfo(
+                input_tokens=payload["input_tokens"],
+                output_tokens=payload["output_tokens"],
+                cost=payload["cost"],
+                cache_read_tokens=payload.get("cache_read_tokens", 0),
+                cache_write_tokens=payload.get("cache_write_tokens", 0),
+            ),
+            latency_ms=latency_ms,
+            raw_response=None,
+            cached=True,
+        )
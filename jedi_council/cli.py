@@ -0,0 +1,220 @@
+# jedi_council/cli.py
+"""
+The `jedi-council` command line.
+
+    jedi-council batch submit --model gpt-4o --input requests.jsonl --job job.json
+    jedi-council batch collect --job job.json --output results.jsonl
+    jedi-council run --input prompts.jsonl --model gpt-4o --workers 4 --concurrency 16
+    jedi-council compare --baseline 20250101_120000 --candidate latest
+    jedi-council mock-server --port 8080 --latency-ms 300 --sigma 0.5 --error-rate 0.01
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+from typing import List, Optional
+
+from jedi_council.core import TheJediCouncil, CouncilResponse, configure_logging
+
+
+def response_record(response: CouncilResponse) -> dict:
+    """The JSON-serializable summary of a response written by the CLI."""
+    return {
+        "request_id": response.request_id,
+        "model": response.model,
+        "text": response.text,
+        "input_tokens": response.usage.input_tokens,
+        "output_tokens": response.usage.output_tokens,
+        "cost": response.usage.cost,
+        "latency_ms": response.latency_ms,
+        "error": response.failed,
+        "error_kind": response.error.kind.value if response.error else None,
+    }
+
+
+# --- batch ---
+def batch_submit(args: argparse.Namespace) -> int:
+    from jedi_council.batch import BatchSubmitError, load_batch_requests
+
+    council = TheJediCouncil(model=args.model, base_url=args.base_url)
+    try:
+        job = council.submit_batch(load_batch_requests(args.input))
+    except BatchSubmitError as e:
+        # Save what did go out, so those batches can still be collected.
+        with open(args.job, "w", encoding="utf-8") as file:
+            file.write(e.job.to_json())
+        print(f"error: {e}. The partial job is saved to {args.job}; requests after the first "
+              f"{e.job.request_count} were not submitted.", file=sys.stderr)
+        return 2
+    with open(args.job, "w", encoding="utf-8") as file:
+        file.write(job.to_json())
+    print(f"Submitted {job.request_count} requests in {len(job.batch_ids)} batch(es); job saved to {args.job}")
+    return 0
+
+
+def batch_collect(args: argparse.Namespace) -> int:
+    from jedi_council.batch import BatchJob
+
+    with open(args.job, encoding="utf-8") as file:
+        job = BatchJob.from_json(file.read())
+    council = TheJediCouncil(model=job.model, base_url=args.base_url)
+
+    count, failures, cost = 0, 0, 0.0
+    out = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    try:
+        for response in council.collect_batch(job, poll_interval=args.poll_interval, timeout=args.timeout):
+            record = response_record(response)
+            out.write(json.dumps(record) + "\n")
+            out.flush()
+            count += 1
+            failures += record["error"]
+            cost += response.usage.cost or 0.0
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    print(f"Collected {count} results ({failures} failed), batch cost ${cost:.6f}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+# --- run ---
+def run(args: argparse.Namespace) -> int:
+    from jedi_council.runner import print_summary, run as run_prompts
+
+    output = args.output or f"{os.path.splitext(args.input)[0]}.results.jsonl"
+    started = time.perf_counter()
+    try:
+        summary, failed = run_prompts(args.input, args.model, output, workers=args.workers,
+                                      concurrency=args.concurrency, base_url=args.base_url, rpm=args.rpm,
+                                      tpm=args.tpm, max_retry=args.max_retry, resume=args.resume,
+                                      restart=args.restart)
+    except ValueError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+    print_summary(summary, args.model, args.workers, time.perf_counter() - started, output, parts_kept=failed)
+    return 1 if failed else 0
+
+
+# --- compare ---
+def compare(args: argparse.Namespace) -> int:
+    from jedi_council.compare import DEFAULT_METRICS, compare_runs, print_comparison
+    from jedi_council.results import ResultStore
+
+    if not os.path.exists(args.results):
+        print(f"error: no benchmark history at {args.results}", file=sys.stderr)
+        return 2
+    store = ResultStore(args.results)
+    try:
+        if args.list:
+            for run in store.runs():
+                status = "finished" if run["finished_at"] else "unfinished"
+                print(f"{run['run_id']}  {time.strftime('%Y-%m-%d %H:%M', time.localtime(run['started_at']))}  "
+                      f"{status}  {run['metadata']}")
+            return 0
+        if not args.baseline:
+            print("error: --baseline is required (use --list to see the runs)", file=sys.stderr)
+            return 2
+        try:
+            comparisons = compare_runs(store, args.baseline, args.candidate, metrics=args.metric or DEFAULT_METRICS,
+                                       threshold=args.threshold, confidence=args.confidence,
+                                       resamples=args.resamples, min_samples=args.min_samples)
+        except ValueError as e:
+            print(f"error: {e}", file=sys.stderr)
+            return 2
+        candidate = store.latest_run_id() if args.candidate == "latest" else args.candidate
+        print_comparison(comparisons, args.baseline, candidate, args.confidence)
+    finally:
+        store.close()
+    return 1 if any(c.regressed for c in comparisons) else 0
+
+
+# --- mock-server ---
+def mock_server(args: argparse.Namespace) -> int:
+    from jedi_council.mock_server import MockConfig, MockProviderServer
+
+    config = MockConfig(median_ms=args.latency_ms, sigma=args.sigma, output_tokens=args.output_tokens,
+                        error_rate=args.error_rate, rate_limit_rate=args.rate_limit_rate, seed=args.seed)
+    server = MockProviderServer(config, host=args.host, port=args.port).start()
+    print(f"Mock provider server on {server.url} (OpenAI base_url {server.base_url('openai')}); Ctrl+C to stop")
+    try:
+        server._thread.join()
+    except KeyboardInterrupt:
+        server.stop()
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="jedi-council", description="Consult the Jedi Council from the terminal.")
+    parser.add_argument("--verbose", action="store_true", help="Show detailed logs")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    batch = commands.add_parser("batch", help="Offline evaluation through provider batch APIs")
+    batch_commands = batch.add_subparsers(dest="batch_command", required=True)
+
+    submit = batch_commands.add_parser("submit", help="Submit a JSONL file of prompts")
+    submit.add_argument("--model", required=True)
+    submit.add_argument("--input", required=True, help="JSONL with messages, prompt or title/body per line")
+    submit.add_argument("--job", default="batch_job.json", help="Where to save the job for `collect`")
+    submit.add_argument("--base-url", help="Alternate API endpoint, e.g. a local stand-in server")
+    submit.set_defaults(handler=batch_submit)
+
+    collect = batch_commands.add_parser("collect", help="Wait for a submitted job and write its results")
+    collect.add_argument("--job", default="batch_job.json")
+    collect.add_argument("--output", help="Results JSONL (defaults to stdout)")
+    collect.add_argument("--poll-interval", type=float, default=30.0, help="Seconds between status checks")
+    collect.add_argument("--timeout", type=float, help="Give up after this many seconds")
+    collect.add_argument("--base-url", help="Alternate API endpoint, e.g. a local stand-in server")
+    collect.set_defaults(handler=batch_collect)
+
+    runner = commands.add_parser("run", help="Run a JSONL file of prompts across worker processes")
+    runner.add_argument("--input", required=True, help="JSONL with messages, prompt or title/body per line")
+    runner.add_argument("--model", required=True)
+    runner.add_argument("--output", help="Results JSONL, in input order (default: <input>.results.jsonl)")
+    runner.add_argument("--workers", type=int, default=1, help="Worker processes")
+    runner.add_argument("--concurrency", type=int, default=8, help="Calls in flight per worker")
+    runner.add_argument("--rpm", type=float, help="Requests per minute for the whole run, split across workers")
+    runner.add_argument("--tpm", type=float, help="Tokens per minute for the whole run, split across workers")
+    runner.add_argument("--max-retry", type=int, default=3, help="Attempts per prompt")
+    runner.add_argument("--base-url", help="Alternate API endpoint, e.g. a local stand-in server")
+    checkpoint = runner.add_mutually_exclusive_group()
+    checkpoint.add_argument("--resume", action="store_true", help="Continue a killed or partly failed run")
+    checkpoint.add_argument("--restart", action="store_true", help="Discard an unfinished run and start over")
+    runner.set_defaults(handler=run)
+
+    comparer = commands.add_parser("compare", help="Flag benchmark regressions of one run against a baseline")
+    comparer.add_argument("--results", default=os.path.join("benchmark_runs", "results.sqlite"),
+                          help="The benchmark history written by benchmark_suite.py")
+    comparer.add_argument("--baseline", help="Baseline run id")
+    comparer.add_argument("--candidate", default="latest", help="Run id to check (default: the latest run)")
+    comparer.add_argument("--metric", action="append",
+                          help="Metric to compare; repeatable (default: latency_p50, latency_p95, tokens_per_sec, cost)")
+    comparer.add_argument("--threshold", type=float, default=0.05,
+                          help="Smallest relative change that counts, e.g. 0.05 for 5%%")
+    comparer.add_argument("--confidence", type=float, default=0.95)
+    comparer.add_argument("--resamples", type=int, default=2000, help="Bootstrap resamples")
+    comparer.add_argument("--min-samples", type=int, default=5, help="Fewer samples than this gives no verdict")
+    comparer.add_argument("--list", action="store_true", help="List the runs in the history and exit")
+    comparer.set_defaults(handler=compare)
+
+    mock = commands.add_parser("mock-server", help="Run a local OpenAI/Anthropic/Mistral stand-in for load tests")
+    mock.add_argument("--host", default="127.0.0.1")
+    mock.add_argument("--port", type=int, default=8080)
+    mock.add_argument("--latency-ms", type=float, default=200.0, help="Median response time")
+    mock.add_argument("--sigma", type=float, default=0.0, help="Log-normal latency spread (0 = fixed)")
+    mock.add_argument("--output-tokens", type=int, default=32)
+    mock.add_argument("--error-rate", type=float, default=0.0, help="Share of requests failing with 503")
+    mock.add_argument("--rate-limit-rate", type=float, default=0.0, help="Share of requests given 429")
+    mock.add_argument("--seed", type=int)
+    mock.set_defaults(handler=mock_server)
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    configure_logging(None if args.verbose else "WARNING")
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
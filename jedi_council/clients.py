@@ -0,0 +1,215 @@
+# jedi_council/clients.py
+
+import asyncio
+import hashlib
+import os
+import threading
+import weakref
+from dataclasses import dataclass
+from typing import Any, Callable, Coroutine, Dict, Optional, Tuple, TypeVar
+
+from jedi_council.ratelimit import get_rate_limiter
+
+T = TypeVar("T")
+
+
+@dataclass(frozen=True)
+class PoolConfig:
+    """HTTP connection pool settings shared by every client the registry builds."""
+    max_connections: int = 100
+    max_keepalive_connections: int = 20
+    keepalive_expiry: float = 30.0  # Seconds an idle connection is kept warm
+    timeout: float = 60.0  # Overall request timeout in seconds
+    connect_timeout: float = 10.0
+
+
+@dataclass
+class PoolStats:
+    """Per-provider counters for verifying that clients and connections are being reused."""
+    client_hits: int = 0  # Lookups served by an existing client
+    clients_created: int = 0
+    requests: int = 0  # HTTP requests sent through registry clients
+    connections_opened: int = 0  # New TCP connections (each one is a fresh handshake)
+
+    @property
+    def connections_reused(self) -> int:
+        return max(0, self.requests - self.connections_opened)
+
+
+class ClientRegistry:
+    """
+    A process-wide, thread-safe cache of SDK clients keyed by provider, credentials and pool settings.
+
+    Councils for the same provider share one client, and therefore one pool of warm
+    HTTP connections. Async clients are additionally keyed by event loop, because an
+    httpx.AsyncClient's connections cannot outlive the loop that opened them.
+    """
+
+    def __init__(self, pool: Optional[PoolConfig] = None):
+        self.pool = pool or PoolConfig()
+        self._clients: Dict[Tuple, Any] = {}
+        self._async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[Tuple, Any]]" = weakref.WeakKeyDictionary()
+        self._stats: Dict[str, PoolStats] = {}
+        self._lock = threading.RLock()
+
+    def configure(self, pool: PoolConfig) -> None:
+        """Sets the pool settings used for clients created from now on."""
+        with self._lock:
+            self.pool = pool
+
+    def get(self, provider: str, api_key: Optional[str], factory: Callable[["ClientRegistry", PoolConfig], Any],
+            base_url: Optional[str] = None, pool: Optional[PoolConfig] = None) -> Any:
+        """
+        Returns the shared client for `provider`, building it with `factory(registry, pool)` on first use.
+
+        Args:
+            provider (str): Provider name, e.g. "openai".
+            api_key (str, optional): Credentials; hashed into the key, never stored in it.
+            factory (Callable): Builds the SDK client; use `http_client()` for pooled transports.
+            base_url (str, optional): Alternate endpoint, e.g. a local stand-in server.
+            pool (PoolConfig, optional): Overrides the registry's pool settings for this client.
+        """
+        pool = pool or self.pool
+        key = (provider, _fingerprint(api_key), base_url, pool)
+        with self._lock:
+            return self._get_or_create(self._clients, key, provider, factory, pool)
+
+    def get_async(self, provider: str, api_key: Optional[str], factory: Callable[["ClientRegistry", PoolConfig], Any],
+                  base_url: Optional[str] = None, pool: Optional[PoolConfig] = None) -> Any:
+        """Like `get`, for async clients: one client per provider, credentials and running event loop."""
+        pool = pool or self.pool
+        key = (provider, _fingerprint(api_key), base_url, pool)
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+        with self._lock:
+            if loop is None:
+                return self._get_or_create(self._clients, ("async",) + key, provider, factory, pool)
+            clients = self._async_clients.setdefault(loop, {})
+            return self._get_or_create(clients, key, provider, factory, pool)
+
+    def _get_or_create(self, clients: Dict[Tuple, Any], key: Tuple, provider: str,
+                       factory: Callable[["ClientRegistry", PoolConfig], Any], pool: PoolConfig) -> Any:
+        stats = self._stats.setdefault(provider, PoolStats())
+        client = clients.get(key)
+        if client is not None:
+            stats.client_hits += 1
+            return client
+        client = clients[key] = factory(self, pool)
+        stats.clients_created += 1
+        return client
+
+    def http_client(self, provider: str, pool: PoolConfig, is_async: bool = False) -> Any:
+        """Builds an httpx client with the pool limits and timeouts, instrumented for `stats()`."""
+        import httpx
+
+        stats = self._stats.setdefault(provider, PoolStats())
+        limits = httpx.Limits(
+            max_connections=pool.max_connections,
+            max_keepalive_connections=pool.max_keepalive_connections,
+            keepalive_expiry=pool.keepalive_expiry,
+        )
+        timeout = httpx.Timeout(pool.timeout, connect=pool.connect_timeout)
+
+        # httpcore reports each new TCP connection through the "trace" request extension.
+        def trace(event: str, info: Dict[str, Any]) -> None:
+            if event == "connection.connect_tcp.complete":
+                with self._lock:
+                    stats.connections_opened += 1
+
+        def on_request(request: Any) -> None:
+            with self._lock:
+                stats.requests += 1
+            request.extensions["trace"] = trace
+
+        # Every response (including the SDKs' own retries) feeds the provider's shared rate limiter.
+        def on_response(response: Any) -> None:
+            get_rate_limiter(provider).update_from_headers(response.headers, response.status_code)
+
+        if not is_async:
+            return httpx.Client(limits=limits, timeout=timeout,
+                                event_hooks={"request": [on_request], "response": [on_response]})
+
+        async def atrace(event: str, info: Dict[str, Any]) -> None:
+            trace(event, info)
+
+        async def aon_request(request: Any) -> None:
+            with self._lock:
+                stats.requests += 1
+            request.extensions["trace"] = atrace
+
+        async def aon_response(response: Any) -> None:
+            on_response(response)
+
+        return httpx.AsyncClient(limits=limits, timeout=timeout,
+                                 event_hooks={"request": [aon_request], "response": [aon_response]})
+
+    def stats(self, provider: Optional[str] = None) -> Dict[str, PoolStats] | PoolStats:
+        """Returns the counters for one provider, or a dict of all of them."""
+        with self._lock:
+            if provider is not None:
+                return self._stats.setdefault(provider, PoolStats())
+            return dict(self._stats)
+
+    def clear(self) -> None:
+        """Forgets every cached client and resets the stats; existing councils keep their clients."""
+        with self._lock:
+            self._clients.clear()
+            self._async_clients.clear()
+            self._stats.clear()
+
+
+def _fingerprint(api_key: Optional[str]) -> Optional[str]:
+    if api_key is None:
+        return None
+    return hashlib.sha256(api_key.encode("utf-8")).hexdigest()[:16]
+
+
+# The registry every provider uses unless told otherwise.
+client_registry = ClientRegistry()
+
+
+def configure_pool(**settings: Any) -> None:
+    """Sets the process-wide pool settings, e.g. `configure_pool(max_connections=200, keepalive_expiry=60)`."""
+    client_registry.configure(PoolConfig(**settings))
+
+
+# --- Background Event Loop ---
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_loop_pid: Optional[int] = None
+_loop_lock = threading.Lock()
+
+
+def background_loop() -> asyncio.AbstractEventLoop:
+    """
+    The process-wide event loop that synchronous wrappers run coroutines on, started on first use.
+
+    It runs in a daemon thread for the life of the process. Async clients are keyed by event loop,
+    so calls made through it keep reusing the same clients and warm connections, where
+    `asyncio.run` would build new ones on every call.
+    """
+    global _loop, _loop_pid
+    with _loop_lock:
+        if _loop is None or _loop_pid != os.getpid():  # A forked child doesn't inherit the thread
+            _loop, _loop_pid = asyncio.new_event_loop(), os.getpid()
+            threading.Thread(target=_loop.run_forever, name="jedi-council-loop", daemon=True).start()
+        return _loop
+
+
+def run_sync(coro: Coroutine[Any, Any, T]) -> T:
+    """Runs `coro` on the background loop and blocks until it's done. Not for use on that loop itself."""
+    loop = background_loop()
+    try:
+        running = asyncio.get_running_loop()
+    except RuntimeError:
+        running = None
+    if running is loop:
+        coro.close()
+        raise RuntimeError("run_sync would deadlock on the background loop; await the coroutine instead.")
+    future = asyncio.run_coroutine_threadsafe(coro, loop)
+    try:
+        return future.result()
+    except BaseException:
+        future.cancel()  # e.g. KeyboardInterrupt in the caller: don't leave the call running
+        raise
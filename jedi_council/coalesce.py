@@ -0,0 +1,125 @@
+# jedi_council/coalesce.py
+"""
+Single-flight request coalescing: concurrent identical requests share one upstream call.
+
+    council = TheJediCouncil(model="gpt-4o", coalesce=True)
+
+While a request is in flight, any identical request (same model, messages and params) waits
+for it instead of calling the provider again, and gets the same CouncilResponse. If the call
+raises, every waiter gets the exception. Nothing is kept once the call returns, so unlike
+a cache, coalescing never serves a stale answer.
+"""
+
+import asyncio
+import threading
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, TypeVar
+
+from jedi_council.cache import request_key
+
+T = TypeVar("T")
+
+
+@dataclass
+class CoalesceStats:
+    """Counters for a `SingleFlight`."""
+    leaders: int = 0  # Calls that went upstream
+    coalesced: int = 0  # Calls that joined one already in flight
+
+    @property
+    def calls(self) -> int:
+        return self.leaders + self.coalesced
+
+    @property
+    def coalesce_rate(self) -> float:
+        return self.coalesced / self.calls if self.calls else 0.0
+
+
+class _Flight:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """
+    Deduplicates concurrent calls by key, for threads (`do`) and asyncio (`ado`).
+
+    One instance can be shared by several councils; keys include the model.
+    """
+
+    def __init__(self):
+        self.stats = CoalesceStats()
+        self._lock = threading.Lock()
+        self._flights: Dict[str, _Flight] = {}
+        # Tasks belong to one event loop, so async flights are keyed by loop as well.
+        self._tasks: Dict[Tuple[asyncio.AbstractEventLoop, str], "asyncio.Task"] = {}
+
+    @staticmethod
+    def key(model: str, messages: List[Dict[str, Any]], params: Dict[str, Any]) -> str:
+        return request_key(model, messages, params)
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._flights) + len(self._tasks)
+
+    def do(self, key: str, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """
+        Calls `fn(*args, **kwargs)`, unless a call for `key` is already running on another
+        thread; then waits for that one and returns its result (or raises its exception).
+        """
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+                self.stats.leaders += 1
+            else:
+                self.stats.coalesced += 1
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+
+        try:
+            flight.result = fn(*args, **kwargs)
+            return flight.result
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            # Forget the flight before waking the waiters, so a call arriving now starts afresh.
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+
+    async def ado(self, key: str, fn: Callable[..., Awaitable[T]], *args: Any, **kwargs: Any) -> T:
+        """
+        Async counterpart of `do`, coalescing calls on the same event loop.
+
+        The upstream call runs as its own task, so cancelling one caller doesn't cancel it for
+        the others.
+        """
+        loop = asyncio.get_running_loop()
+        flight_key = (loop, key)
+        with self._lock:
+            task = self._tasks.get(flight_key)
+            if task is None:
+                task = self._tasks[flight_key] = loop.create_task(fn(*args, **kwargs))
+                task.add_done_callback(lambda done: self._forget(flight_key, done))
+                self.stats.leaders += 1
+            else:
+                self.stats.coalesced += 1
+        return await asyncio.shield(task)
+
+    def _forget(self, flight_key: Tuple[asyncio.AbstractEventLoop, str], task: "asyncio.Task") -> None:
+        with self._lock:
+            if self._tasks.get(flight_key) is task:
+                del self._tasks[flight_key]
+        if not task.cancelled():
+            task.exception()  # Mark it retrieved; the callers that awaited it have already seen it.
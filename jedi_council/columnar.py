@@ -0,0 +1,153 @@
+# jedi_council/columnar.py
+"""
+A compact, column-oriented container for large numbers of responses.
+
+    batch = ResponseBatch.from_responses(council.collect_batch(job))
+    print(len(batch), batch.total_cost, batch.text(0))
+
+Each CouncilResponse is an object with its own fields, strings and usage object. Eval jobs
+that keep hundreds of thousands of them spend most of their memory on that per-object
+overhead. ResponseBatch stores one typed array per field instead. All texts share one UTF-8
+buffer, and model names are stored once each. Indexing rebuilds a CouncilResponse on demand,
+without `raw_response`.
+"""
+
+import math
+from array import array
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from jedi_council.core import CouncilResponse, UsageInfo
+from jedi_council.retry import CouncilError
+
+_INT_COLUMNS = ("input_tokens", "output_tokens", "cache_read_tokens", "cache_write_tokens", "attempts")
+_FLOAT_COLUMNS = ("cost", "latency_ms", "ttft_ms", "tokens_per_sec")  # NaN stands for None
+_FLAG_COLUMNS = ("cached", "failed")
+
+
+class ResponseBatch:
+    """Many CouncilResponses stored as arrays, one per field."""
+
+    def __init__(self):
+        self._text = bytearray()
+        self._offsets = array("Q", [0])  # Row i's text is _text[_offsets[i]:_offsets[i + 1]]
+        self._models: List[str] = []
+        self._model_codes: Dict[str, int] = {}
+        self._model = array("H")
+        self._columns: Dict[str, array] = {
+            **{name: array("q") for name in _INT_COLUMNS},
+            **{name: array("d") for name in _FLOAT_COLUMNS},
+            **{name: array("b") for name in _FLAG_COLUMNS},
+        }
+        # Sparse: only failed rows have errors, and only batch results have request ids.
+        self._errors: Dict[int, CouncilError] = {}
+        self._request_ids: Dict[int, str] = {}
+
+    @classmethod
+    def from_responses(cls, responses: Iterable[CouncilResponse]) -> "ResponseBatch":
+        batch = cls()
+        batch.extend(responses)
+        return batch
+
+    # --- Writing ---
+    def append(self, response: CouncilResponse) -> None:
+        index = len(self)
+        self._text += (response.text or "").encode("utf-8")
+        self._offsets.append(len(self._text))
+        code = self._model_codes.get(response.model)
+        if code is None:
+            code = self._model_codes[response.model] = len(self._models)
+            self._models.append(response.model)
+        self._model.append(code)
+
+        usage, columns = response.usage, self._columns
+        columns["input_tokens"].append(usage.input_tokens or 0)
+        columns["output_tokens"].append(usage.output_tokens or 0)
+        columns["cache_read_tokens"].append(usage.cache_read_tokens or 0)
+        columns["cache_write_tokens"].append(usage.cache_write_tokens or 0)
+        columns["attempts"].append(response.attempts)
+        for name, value in (("cost", usage.cost), ("latency_ms", response.latency_ms),
+                            ("ttft_ms", response.ttft_ms), ("tokens_per_sec", response.tokens_per_sec)):
+            columns[name].append(math.nan if value is None else value)
+        columns["cached"].append(response.cached)
+        columns["failed"].append(response.failed)
+        if response.error is not None:
+            self._errors[index] = response.error
+        if response.request_id is not None:
+            self._request_ids[index] = response.request_id
+
+    def extend(self, responses: Iterable[CouncilResponse]) -> None:
+        for response in responses:
+            self.append(response)
+
+    # --- Reading ---
+    def __len__(self) -> int:
+        return len(self._model)
+
+    def text(self, index: int) -> str:
+        index = self._index(index)
+        return self._text[self._offsets[index]:self._offsets[index + 1]].decode("utf-8")
+
+    def model(self, index: int) -> str:
+        return self._models[self._model[self._index(index)]]
+
+    def column(self, name: str) -> array:
+        """The array backing one numeric column, e.g. "cost" or "latency_ms". Don't modify it."""
+        return self._columns[name]
+
+    def __getitem__(self, index: int) -> CouncilResponse:
+        index = self._index(index)
+        row = {name: column[index] for name, column in self._columns.items()}
+        return CouncilResponse(
+            text=self.text(index),
+            model=self.model(index),
+            usage=UsageInfo(input_tokens=row["input_tokens"], output_tokens=row["output_tokens"],
+                            cost=_optional(row["cost"]), cache_read_tokens=row["cache_read_tokens"],
+                            cache_write_tokens=row["cache_write_tokens"]),
+            latency_ms=row["latency_ms"],
+            raw_response=None,
+            ttft_ms=_optional(row["ttft_ms"]),
+            tokens_per_sec=_optional(row["tokens_per_sec"]),
+            cached=bool(row["cached"]),
+            request_id=self._request_ids.get(index),
+            error=self._errors.get(index),
+            attempts=row["attempts"],
+        )
+
+    def __iter__(self) -> Iterator[CouncilResponse]:
+        for index in range(len(self)):
+            yield self[index]
+
+    @property
+    def total_cost(self) -> float:
+        return math.fsum(cost for cost in self._columns["cost"] if not math.isnan(cost))
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate size of the stored data, excluding the sparse error and request id maps."""
+        return (len(self._text) + self._offsets.itemsize * len(self._offsets) + self._model.itemsize * len(self._model)
+                + sum(column.itemsize * len(column) for column in self._columns.values()))
+
+    def to_columns(self) -> Dict[str, List[Any]]:
+        """Plain per-column lists, e.g. for `pandas.DataFrame(batch.to_columns())`."""
+        columns: Dict[str, List[Any]] = {
+            "text": [self.text(i) for i in range(len(self))],
+            "model": [self._models[code] for code in self._model],
+        }
+        for name, column in self._columns.items():
+            values = column.tolist()
+            columns[name] = [bool(v) for v in values] if name in _FLAG_COLUMNS else values
+        columns["request_id"] = [self._request_ids.get(i) for i in range(len(self))]
+        columns["error_kind"] = [error.kind.value if (error := self._errors.get(i)) else None for i in range(len(self))]
+        return columns
+
+    def _index(self, index: int) -> int:
+        length = len(self)
+        if index < 0:
+            index += length
+        if not 0 <= index < length:
+            raise IndexError(f"ResponseBatch index out of range: {index}")
+        return index
+
+
+def _optional(value: float) -> Optional[float]:
+    return None if math.isnan(value) else value
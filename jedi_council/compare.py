@@ -0,0 +1,194 @@
+# jedi_council/compare.py
+"""
+Compares two benchmark runs in a ResultStore and flags statistically significant regressions.
+
+    jedi-council compare --baseline 20250101_120000 --candidate latest
+
+For each model and metric, the change from baseline to candidate is estimated with a
+bootstrap. Both runs are resampled within each task, so a run that happens to draw more slow
+tasks doesn't look slower. The change counts as a regression only if its whole confidence
+interval is worse than `threshold`, e.g. p95 latency at least 5% higher. A noisy run gives a
+wide interval and no verdict, rather than a false alarm.
+"""
+
+import math
+import random
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from jedi_council.results import ResultStore
+
+# Per-task samples of one metric: task name -> values.
+Strata = Dict[str, List[float]]
+
+
+def percentile(values: Sequence[float], q: float) -> float:
+    """Linear-interpolated percentile of `values` (q in 0..100)."""
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * q / 100
+    low = math.floor(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def mean(values: Sequence[float]) -> float:
+    return sum(values) / len(values)
+
+
+@dataclass(frozen=True)
+class Metric:
+    """A statistic of one result column, and which direction is worse."""
+    name: str
+    column: str
+    statistic: Callable[[Sequence[float]], float]
+    higher_is_worse: bool = True
+
+
+METRICS: Dict[str, Metric] = {metric.name: metric for metric in (
+    Metric("latency_p50", "latency_ms", lambda v: percentile(v, 50)),
+    Metric("latency_p95", "latency_ms", lambda v: percentile(v, 95)),
+    Metric("ttft_p50", "ttft_ms", lambda v: percentile(v, 50)),
+    Metric("tokens_per_sec", "tokens_per_sec", lambda v: percentile(v, 50), higher_is_worse=False),
+    Metric("cost", "cost", mean),
+)}
+DEFAULT_METRICS = ("latency_p50", "latency_p95", "tokens_per_sec", "cost")
+
+
+@dataclass
+class Comparison:
+    """One model's metric in the baseline and candidate runs."""
+    model: str
+    metric: str
+    baseline: Optional[float]
+    candidate: Optional[float]
+    samples: Tuple[int, int]  # (baseline, candidate) sample counts
+    change: Optional[float] = None  # Relative change, candidate / baseline - 1
+    ci: Optional[Tuple[float, float]] = None  # Confidence interval of `change`
+    verdict: str = "insufficient data"  # "regression", "improvement", "no significant change"
+
+    @property
+    def regressed(self) -> bool:
+        return self.verdict == "regression"
+
+
+def bootstrap_change(baseline: Strata, candidate: Strata, statistic: Callable[[Sequence[float]], float],
+                     resamples: int = 2000, confidence: float = 0.95,
+                     rng: Optional[random.Random] = None) -> Tuple[float, Tuple[float, float]]:
+    """
+    The relative change in `statistic` from `baseline` to `candidate`, with a percentile
+    bootstrap confidence interval. Each resample draws, with replacement, as many values from
+    each task as that task has, so the task mix is the same in every resample.
+    """
+    rng = rng or random.Random()
+
+    def resample(strata: Strata) -> List[float]:
+        drawn: List[float] = []
+        for values in strata.values():
+            drawn.extend(rng.choices(values, k=len(values)))
+        return drawn
+
+    def relative(base: float, cand: float) -> float:
+        return cand / base - 1 if base else (0.0 if cand == base else math.inf)
+
+    point = relative(statistic(_pooled(baseline)), statistic(_pooled(candidate)))
+    changes = sorted(relative(statistic(resample(baseline)), statistic(resample(candidate))) for _ in range(resamples))
+    tail = (1 - confidence) / 2
+    return point, (percentile(changes, 100 * tail), percentile(changes, 100 * (1 - tail)))
+
+
+def _pooled(strata: Strata) -> List[float]:
+    return [value for values in strata.values() for value in values]
+
+
+def collect_samples(rows: Iterable[Dict], columns: Iterable[str]) -> Dict[str, Dict[str, Strata]]:
+    """model -> column -> task -> values, from the successful, uncached rows of a run."""
+    columns = list(columns)
+    samples: Dict[str, Dict[str, Strata]] = defaultdict(lambda: defaultdict(lambda: defaultdict(list)))
+    for row in rows:
+        # Cached responses measure the cache, not the model.
+        if row["error"] is not None or row["cached"]:
+            continue
+        for column in columns:
+            if row[column] is not None:
+                samples[row["model"]][column][row["task_name"]].append(float(row[column]))
+    return samples
+
+
+def compare_runs(store: ResultStore, baseline_run: str, candidate_run: str,
+                 metrics: Sequence[str] = DEFAULT_METRICS, threshold: float = 0.05, confidence: float = 0.95,
+                 resamples: int = 2000, min_samples: int = 5, seed: Optional[int] = 0) -> List[Comparison]:
+    """
+    Compares every model present in both runs.
+
+    Args:
+        store (ResultStore): The benchmark history.
+        baseline_run, candidate_run (str): Run ids; "latest" picks the most recently started run.
+        metrics (Sequence[str]): Names from METRICS.
+        threshold (float): Smallest relative change worth flagging, e.g. 0.05 for 5%.
+        confidence (float): Confidence level of the bootstrap intervals.
+        resamples (int): Bootstrap resamples per comparison.
+        min_samples (int): Fewer samples than this in either run gives "insufficient data".
+        seed (int, optional): Seed for the resampling, so a comparison is reproducible.
+
+    Returns:
+        One Comparison per (model, metric).
+    """
+    known = {run["run_id"] for run in store.runs()}
+    baseline_run, candidate_run = (store.latest_run_id() if run == "latest" else run
+                                   for run in (baseline_run, candidate_run))
+    for run in (baseline_run, candidate_run):
+        if run not in known:
+            raise ValueError(f"No run {run!r} in {store.path}.")
+    unknown = [name for name in metrics if name not in METRICS]
+    if unknown:
+        raise ValueError(f"Unknown metric(s) {unknown}; choose from {list(METRICS)}.")
+
+    chosen = [METRICS[name] for name in metrics]
+    columns = {metric.column for metric in chosen}
+    baseline = collect_samples(store.iter_rows(baseline_run), columns)
+    candidate = collect_samples(store.iter_rows(candidate_run), columns)
+    rng = random.Random(seed)
+
+    comparisons = []
+    for model in sorted(set(baseline) & set(candidate)):
+        for metric in chosen:
+            # Only tasks measured in both runs, so the two sides describe the same workload.
+            tasks = set(baseline[model][metric.column]) & set(candidate[model][metric.column])
+            base = {task: baseline[model][metric.column][task] for task in sorted(tasks)}
+            cand = {task: candidate[model][metric.column][task] for task in sorted(tasks)}
+            counts = (len(_pooled(base)), len(_pooled(cand)))
+            comparison = Comparison(model=model, metric=metric.name, samples=counts,
+                                    baseline=metric.statistic(_pooled(base)) if counts[0] else None,
+                                    candidate=metric.statistic(_pooled(cand)) if counts[1] else None)
+            if min(counts) >= min_samples:
+                comparison.change, comparison.ci = bootstrap_change(base, cand, metric.statistic, resamples,
+                                                                    confidence, rng)
+                comparison.verdict = _verdict(comparison.ci, threshold, metric.higher_is_worse)
+            comparisons.append(comparison)
+    return comparisons
+
+
+def _verdict(ci: Tuple[float, float], threshold: float, higher_is_worse: bool) -> str:
+    low, high = ci if higher_is_worse else (-ci[1], -ci[0])  # Positive now means worse
+    if low > threshold:
+        return "regression"
+    if high < -threshold:
+        return "improvement"
+    return "no significant change"
+
+
+def print_comparison(comparisons: List[Comparison], baseline_run: str, candidate_run: str,
+                     confidence: float = 0.95) -> None:
+    print(f"Comparing run {candidate_run} against baseline {baseline_run} ({confidence:.0%} bootstrap intervals)")
+    print(f"   {'model':<28} {'metric':<15} {'baseline':>10} {'candidate':>10} {'change':>8}  {'interval':<19} verdict")
+    for c in comparisons:
+        fmt = (lambda v: f"{v:.6f}") if c.metric == "cost" else (lambda v: f"{v:.1f}")
+        base = fmt(c.baseline) if c.baseline is not None else "-"
+        cand = fmt(c.candidate) if c.candidate is not None else "-"
+        change = f"{c.change:+.1%}" if c.change is not None else "-"
+        interval = f"[{c.ci[0]:+.1%}, {c.ci[1]:+.1%}]" if c.ci is not None else f"n={c.samples[0]}/{c.samples[1]}"
+        flag = "❌ " if c.regressed else ""
+        print(f"   {c.model:<28} {c.metric:<15} {base:>10} {cand:>10} {change:>8}  {interval:<19} {flag}{c.verdict}")
+    regressions = sum(c.regressed for c in comparisons)
+    print(f"{regressions} regression(s)." if regressions else "No regressions.")
@@ -1,77 +1,229 @@
 # jedi_council/core.py
 
 import os
+import json
 import time
+import asyncio
 import logging
 import abc
+import functools
+import importlib
 from dataclasses import dataclass
-from typing import List, Dict, Any, Optional
-from jedi_council.utils.utils import estimate_cost
-# --- Use official clients ---
-from openai import OpenAI
-from anthropic import Anthropic
-import google.generativeai as genai
-from mistralai import Mistral
-
-from dotenv import load_dotenv
-
-load_dotenv()
-
-# --- Basic logging configuration ---
-# Users can control verbosity with the LOG_LEVEL environment variable.
-logging.basicConfig(
-    level=os.environ.get("LOG_LEVEL", "INFO").upper(),
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-)
+from typing import TYPE_CHECKING, List, Dict, Any, Optional, Iterable, Iterator, Tuple
+from jedi_council.utils.utils import estimate_cost, estimate_request_tokens
+from jedi_council.ratelimit import RateLimiter, get_rate_limiter
+from jedi_council.retry import CircuitBreaker, CouncilError, ErrorKind, RetryPolicy, get_circuit_breaker
+from jedi_council.hooks import CallContext, CouncilHook, emit, get_hooks
+
+if TYPE_CHECKING:
+    from jedi_council.batch import BatchJob, BatchRequest
+    from jedi_council.cache import ResponseCache
+    from jedi_council.coalesce import SingleFlight
+    from jedi_council.clients import PoolConfig
+    from jedi_council.hedge import HedgeInfo
+
+# Provider SDKs (openai, anthropic, google-generativeai, mistralai) are imported by the
+# modules in jedi_council.providers, which load only when a council routes to them.
+
 logger = logging.getLogger(__name__)
+logger.addHandler(logging.NullHandler())
+
+
+# --- Environment and Logging Setup ---
+_env_loaded = False
+
+
+def load_env() -> None:
+    """Loads API keys from a .env file once. Called on first council construction, not at import."""
+    global _env_loaded
+    if _env_loaded:
+        return
+    from dotenv import load_dotenv
+    load_dotenv()
+    _env_loaded = True
+
+
+def configure_logging(level: Optional[str] = None) -> None:
+    """
+    Opt-in console logging for scripts. Libraries embedding the council should configure logging themselves.
+
+    Args:
+        level (str, optional): Log level name. Defaults to the LOG_LEVEL environment variable, then INFO.
+    """
+    logging.basicConfig(
+        level=(level or os.environ.get("LOG_LEVEL", "INFO")).upper(),
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+    )
 
 # A more thematic error constant
 ERROR_COUNCIL_RESPONSE = "[ERROR] The Council has failed to respond after multiple attempts."
 
+# Set `"cache": True` on a message to end a cacheable prompt prefix there (see LlmProvider._cache_prefix).
+CACHE_MARKER = "cache"
+
+
+# How much of the provider's own response object a CouncilResponse keeps in `raw_response`:
+# "keep" the SDK object, re-encode it as compact "json" bytes, keep it only "on_error", or "drop" it.
+RAW_RESPONSE_MODES = ("keep", "json", "on_error", "drop")
+
 
 # --- Structured Response Objects ---
-@dataclass
+class RawJSON:
+    """A provider response kept as compact JSON bytes; `decode()` parses it on demand."""
+    __slots__ = ("data",)
+
+    def __init__(self, data: bytes):
+        self.data = data
+
+    @classmethod
+    def encode(cls, obj: Any) -> "RawJSON":
+        # The OpenAI, Anthropic and Mistral SDKs return pydantic models; Gemini's responses have to_dict().
+        dumped = obj.model_dump_json(exclude_unset=True) if hasattr(obj, "model_dump_json") else None
+        if not isinstance(dumped, str):
+            plain = obj.to_dict() if hasattr(obj, "to_dict") else obj
+            dumped = json.dumps(plain, separators=(",", ":"), default=str)
+        return cls(dumped.encode("utf-8"))
+
+    def decode(self) -> Any:
+        return json.loads(self.data)
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def __repr__(self) -> str:
+        return f"RawJSON({len(self.data)} bytes)"
+
+
+@dataclass(frozen=True, slots=True)
 class UsageInfo:
     """Stores token usage and cost information."""
-    input_tokens: int
+    input_tokens: int  # All prompt tokens, including those read from or written to the prefix cache
     output_tokens: int
     cost: Optional[float] = 0.00
+    cache_read_tokens: int = 0  # Prompt tokens served from the provider's prefix cache
+    cache_write_tokens: int = 0  # Prompt tokens written to the prefix cache (billed at a premium by Anthropic)
+
+    @property
+    def cache_hit_ratio(self) -> float:
+        return self.cache_read_tokens / self.input_tokens if self.input_tokens else 0.0
 
 
-@dataclass
+@dataclass(slots=True)
 class CouncilResponse:
     """A structured object containing the full response from the LLM."""
     text: str
     model: str
     usage: UsageInfo
     latency_ms: float
-    raw_response: Any  # The original response object for deep inspection
+    raw_response: Any  # The original response object for deep inspection (see RAW_RESPONSE_MODES)
+    ttft_ms: Optional[float] = None  # Time to first token; only set for streamed responses
+    tokens_per_sec: Optional[float] = None  # Output tokens per second after the first token (streamed only)
+    cached: bool = False  # True when served from a ResponseCache; latency_ms is then the lookup time
+    request_id: Optional[str] = None  # The caller's id for this prompt, e.g. a batch request's custom_id
+    error: Optional[CouncilError] = None  # Why the call failed; None on success
+    attempts: int = 1  # Provider attempts made, including retries
+    hedge: Optional["HedgeInfo"] = None  # Set by HedgedCouncil: which model won and what hedging cost
+
+    @property
+    def failed(self) -> bool:
+        return self.error is not None or self.text == ERROR_COUNCIL_RESPONSE
+
+
+def trim_raw_response(response: CouncilResponse, mode: str) -> CouncilResponse:
+    """Trims `response.raw_response` in place according to `mode`, one of RAW_RESPONSE_MODES."""
+    raw = response.raw_response
+    if raw is None or mode == "keep":
+        return response
+    if mode == "json":
+        response.raw_response = raw if isinstance(raw, RawJSON) else RawJSON.encode(raw)
+    elif mode == "drop" or not response.failed:
+        response.raw_response = None
+    return response
 
 
 # --- Abstracted Retry Logic Decorator ---
 def retry_handler(func):
-    """A decorator to handle API call retries with exponential backoff."""
+    """
+    A decorator that runs a provider call under the provider's RetryPolicy and circuit breaker.
 
+    Retryable errors back off with full jitter (or Retry-After for 429s) until attempts or the
+    deadline run out; fatal errors and an open circuit fail immediately. Failures come back as a
+    CouncilResponse whose `error` is a typed CouncilError.
+    """
+
+    @functools.wraps(func)
     def wrapper(self, *args, **kwargs):
-        retries = self.max_retry
-        wait = 1.0
-        while retries > 0:
+        started, attempts, hooks = time.monotonic(), 0, self.hooks
+        while True:
+            error, _ = self._before_attempt(started)
+            if error is not None:
+                return self._failed_response(error, attempts, started, hooks)
+            attempts += 1
+            ctx = None
             try:
-                return func(self, *args, **kwargs)
+                self._throttle(*args, **kwargs)
+                # The rate limiter may have held the call; time the attempt from what's left now.
+                error, timeout = self._before_attempt(started, throttled=True)
+                if error is not None:
+                    return self._failed_response(error, attempts, started, hooks)
+                ctx = self._begin_attempt(hooks, attempts)
+                response = func(self, *args, **self._with_timeout(kwargs, timeout))
             except Exception as e:
-                logger.warning(f"Error calling {self.__class__.__name__}: {e}. Retrying in {wait:.1f}s...")
-                retries -= 1
-                time.sleep(wait)
-                wait *= 2
+                error, delay = self._after_failure(e, attempts, started)
+                if delay is None:
+                    return self._failed_response(error, attempts, started, hooks, ctx)
+                logger.warning("Error calling %s (%s): %s. Retrying in %.1fs...", self.__class__.__name__, error.kind.value, e, delay,
+                               extra={"event": "retry", "model": self.model, "error_kind": error.kind.value})
+                if ctx is not None:
+                    emit(hooks, "on_retry", ctx, error, delay)
+                time.sleep(delay)
+                continue
+            self.circuit_breaker.record_success()
+            response.attempts = attempts
+            self._apply_raw_policy(response)
+            if ctx is not None:
+                emit(hooks, "after_response", ctx, response)
+            return response
 
-        # Return a structured error response if all retries fail
-        return CouncilResponse(
-            text=ERROR_COUNCIL_RESPONSE,
-            model=self.model,
-            usage=UsageInfo(input_tokens=0, output_tokens=0),
-            latency_ms=0,
-            raw_response=None
-        )
+    return wrapper
+
+
+def async_retry_handler(func):
+    """The asyncio twin of `retry_handler`: awaits its backoff instead of blocking the thread."""
+
+    @functools.wraps(func)
+    async def wrapper(self, *args, **kwargs):
+        started, attempts, hooks = time.monotonic(), 0, self.hooks
+        while True:
+            error, _ = self._before_attempt(started)
+            if error is not None:
+                return self._failed_response(error, attempts, started, hooks)
+            attempts += 1
+            ctx = None
+            try:
+                await self._athrottle(*args, **kwargs)
+                # The rate limiter may have held the call; time the attempt from what's left now.
+                error, timeout = self._before_attempt(started, throttled=True)
+                if error is not None:
+                    return self._failed_response(error, attempts, started, hooks)
+                ctx = self._begin_attempt(hooks, attempts)
+                response = await func(self, *args, **self._with_timeout(kwargs, timeout))
+            except Exception as e:
+                error, delay = self._after_failure(e, attempts, started)
+                if delay is None:
+                    return self._failed_response(error, attempts, started, hooks, ctx)
+                logger.warning("Error calling %s (%s): %s. Retrying in %.1fs...", self.__class__.__name__, error.kind.value, e, delay,
+                               extra={"event": "retry", "model": self.model, "error_kind": error.kind.value})
+                if ctx is not None:
+                    emit(hooks, "on_retry", ctx, error, delay)
+                await asyncio.sleep(delay)
+                continue
+            self.circuit_breaker.record_success()
+            response.attempts = attempts
+            self._apply_raw_policy(response)
+            if ctx is not None:
+                emit(hooks, "after_response", ctx, response)
+            return response
 
     return wrapper
 
@@ -80,205 +232,526 @@ def retry_handler(func):
 class LlmProvider(abc.ABC):
     """Abstract interface for an LLM provider."""
 
-    def __init__(self, model: str, max_retry: int = 3, **kwargs):
+    provider_name: str = ""  # Short provider family name, e.g. "openai"; used for per-provider limits.
+
+    def __init__(self, model: str, max_retry: int = 3, base_url: Optional[str] = None,
+                 pool: Optional["PoolConfig"] = None, retry_policy: Optional[RetryPolicy] = None,
+                 prompt_cache: bool = False, hooks: Optional[List[CouncilHook]] = None,
+                 raw_response: str = "keep", **kwargs):
+        if raw_response not in RAW_RESPONSE_MODES:
+            raise ValueError(f"raw_response must be one of {RAW_RESPONSE_MODES}, not {raw_response!r}.")
         self.model = model
+        self.raw_response = raw_response  # What responses keep of the SDK object; "drop" for large runs
+        self._hooks = list(hooks or [])  # Metrics/tracing hooks for this provider only
+        self.prompt_cache = prompt_cache  # Treat leading system messages as a cacheable prefix
         self.max_retry = max(1, min(max_retry, 5))
+        self.retry_policy = retry_policy or RetryPolicy(max_attempts=self.max_retry)
+        self.base_url = base_url  # Alternate API endpoint, e.g. a proxy or local stand-in server
+        self.pool = pool  # Connection pool settings; defaults to the shared registry's
+
+    @property
+    def rate_limiter(self) -> RateLimiter:
+        """The RPM/TPM limiter shared by every council of this provider."""
+        return get_rate_limiter(self.provider_name)
+
+    @property
+    def hooks(self) -> List[CouncilHook]:
+        """This provider's hooks followed by the process-wide ones from `jedi_council.hooks.add_hook`."""
+        global_hooks = get_hooks()
+        return [*self._hooks, *global_hooks] if self._hooks else global_hooks
+
+    @property
+    def circuit_breaker(self) -> CircuitBreaker:
+        """The circuit breaker shared by every council of this provider."""
+        return get_circuit_breaker(self.provider_name)
+
+    # --- Retry plumbing used by retry_handler / async_retry_handler ---
+    def _before_attempt(self, started: float, throttled: bool = False) -> Tuple[Optional[CouncilError], Optional[float]]:
+        """
+        Returns (error, None) if the call must stop now, else (None, timeout for the next attempt).
 
-    @abc.abstractmethod
-    def generate(self, messages: List[Dict[str, str]], **kwargs) -> CouncilResponse:
-        """The core method all providers must implement."""
-        pass
-
-
-# --- Internal Provider Implementations ---
-class _OpenAIProvider(LlmProvider):
-    def __init__(self, **kwargs):
-        super().__init__(**kwargs)
-        self.client = OpenAI(api_key=os.environ.get("OPENAI_API_KEY"))
-
-    @retry_handler
-    def generate(self, messages: List[Dict[str, str]], **kwargs) -> CouncilResponse:
-        logger.info(f"Consulting OpenAI model: {self.model}")
-        start_time = time.time()
-
-        params = {"temperature": 0.2, "max_tokens": 2048, **kwargs}
-        response = self.client.chat.completions.create(
-            model=self.model,
-            messages=messages,
-            **params
-        )
-        latency_ms = (time.time() - start_time) * 1000
-        logger.info(f"Received wisdom from {self.model} in {latency_ms:.0f}ms.")
-
+        Called once before throttling, which checks the circuit, and again with `throttled=True`
+        after it, since the rate limiter's wait comes out of the same deadline.
+        """
+        if not throttled and not self.circuit_breaker.allow():
+            return CouncilError(ErrorKind.CIRCUIT_OPEN, f"The {self.provider_name} circuit is open; failing fast."), None
+        timeout = self.retry_policy.attempt_timeout(started)
+        if timeout is not None and timeout <= 0:
+            if throttled:
+                self.circuit_breaker.record_failure(ErrorKind.DEADLINE_EXCEEDED)  # Frees a half-open probe slot
+            waited = " waiting for the rate limiter" if throttled else ""
+            return CouncilError(ErrorKind.DEADLINE_EXCEEDED, f"Deadline of {self.retry_policy.deadline_s}s exceeded{waited}."), None
+        return None, timeout
+
+    def _after_failure(self, error: Exception, attempts: int, started: float) -> Tuple[CouncilError, Optional[float]]:
+        """Classifies a failed attempt; returns the typed error and the backoff delay, or None to give up."""
+        policy = self.retry_policy
+        kind = policy.classify(error)
+        self.circuit_breaker.record_failure(kind)
+        council_error = CouncilError.from_exception(error, kind)
+        if kind is ErrorKind.FATAL or attempts >= policy.max_attempts:
+            return council_error, None
+        delay = policy.backoff(attempts, error, kind)
+        remaining = policy.remaining(started)
+        if remaining is not None and delay >= remaining:
+            return CouncilError(ErrorKind.DEADLINE_EXCEEDED, f"Deadline of {policy.deadline_s}s exceeded after {attempts} attempt(s); last error: {council_error}",
+                                cause=error, status_code=council_error.status_code), None
+        return council_error, delay
+
+    @staticmethod
+    def _with_timeout(kwargs: Dict[str, Any], timeout: Optional[float]) -> Dict[str, Any]:
+        # Providers translate `timeout` (seconds) into their SDK's per-request timeout.
+        return kwargs if timeout is None else {**kwargs, "timeout": timeout}
+
+    def _begin_attempt(self, hooks: List[CouncilHook], attempt: int, streamed: bool = False) -> Optional[CallContext]:
+        """Starts timing an attempt and fires `before_request`. Without hooks this costs nothing and returns None."""
+        if not hooks:
+            return None
+        ctx = CallContext(self.provider_name, self.model, attempt, streamed=streamed, started=time.perf_counter())
+        emit(hooks, "before_request", ctx)
+        return ctx
+
+    def _failed_response(self, error: CouncilError, attempts: int, started: float,
+                         hooks: Optional[List[CouncilHook]] = None, ctx: Optional[CallContext] = None) -> CouncilResponse:
+        logger.error("%s failed after %d attempt(s): %s", self.model, attempts, error,
+                     extra={"event": "error", "model": self.model, "error_kind": error.kind.value, "attempts": attempts})
+        if hooks:
+            emit(hooks, "on_error", ctx or CallContext(self.provider_name, self.model, attempts), error)
         return CouncilResponse(
-            text=response.choices[0].message.content,
+            text=ERROR_COUNCIL_RESPONSE,
             model=self.model,
-            usage=UsageInfo(
-                input_tokens=response.usage.prompt_tokens,
-                output_tokens=response.usage.completion_tokens,
-                cost=estimate_cost(self.model, input_tokens=response.usage.prompt_tokens, output_tokens=response.usage.completion_tokens),
-            ),
-            latency_ms=latency_ms,
-            raw_response=response
+            usage=UsageInfo(input_tokens=0, output_tokens=0),
+            latency_ms=(time.monotonic() - started) * 1000,
+            raw_response=None,
+            error=error,
+            attempts=attempts,
         )
 
+    def _apply_raw_policy(self, response: CouncilResponse) -> CouncilResponse:
+        return trim_raw_response(response, self.raw_response)
+
+    def _cache_prefix(self, messages: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        Strips `"cache": True` markers from `messages` and returns them with the cacheable prefix length.
 
-class _AnthropicProvider(LlmProvider):
-    def __init__(self, **kwargs):
-        super().__init__(**kwargs)
-        self.client = Anthropic(api_key=os.environ.get("ANTHROPIC_API_KEY"))
+        The prefix ends at the last marked message. Without markers, `prompt_cache=True` makes the
+        leading system messages the prefix. Providers mark the prefix for their prompt cache.
+        """
+        prefix = 0
+        for index, message in enumerate(messages):
+            if message.get(CACHE_MARKER):
+                prefix = index + 1
+        if not prefix and self.prompt_cache:
+            while prefix < len(messages) and messages[prefix]["role"] == "system":
+                prefix += 1
+        clean = [{k: v for k, v in m.items() if k != CACHE_MARKER} if CACHE_MARKER in m else m for m in messages]
+        return clean, prefix
+
+    def _throttle(self, messages: List[Dict[str, str]], **kwargs) -> None:
+        self.rate_limiter.acquire(estimate_request_tokens(messages, kwargs.get("max_tokens", 2048)))
+
+    async def _athrottle(self, messages: List[Dict[str, str]], **kwargs) -> None:
+        await self.rate_limiter.aacquire(estimate_request_tokens(messages, kwargs.get("max_tokens", 2048)))
 
-    @retry_handler
+    @abc.abstractmethod
     def generate(self, messages: List[Dict[str, str]], **kwargs) -> CouncilResponse:
-        logger.info(f"Consulting Anthropic model: {self.model}")
-        start_time = time.time()
-
-        system_prompt_content = next((m['content'] for m in messages if m['role'] == 'system'), None)
-        user_messages = [m for m in messages if m['role'] != 'system']
-
-        # Fix: system should be a plain string or None
-        system_param = system_prompt_content
-
-
-        params = {"temperature": 0.2, "max_tokens": 2048, **kwargs}
-        if system_param is not None:
-            response = self.client.messages.create(
-                model=self.model,
-                messages=user_messages,
-                system=system_param,
-                **params
-            )
-        else:
-            response = self.client.messages.create(
-                model=self.model,
-                messages=user_messages,
-                **params
-            )
-        latency_ms = (time.time() - start_time) * 1000
-        logger.info(f"Received wisdom from {self.model} in {latency_ms:.0f}ms.")
+        """The core method all providers must implement."""
+        pass
 
-        return CouncilResponse(
-            text=response.content[0].text,
-            model=self.model,
-            usage=UsageInfo(
-                input_tokens=response.usage.input_tokens,
-                output_tokens=response.usage.output_tokens,
-                cost=estimate_cost(self.model, input_tokens=response.usage.input_tokens,
-                                   output_tokens=response.usage.output_tokens),
+    @abc.abstractmethod
+    async def agenerate(self, messages: List[Dict[str, str]], **kwargs) -> CouncilResponse:
+        """Async counterpart of `generate`, backed by the provider's async client."""
+        pass
 
-            ),
-            latency_ms=latency_ms,
-            raw_response=response
-        )
+    @abc.abstractmethod
+    def stream(self, messages: List[Dict[str, str]], **kwargs) -> Iterator[str]:
+        """
+        Yields text deltas as the provider produces them.
 
+        The generator's return value is a `(UsageInfo, raw_response)` tuple, which
+        `CouncilStream` uses to build the final `CouncilResponse`.
+        """
+        pass
 
-class _GeminiProvider(LlmProvider):
-    def __init__(self, **kwargs):
-        super().__init__(**kwargs)
-        genai.configure(api_key=os.environ.get("GEMINI_API_KEY"))
-        # Fix: use correct full model name
-        self.model_obj = genai.GenerativeModel(
-            model_name=f"models/{self.model}",
-            generation_config=genai.types.GenerationConfig(
-                temperature=0.2,
-                max_output_tokens=1000
-            )
-        )
+    # --- Batch API (optional; only providers with an asynchronous batch endpoint override these) ---
+    batch_max_requests: int = 0  # Per-batch request limit; 0 means no batch support
+    batch_max_bytes: int = 0  # Per-batch payload size limit
 
-    @retry_handler
-    def generate(self, messages: List[Dict[str, str]], **kwargs) -> CouncilResponse:
-        logger.info(f"Consulting Gemini model: {self.model}")
-        start_time = time.time()
-        text_input = "\n".join([f"{m['role'].capitalize()}: {m['content']}" for m in messages])
-        response = self.model_obj.generate_content(text_input, generation_config={"temperature": 0.2, **kwargs})
-        latency_ms = (time.time() - start_time) * 1000
-        logger.info(f"Received wisdom from {self.model} in {latency_ms:.0f}ms.")
-        return CouncilResponse(
-            text=response.text,
-            model=self.model,
-            usage=UsageInfo(input_tokens=0, output_tokens=0),  # Gemini doesn't return usage yet
-            latency_ms=latency_ms,
-            raw_response=response
-        )
+    def batch_entry(self, request: "BatchRequest") -> Dict[str, Any]:
+        """Converts a BatchRequest into one line of the provider's batch input."""
+        raise NotImplementedError(f"{self.provider_name or self.__class__.__name__} does not support batch requests.")
 
-class _MistralProvider(LlmProvider):
-    def __init__(self, **kwargs):
-        super().__init__(**kwargs)
-        self.api_key = os.environ.get("MISTRAL_API_KEY")
-        if not self.api_key:
-            raise RuntimeError("Mistral API key not set.")
-        self.client = Mistral(api_key=self.api_key)
+    def submit_batch(self, entries: List[Dict[str, Any]]) -> str:
+        """Submits one chunk of batch entries and returns the provider's batch id."""
+        raise NotImplementedError(f"{self.provider_name or self.__class__.__name__} does not support batch requests.")
 
-    @retry_handler
-    def generate(self, messages: List[Dict[str, str]], **kwargs) -> CouncilResponse:
-        logger.info(f"Consulting Mistral model: {self.model}")
-        start_time = time.time()
+    def batch_done(self, batch_id: str) -> bool:
+        """Whether the batch has reached a terminal state (completed, failed, expired or cancelled)."""
+        raise NotImplementedError(f"{self.provider_name or self.__class__.__name__} does not support batch requests.")
+
+    def batch_results(self, batch_id: str) -> Iterator[CouncilResponse]:
+        """Streams a finished batch's results, with batch-discounted cost and `request_id` set."""
+        raise NotImplementedError(f"{self.provider_name or self.__class__.__name__} does not support batch requests.")
 
-        # FIX: Use `.chat.complete()` instead of `.chat(...)`
-        response = self.client.chat.complete(
+    def _batch_error(self, custom_id: str, raw_response: Any) -> CouncilResponse:
+        return CouncilResponse(
+            text=ERROR_COUNCIL_RESPONSE,
             model=self.model,
-            messages=messages,
-            temperature=kwargs.get("temperature", 0.2),
-            max_tokens=kwargs.get("max_tokens", 2048),
+            usage=UsageInfo(input_tokens=0, output_tokens=0),
+            latency_ms=0,
+            raw_response=raw_response,
+            request_id=custom_id,
         )
 
-        latency_ms = (time.time() - start_time) * 1000
-        logger.info(f"Received wisdom from {self.model} in {latency_ms:.0f}ms.")
+    def _usage_info(self, input_tokens: int, output_tokens: int, batch: bool = False,
+                    cache_read_tokens: int = 0, cache_write_tokens: int = 0) -> UsageInfo:
+        return UsageInfo(
+            input_tokens=input_tokens,
+            output_tokens=output_tokens,
+            cost=estimate_cost(self.model, input_tokens=input_tokens, output_tokens=output_tokens, batch=batch,
+                               cache_read_tokens=cache_read_tokens, cache_write_tokens=cache_write_tokens),
+            cache_read_tokens=cache_read_tokens,
+            cache_write_tokens=cache_write_tokens,
+        )
 
-        return CouncilResponse(
-            text=response.choices[0].message.content,
-            model=self.model,
-            usage=UsageInfo(
-                input_tokens=response.usage.prompt_tokens,
-                output_tokens=response.usage.completion_tokens,
-                cost=estimate_cost(self.model, input_tokens=response.usage.prompt_tokens,
-                                   output_tokens=response.usage.completion_tokens),
 
-            ),
+class CouncilStream:
+    """
+    An iterator over the text deltas of a streamed consultation.
+
+    Once the stream is exhausted, `response` holds the full `CouncilResponse`, including
+    usage, time-to-first-token and tokens/sec. Failures before the first delta are retried under
+    the provider's RetryPolicy and circuit breaker; if the call still fails, the stream yields
+    nothing and `response` is the failed response. A failure after the first delta is raised.
+    """
+
+    def __init__(self, provider: LlmProvider, messages: List[Dict[str, str]], cache: Optional["ResponseCache"] = None, **kwargs):
+        self._provider = provider
+        self._messages = messages
+        self._cache = cache
+        self._kwargs = kwargs
+        self._deltas: Optional[Iterator[str]] = None
+        self.response: Optional[CouncilResponse] = None
+
+    def __iter__(self) -> Iterator[str]:
+        if self._deltas is None:
+            self._deltas = self._consume()
+        return self._deltas
+
+    def final_response(self) -> CouncilResponse:
+        """Drains any remaining deltas and returns the full `CouncilResponse`."""
+        for _ in self:
+            pass
+        return self.response
+
+    def _consume(self) -> Iterator[str]:
+        cache_key = None
+        if self._cache is not None:
+            cache_key = self._cache.key(self._provider.model, self._messages, self._kwargs)
+            cached = self._cache.get(cache_key)
+            if cached is not None:
+                # A cache hit arrives as a single delta.
+                cached.ttft_ms = cached.latency_ms
+                self.response = cached
+                yield cached.text
+                return
+
+        logger.info("Streaming wisdom from %s", self._provider.model, extra={"event": "request", "model": self._provider.model})
+        provider, hooks = self._provider, self._provider.hooks
+        started, attempts = time.monotonic(), 0
+        # Until the first delta arrives the caller has seen nothing, so failures are retried like
+        # `retry_handler` does. After that, a failure is raised: the text so far can't be taken back.
+        while True:
+            error, _ = provider._before_attempt(started)
+            if error is None:
+                provider._throttle(self._messages, **self._kwargs)
+                error, _ = provider._before_attempt(started, throttled=True)
+            if error is not None:
+                self.response = provider._failed_response(error, attempts, started, hooks)
+                return
+            attempts += 1
+            ctx = provider._begin_attempt(hooks, attempts, streamed=True)
+            start_time = time.perf_counter()
+            try:
+                deltas = provider.stream(self._messages, **self._kwargs)
+                delta, result = self._next_delta(deltas)
+                break
+            except Exception as e:
+                error, delay = provider._after_failure(e, attempts, started)
+                if delay is None:
+                    self.response = provider._failed_response(error, attempts, started, hooks, ctx)
+                    return
+                logger.warning("Error streaming from %s (%s): %s. Retrying in %.1fs...", provider.__class__.__name__, error.kind.value, e, delay,
+                               extra={"event": "retry", "model": provider.model, "error_kind": error.kind.value})
+                if ctx is not None:
+                    emit(hooks, "on_retry", ctx, error, delay)
+                time.sleep(delay)
+
+        ttft_ms = None
+        chunks = []
+        try:
+            while delta is not None:
+                if ttft_ms is None:
+                    ttft_ms = (time.perf_counter() - start_time) * 1000
+                    if ctx is not None:
+                        ctx.data["ttft_ms"] = ttft_ms
+                chunks.append(delta)
+                yield delta
+                delta, result = self._next_delta(deltas)
+        except GeneratorExit:
+            # The caller stopped iterating early: close the call out so in-flight gauges and spans end.
+            deltas.close()
+            if ctx is not None:
+                emit(hooks, "on_error", ctx, CouncilError(ErrorKind.CANCELLED, "Stream closed before it finished."))
+            raise
+        except Exception as e:
+            kind = provider.retry_policy.classify(e)
+            provider.circuit_breaker.record_failure(kind)
+            if ctx is not None:
+                emit(hooks, "on_error", ctx, CouncilError.from_exception(e, kind))
+            raise
+        usage, raw_response = result
+        provider.circuit_breaker.record_success()
+
+        latency_ms = (time.perf_counter() - start_time) * 1000
+        logger.info("Received wisdom from %s in %.0fms (first token after %.0fms).", self._provider.model, latency_ms, ttft_ms or 0,
+                    extra={"event": "response", "model": self._provider.model, "latency_ms": latency_ms, "ttft_ms": ttft_ms})
+        # Decode rate: output tokens over the time spent generating after the first token.
+        generation_s = (latency_ms - (ttft_ms or 0)) / 1000 or latency_ms / 1000
+        tokens_per_sec = usage.output_tokens / generation_s if usage.output_tokens and generation_s > 0 else None
+        self.response = CouncilResponse(
+            text="".join(chunks),
+            model=self._provider.model,
+            usage=usage,
             latency_ms=latency_ms,
-            raw_response=response
+            raw_response=raw_response,
+            ttft_ms=ttft_ms,
+            tokens_per_sec=tokens_per_sec,
+            attempts=attempts,
         )
+        provider._apply_raw_policy(self.response)
+        if ctx is not None:
+            emit(hooks, "after_response", ctx, self.response)
+        if cache_key is not None:
+            self._cache.put(cache_key, self.response)
+
+    @staticmethod
+    def _next_delta(deltas: Iterator[str]) -> Tuple[Optional[str], Any]:
+        """(the next non-empty delta, None), or (None, the provider stream's return value) once it ends."""
+        while True:
+            try:
+                delta = next(deltas)
+            except StopIteration as done:
+                return None, done.value
+            if delta:
+                return delta, None
+
+
+# --- Provider Routing ---
+# provider name -> (module, class); modules are imported on first use so that importing
+# jedi_council.core does not pay for every provider SDK.
+_PROVIDER_CLASSES = {
+    "openai": ("jedi_council.providers.openai_provider", "_OpenAIProvider"),
+    "anthropic": ("jedi_council.providers.anthropic_provider", "_AnthropicProvider"),
+    "gemini": ("jedi_council.providers.gemini_provider", "_GeminiProvider"),
+    "mistral": ("jedi_council.providers.mistral_provider", "_MistralProvider"),
+}
+
+
+def route_model(model: str) -> str:
+    """Returns the name of the provider that serves `model`, e.g. "openai" for "gpt-4o"."""
+    if model.startswith("gpt"):
+        return "openai"
+    elif "claude" in model:
+        return "anthropic"
+    elif "gemini" in model:
+        return "gemini"
+    elif "mistral" in model:
+        return "mistral"
+    raise ValueError(f"No council member found for model '{model}'.")
+
+
+def _load_provider(provider_name: str) -> type:
+    module_name, class_name = _PROVIDER_CLASSES[provider_name]
+    return getattr(importlib.import_module(module_name), class_name)
+
+
+def __getattr__(name: str) -> Any:
+    # Keeps `jedi_council.core._OpenAIProvider` and friends importable (and patchable) without eager imports.
+    for provider_name, (_, class_name) in _PROVIDER_CLASSES.items():
+        if name == class_name:
+            return _load_provider(provider_name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 # --- The Main User-Facing Class ---
 class TheJediCouncil:
     """A unified wrapper to seek wisdom from various LLMs."""
 
-    def __init__(self, model: str, **kwargs):
+    def __init__(self, model: str, cache: Optional["ResponseCache"] = None,
+                 coalesce: "bool | SingleFlight" = False, **kwargs):
         """
         Initializes the council by selecting the correct member (provider).
 
         Args:
             model (str): The name of the model to consult (e.g., "gpt-4o", "claude-3-5-sonnet-20240620").
+            cache (ResponseCache, optional): Serve repeated requests from this cache instead of the provider.
+                A `jedi_council.semantic_cache.SemanticCache` also serves near-duplicate prompts.
+            coalesce (bool or SingleFlight): Let identical concurrent requests share one provider call.
+                Pass a SingleFlight to share it between councils.
         """
-        logger.info(f"Convening The Jedi Council to consult model: {model}")
-
-        # Factory Logic: Route to the correct internal provider
-        if model.startswith("gpt"):
-            self._provider = _OpenAIProvider(model=model, **kwargs)
-        elif "claude" in model:
-            self._provider = _AnthropicProvider(model=model, **kwargs)
-        elif "gemini" in model:
-            self._provider = _GeminiProvider(model=model, **kwargs)
-        elif "mistral" in model:
-            self._provider = _MistralProvider(model=model, **kwargs)
-        else:
-            raise ValueError(f"No council member found for model '{model}'.")
-
-    def get_wisdom(self, prompt: str | List[Dict[str, str]], **kwargs) -> CouncilResponse:
+        logger.info("Convening The Jedi Council to consult model: %s", model)
+        self.cache = cache
+        self.single_flight: Optional["SingleFlight"] = None
+        if coalesce:
+            from jedi_council.coalesce import SingleFlight
+            self.single_flight = coalesce if isinstance(coalesce, SingleFlight) else SingleFlight()
+
+        load_env()
+        self._provider = _load_provider(route_model(model))(model=model, **kwargs)
+
+    @property
+    def provider_name(self) -> str:
+        """The provider family serving this council's model, e.g. "openai" or "anthropic"."""
+        return self._provider.provider_name
+
+    def get_wisdom(self, prompt: str | List[Dict[str, str]], stream: bool = False, **kwargs) -> CouncilResponse | CouncilStream:
         """
         Presents a query to the council and returns its wisdom.
 
         Args:
             prompt (str or List[Dict]): A single query string or a list of message dictionaries.
+            stream (bool): If True, return a `CouncilStream` of text deltas instead (see `stream_wisdom`).
             **kwargs: Additional parameters like temperature, max_tokens, etc.
 
         Returns:
             A CouncilResponse object containing the text, usage data, and more.
         """
-        if isinstance(prompt, str):
-            messages = [{"role": "user", "content": prompt}]
-        else:
-            messages = prompt
+        if stream:
+            return self.stream_wisdom(prompt, **kwargs)
+        messages = self._to_messages(prompt)
+        if self.single_flight is None:
+            return self._consult(messages, kwargs)
+        key = self.single_flight.key(self._provider.model, messages, kwargs)
+        return self.single_flight.do(key, self._consult, messages, kwargs)
+
+    def stream_wisdom(self, prompt: str | List[Dict[str, str]], **kwargs) -> CouncilStream:
+        """
+        Presents a query to the council and streams its wisdom as it arrives.
+
+        Args:
+            prompt (str or List[Dict]): A single query string or a list of message dictionaries.
+            **kwargs: Additional parameters like temperature, max_tokens, etc.
 
-        return self._provider.generate(messages, **kwargs)
+        Returns:
+            A CouncilStream yielding text deltas. After iteration, `stream.response` is the full
+            CouncilResponse, with `ttft_ms` and `tokens_per_sec` filled in. The call is retried
+            until its first delta arrives; a call that still fails yields nothing and leaves a
+            failed `stream.response`.
+        """
+        return CouncilStream(self._provider, self._to_messages(prompt), cache=self.cache, **kwargs)
+
+    async def aget_wisdom(self, prompt: str | List[Dict[str, str]], **kwargs) -> CouncilResponse:
+        """
+        Async counterpart of `get_wisdom`. Awaits the provider's async client, so many
+        consultations can be in flight on one event loop.
+
+        Args:
+            prompt (str or List[Dict]): A single query string or a list of message dictionaries.
+            **kwargs: Additional parameters like temperature, max_tokens, etc.
+
+        Returns:
+            A CouncilResponse object containing the text, usage data, and more.
+        """
+        messages = self._to_messages(prompt)
+        if self.single_flight is None:
+            return await self._aconsult(messages, kwargs)
+        key = self.single_flight.key(self._provider.model, messages, kwargs)
+        return await self.single_flight.ado(key, self._aconsult, messages, kwargs)
+
+    def _consult(self, messages: List[Dict[str, str]], kwargs: Dict[str, Any]) -> CouncilResponse:
+        if self.cache is None:
+            return self._provider.generate(messages, **kwargs)
+
+        cache_key = self.cache.key(self._provider.model, messages, kwargs)
+        response = self.cache.get(cache_key)
+        if response is None:
+            response = self._provider.generate(messages, **kwargs)
+            self.cache.put(cache_key, response)
+        return response
+
+    async def _aconsult(self, messages: List[Dict[str, str]], kwargs: Dict[str, Any]) -> CouncilResponse:
+        if self.cache is None:
+            return await self._provider.agenerate(messages, **kwargs)
+
+        cache_key = self.cache.key(self._provider.model, messages, kwargs)
+        response = self.cache.get(cache_key)
+        if response is None:
+            response = await self._provider.agenerate(messages, **kwargs)
+            self.cache.put(cache_key, response)
+        return response
+
+    def submit_batch(self, requests: str | Iterable["BatchRequest"]) -> "BatchJob":
+        """
+        Submits prompts to the provider's asynchronous batch endpoint, chunked to its limits.
+
+        Args:
+            requests (str or Iterable[BatchRequest]): A JSONL path (see `jedi_council.batch.load_batch_requests`)
+                or BatchRequest objects.
+
+        Returns:
+            A BatchJob recording the provider batch ids; pass it to `collect_batch`.
+
+        Raises:
+            BatchSubmitError: A chunk failed after earlier ones were submitted; its `job` holds those.
+        """
+        from jedi_council.batch import BatchJob, BatchSubmitError, chunk_entries, load_batch_requests
+
+        if isinstance(requests, str):
+            requests = load_batch_requests(requests)
+        provider = self._provider
+        if not provider.batch_max_requests:
+            raise NotImplementedError(f"{provider.provider_name} does not support batch requests.")
+
+        job = BatchJob(provider=provider.provider_name, model=provider.model, batch_ids=[])
+        entries = (provider.batch_entry(request) for request in requests)
+        for chunk in chunk_entries(entries, provider.batch_max_requests, provider.batch_max_bytes):
+            try:
+                batch_id = provider.submit_batch(chunk)
+            except Exception as e:
+                if not job.batch_ids:
+                    raise
+                # The earlier batches are already running (and billed); don't lose their ids.
+                raise BatchSubmitError(f"Submitted {job.request_count} requests in {len(job.batch_ids)} batch(es), "
+                                       f"then failed: {e}", job) from e
+            job.batch_ids.append(batch_id)
+            job.request_count += len(chunk)
+            logger.info("Submitted batch %s with %d requests to %s.", batch_id, len(chunk), provider.model)
+        return job
+
+    def collect_batch(self, job: "BatchJob", poll_interval: float = 30.0, timeout: Optional[float] = None) -> Iterator[CouncilResponse]:
+        """
+        Waits for each batch in `job` to finish and streams its results as they become available.
+
+        Args:
+            job (BatchJob): The job returned by `submit_batch`.
+            poll_interval (float): Seconds between status checks.
+            timeout (float, optional): Give up with TimeoutError after this many seconds.
+
+        Returns:
+            An iterator of CouncilResponse objects, each with `request_id` set to its request's custom_id.
+        """
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        for batch_id in job.batch_ids:
+            while not self._provider.batch_done(batch_id):
+                if deadline is not None and time.monotonic() >= deadline:
+                    raise TimeoutError(f"Batch {batch_id} did not finish within {timeout}s.")
+                time.sleep(poll_interval)
+            for response in self._provider.batch_results(batch_id):
+                yield self._provider._apply_raw_policy(response)
+
+    @staticmethod
+    def _to_messages(prompt: str | List[Dict[str, str]]) -> List[Dict[str, str]]:
+        if isinstance(prompt, str):
+            return [{"role": "user", "content": prompt}]
+        return prompt
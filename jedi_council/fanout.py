@@ -0,0 +1,33 @@
+# jedi_council/fanout.py
+"""
+Shared plumbing for councils that send one prompt to several models and cancel the calls they
+no longer need (HedgedCouncil, QuorumCouncil).
+"""
+
+import time
+import asyncio
+import logging
+from typing import Dict, List
+
+from jedi_council.core import TheJediCouncil, CouncilResponse
+from jedi_council.retry import CouncilError, classify_error
+from jedi_council.utils.utils import estimate_cost, estimate_request_tokens
+
+logger = logging.getLogger(__name__)
+
+
+def task_response(task: asyncio.Task, council: TheJediCouncil) -> CouncilResponse:
+    """The finished call's response. A call that raised becomes a failed response instead."""
+    try:
+        return task.result()
+    except Exception as e:
+        # Provider calls normally return failed responses rather than raising; handle stragglers alike.
+        logger.warning("Call to %s raised: %s", council._provider.model, e)
+        error = CouncilError.from_exception(e, classify_error(e))
+        return council._provider._failed_response(error, attempts=1, started=time.monotonic())
+
+
+def cancelled_cost(council: TheJediCouncil, prompt: str | List[Dict[str, str]]) -> float:
+    """What a cancelled call is charged: its estimated prompt tokens, as the provider may have billed them."""
+    model = council._provider.model
+    return estimate_cost(model, estimate_request_tokens(council._to_messages(prompt)), 0)
@@ -0,0 +1,158 @@
+# jedi_council/hedge.py
+
+import math
+import asyncio
+import logging
+import threading
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Deque, Dict, List, Optional
+
+from jedi_council.clients import run_sync
+from jedi_council.core import TheJediCouncil, CouncilResponse
+from jedi_council.fanout import cancelled_cost, task_response
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class HedgeInfo:
+    """How a hedged call was won, attached to the winning `CouncilResponse.hedge`."""
+    winner: str  # The model whose response was returned
+    launched: List[str] = field(default_factory=list)  # Models called, in launch order
+    hedge_delay_ms: float = 0.0  # How long each backup waited for the model before it
+    hedge_cost: float = 0.0  # Cost spent on every model but the winner
+
+
+class HedgedCouncil:
+    """
+    Races a primary model against backups to cut tail latency.
+
+    The primary is called first. A backup is launched when the call before it hasn't answered
+    within the hedge delay, or straight away if it failed. The first successful response wins and
+    the rest are cancelled. The delay is either fixed or learned: a percentile of the primary's
+    recent latencies, so only the slowest few percent of calls pay for a hedge.
+    """
+
+    def __init__(self, primary: str, backups: List[str], hedge_delay_ms: Optional[float] = None,
+                 hedge_percentile: float = 95.0, initial_delay_ms: float = 2000.0, min_samples: int = 20,
+                 window: int = 500, **kwargs):
+        """
+        Args:
+            primary (str): The model to consult first.
+            backups (List[str]): Models to fall back to, in order.
+            hedge_delay_ms (float, optional): A fixed hedge delay. If unset, the delay is learned.
+            hedge_percentile (float): The percentile of the primary's latency to hedge at when learning.
+            initial_delay_ms (float): The delay used until `min_samples` latencies have been seen.
+            min_samples (int): Latencies needed before the learned delay is trusted.
+            window (int): How many recent primary latencies to learn from.
+            **kwargs: Passed to each model's TheJediCouncil (e.g. cache, retry_policy).
+        """
+        if not backups:
+            raise ValueError("HedgedCouncil needs at least one backup model.")
+        self.models = [primary, *backups]
+        if len(set(self.models)) != len(self.models):
+            # A repeat would race a provider against itself and share one response object between calls.
+            raise ValueError(f"HedgedCouncil needs distinct models, not {self.models}.")
+        self.councils: Dict[str, TheJediCouncil] = {model: TheJediCouncil(model=model, **kwargs) for model in self.models}
+        self.hedge_delay_ms = hedge_delay_ms
+        self.hedge_percentile = hedge_percentile
+        self.initial_delay_ms = initial_delay_ms
+        self.min_samples = min_samples
+        self._latencies: Deque[float] = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    @property
+    def current_delay_ms(self) -> float:
+        """The delay before the next backup launches, fixed or learned from the primary's latencies."""
+        if self.hedge_delay_ms is not None:
+            return self.hedge_delay_ms
+        with self._lock:
+            samples = sorted(self._latencies)
+        if len(samples) < self.min_samples:
+            return self.initial_delay_ms
+        # Nearest rank: the smallest latency at least hedge_percentile% of the samples don't exceed.
+        index = min(len(samples) - 1, max(0, math.ceil(len(samples) * self.hedge_percentile / 100) - 1))
+        return samples[index]
+
+    def record_latency(self, latency_ms: float) -> None:
+        """Feeds a primary latency to the learned delay, e.g. from past benchmark runs."""
+        with self._lock:
+            self._latencies.append(latency_ms)
+
+    def get_wisdom(self, prompt: str | List[Dict[str, str]], **kwargs) -> CouncilResponse:
+        """Synchronous `aget_wisdom`, run on the shared background loop so async clients are reused."""
+        return run_sync(self.aget_wisdom(prompt, **kwargs))
+
+    async def aget_wisdom(self, prompt: str | List[Dict[str, str]], **kwargs) -> CouncilResponse:
+        """
+        Races the council's models and returns the first successful response.
+
+        Args:
+            prompt (str or List[Dict]): A single query string or a list of message dictionaries.
+            **kwargs: Additional parameters like temperature, max_tokens, etc.
+
+        Returns:
+            The winning CouncilResponse, with `hedge` describing the race. If every model fails,
+            the primary's failed response is returned.
+        """
+        delay_s = self.current_delay_ms / 1000
+        loop = asyncio.get_running_loop()
+        pending: Dict[asyncio.Task, str] = {}
+        finished: Dict[str, CouncilResponse] = {}
+        launched: List[str] = []
+
+        def launch() -> None:
+            model = self.models[len(launched)]
+            launched.append(model)
+            pending[asyncio.ensure_future(self.councils[model].aget_wisdom(prompt, **kwargs))] = model
+            logger.debug("Hedge launched %s", model)
+
+        launch()
+        started = loop.time()
+        winner: Optional[CouncilResponse] = None
+        try:
+            while pending and winner is None:
+                can_hedge = len(launched) < len(self.models)
+                done, _ = await asyncio.wait(pending, timeout=delay_s if can_hedge else None,
+                                             return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    launch()  # The latest call is slow: hedge with the next model.
+                    continue
+                for task in done:
+                    model = pending.pop(task)
+                    response = task_response(task, self.councils[model])
+                    finished[model] = response
+                    if model == self.models[0] and not response.failed and not response.cached:
+                        self.record_latency(response.latency_ms)
+                    if winner is None and not response.failed:
+                        winner = response
+                if winner is None and can_hedge and not pending:
+                    launch()  # Everything in flight failed: don't wait out the delay.
+        finally:
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+
+        response = winner or finished[self.models[0]]
+        response.hedge = HedgeInfo(winner=response.model, launched=launched, hedge_delay_ms=delay_s * 1000,
+                                   hedge_cost=self._hedge_cost(response, launched, finished, prompt))
+        if len(launched) > 1:
+            logger.info("Hedged across %s; %s won after %.0fms.", launched, response.model, (loop.time() - started) * 1000)
+        return response
+
+    def _hedge_cost(self, winner: CouncilResponse, launched: List[str], finished: Dict[str, CouncilResponse],
+                    prompt: str | List[Dict[str, str]]) -> float:
+        """Cost of every call but the winner's. Cancelled calls are charged their estimated prompt tokens."""
+        cost = 0.0
+        for model in launched:
+            response = finished.get(model)
+            if response is winner:
+                continue
+            if response is not None:
+                cost += response.usage.cost or 0.0
+            else:
+                cost += cancelled_cost(self.councils[model], prompt)
+        return cost
+
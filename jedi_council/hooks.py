@@ -0,0 +1,90 @@
+# jedi_council/hooks.py
+
+import time
+import logging
+import threading
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence
+
+if TYPE_CHECKING:
+    from jedi_council.core import CouncilResponse
+    from jedi_council.retry import CouncilError
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CallContext:
+    """
+    One provider attempt, as seen by hooks. The same object is passed to every event of the
+    attempt, so hooks can keep per-attempt state (a span, a start time) in `data`.
+    """
+    provider: str
+    model: str
+    attempt: int  # 1-based; 0 when the call failed before any attempt (open circuit, deadline)
+    streamed: bool = False
+    started: Optional[float] = None  # time.perf_counter() when the request was sent; None if it never was
+    data: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def elapsed_ms(self) -> Optional[float]:
+        return None if self.started is None else (time.perf_counter() - self.started) * 1000
+
+
+class CouncilHook:
+    """
+    Observes provider calls. Override any of the methods; the defaults do nothing.
+
+    Hooks run inline on every call, so they should be quick. A hook that raises is logged and
+    skipped; it never fails the call.
+    """
+
+    def before_request(self, ctx: CallContext) -> None:
+        """An attempt is about to be sent (after any rate-limit wait)."""
+
+    def after_response(self, ctx: CallContext, response: "CouncilResponse") -> None:
+        """The attempt succeeded and `response` is about to be returned."""
+
+    def on_retry(self, ctx: CallContext, error: "CouncilError", delay_s: float) -> None:
+        """The attempt failed and will be retried after `delay_s`."""
+
+    def on_error(self, ctx: CallContext, error: "CouncilError") -> None:
+        """The call failed for good. `ctx.started` is None if no attempt was in flight."""
+
+
+def emit(hooks: Sequence[CouncilHook], event: str, *args: Any) -> None:
+    for hook in hooks:
+        try:
+            getattr(hook, event)(*args)
+        except Exception:
+            logger.exception("%s.%s raised; ignoring.", type(hook).__name__, event)
+
+
+# --- Process-wide Registry ---
+_hooks: List[CouncilHook] = []
+_hooks_lock = threading.Lock()
+
+
+def add_hook(hook: CouncilHook) -> CouncilHook:
+    """Registers `hook` for every council in the process. Returns it, for chaining."""
+    global _hooks
+    with _hooks_lock:
+        # Copy-on-write, so calls can read the list without taking the lock.
+        _hooks = [*_hooks, hook]
+    return hook
+
+
+def remove_hook(hook: CouncilHook) -> None:
+    global _hooks
+    with _hooks_lock:
+        _hooks = [h for h in _hooks if h is not hook]
+
+
+def get_hooks() -> List[CouncilHook]:
+    return _hooks
+
+
+def reset_hooks() -> None:
+    global _hooks
+    with _hooks_lock:
+        _hooks = []
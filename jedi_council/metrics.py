@@ -0,0 +1,308 @@
+# jedi_council/metrics.py
+"""
+Built-in hooks: an in-process metrics collector with a Prometheus text exporter, and tracing spans.
+
+    from jedi_council.hooks import add_hook
+    from jedi_council.metrics import MetricsCollector, serve_prometheus
+
+    metrics = add_hook(MetricsCollector())
+    serve_prometheus(metrics, port=9464)
+"""
+
+import os
+import time
+import logging
+import threading
+from collections import deque
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+from jedi_council.core import CouncilResponse
+from jedi_council.hooks import CallContext, CouncilHook
+from jedi_council.retry import CouncilError
+from jedi_council.stats import QuantileSketch
+
+logger = logging.getLogger(__name__)
+
+# Prometheus histogram bucket bounds for attempt latency, in seconds.
+LATENCY_BUCKETS_S = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0)
+
+
+@dataclass
+class ModelMetrics:
+    """Counters, gauges and latency distributions for one (provider, model)."""
+    latency_ms: QuantileSketch = field(default_factory=QuantileSketch)  # Successful attempts, send to response
+    ttft_ms: QuantileSketch = field(default_factory=QuantileSketch)  # Streamed responses only
+    tokens_per_sec: QuantileSketch = field(default_factory=QuantileSketch)
+    latency_buckets: List[int] = field(default_factory=lambda: [0] * (len(LATENCY_BUCKETS_S) + 1))
+    latency_sum_s: float = 0.0
+    responses: int = 0
+    failures: int = 0  # Calls that failed after all retries
+    retries: int = 0
+    errors: Dict[str, int] = field(default_factory=dict)  # Failed attempts by ErrorKind
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cache_read_tokens: int = 0
+    cost: float = 0.0
+    in_flight: int = 0
+
+    def observe_latency(self, latency_ms: float) -> None:
+        self.latency_ms.add(latency_ms)
+        seconds = latency_ms / 1000
+        self.latency_sum_s += seconds
+        for index, bound in enumerate(LATENCY_BUCKETS_S):
+            if seconds <= bound:
+                self.latency_buckets[index] += 1
+                return
+        self.latency_buckets[-1] += 1
+
+
+class MetricsCollector(CouncilHook):
+    """
+    Collects per-model latency histograms (p50/p95/p99), token throughput, cost, retries, errors
+    and in-flight gauges from hook events.
+
+    Latency is timed with `perf_counter` from when the attempt is sent until its response is
+    complete. It excludes rate-limit waits and retry backoff, which show up as retries instead.
+    Each event costs one lock acquisition and a few dictionary updates.
+    """
+
+    def __init__(self):
+        self._models: Dict[Tuple[str, str], ModelMetrics] = {}
+        self._lock = threading.Lock()
+
+    def _metrics(self, ctx: CallContext) -> ModelMetrics:
+        key = (ctx.provider, ctx.model)
+        metrics = self._models.get(key)
+        if metrics is None:
+            metrics = self._models[key] = ModelMetrics()
+        return metrics
+
+    def before_request(self, ctx: CallContext) -> None:
+        with self._lock:
+            self._metrics(ctx).in_flight += 1
+
+    def after_response(self, ctx: CallContext, response: CouncilResponse) -> None:
+        latency_ms = ctx.elapsed_ms
+        with self._lock:
+            metrics = self._metrics(ctx)
+            metrics.in_flight -= 1
+            metrics.responses += 1
+            metrics.observe_latency(latency_ms)
+            if "ttft_ms" in ctx.data:
+                metrics.ttft_ms.add(ctx.data["ttft_ms"])
+            usage = response.usage
+            metrics.input_tokens += usage.input_tokens
+            metrics.output_tokens += usage.output_tokens
+            metrics.cache_read_tokens += usage.cache_read_tokens
+            metrics.cost += usage.cost or 0.0
+            if usage.output_tokens and latency_ms > 0:
+                metrics.tokens_per_sec.add(usage.output_tokens / (latency_ms / 1000))
+
+    def on_retry(self, ctx: CallContext, error: CouncilError, delay_s: float) -> None:
+        with self._lock:
+            metrics = self._metrics(ctx)
+            metrics.in_flight -= 1
+            metrics.retries += 1
+            metrics.errors[error.kind.value] = metrics.errors.get(error.kind.value, 0) + 1
+
+    def on_error(self, ctx: CallContext, error: CouncilError) -> None:
+        with self._lock:
+            metrics = self._metrics(ctx)
+            if ctx.started is not None:
+                metrics.in_flight -= 1
+            metrics.failures += 1
+            metrics.errors[error.kind.value] = metrics.errors.get(error.kind.value, 0) + 1
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """A summary per model: latency percentiles, throughput, totals and gauges."""
+        with self._lock:
+            return {model: {
+                "provider": provider,
+                "responses": m.responses,
+                "failures": m.failures,
+                "retries": m.retries,
+                "errors": dict(m.errors),
+                "in_flight": m.in_flight,
+                "p50_ms": m.latency_ms.quantile(0.50),
+                "p95_ms": m.latency_ms.quantile(0.95),
+                "p99_ms": m.latency_ms.quantile(0.99),
+                "ttft_p50_ms": m.ttft_ms.quantile(0.50),
+                "tokens_per_sec_p50": m.tokens_per_sec.quantile(0.50),
+                "input_tokens": m.input_tokens,
+                "output_tokens": m.output_tokens,
+                "cache_read_tokens": m.cache_read_tokens,
+                "cost": round(m.cost, 6),
+            } for (provider, model), m in self._models.items()}
+
+    def render_prometheus(self) -> str:
+        """The metrics in the Prometheus text exposition format (version 0.0.4)."""
+        lines: List[str] = []
+
+        def family(name: str, kind: str, help_text: str) -> None:
+            lines.append(f"# HELP jedi_council_{name} {help_text}")
+            lines.append(f"# TYPE jedi_council_{name} {kind}")
+
+        with self._lock:
+            models = [(f'provider="{p}",model="{_escape(m)}"', metrics) for (p, m), metrics in self._models.items()]
+
+            family("request_latency_seconds", "histogram", "Time from sending an attempt to its complete response.")
+            for labels, m in models:
+                cumulative = 0
+                for bound, count in zip(LATENCY_BUCKETS_S, m.latency_buckets):
+                    cumulative += count
+                    lines.append(f'jedi_council_request_latency_seconds_bucket{{{labels},le="{bound}"}} {cumulative}')
+                lines.append(f'jedi_council_request_latency_seconds_bucket{{{labels},le="+Inf"}} {m.responses}')
+                lines.append(f"jedi_council_request_latency_seconds_sum{{{labels}}} {m.latency_sum_s:.6f}")
+                lines.append(f"jedi_council_request_latency_seconds_count{{{labels}}} {m.responses}")
+
+            family("output_tokens_per_second", "summary", "Output token throughput per response.")
+            for labels, m in models:
+                for q in (0.5, 0.95, 0.99):
+                    value = m.tokens_per_sec.quantile(q)
+                    if value is not None:
+                        lines.append(f'jedi_council_output_tokens_per_second{{{labels},quantile="{q}"}} {value:.3f}')
+                lines.append(f"jedi_council_output_tokens_per_second_sum{{{labels}}} {m.tokens_per_sec.total:.3f}")
+                lines.append(f"jedi_council_output_tokens_per_second_count{{{labels}}} {m.tokens_per_sec.count}")
+
+            for name, attribute, help_text in (
+                ("responses_total", "responses", "Successful calls."),
+                ("failures_total", "failures", "Calls that failed after all retries."),
+                ("retries_total", "retries", "Attempts that failed and were retried."),
+                ("input_tokens_total", "input_tokens", "Prompt tokens, including cached ones."),
+                ("output_tokens_total", "output_tokens", "Completion tokens."),
+                ("cache_read_tokens_total", "cache_read_tokens", "Prompt tokens served from the provider's prefix cache."),
+                ("cost_dollars_total", "cost", "Estimated spend in dollars."),
+            ):
+                family(name, "counter", help_text)
+                for labels, m in models:
+                    lines.append(f"jedi_council_{name}{{{labels}}} {getattr(m, attribute)}")
+
+            family("errors_total", "counter", "Failed attempts by error kind.")
+            for labels, m in models:
+                for kind, count in m.errors.items():
+                    lines.append(f'jedi_council_errors_total{{{labels},kind="{kind}"}} {count}')
+
+            family("in_flight", "gauge", "Attempts currently waiting on the provider.")
+            for labels, m in models:
+                lines.append(f"jedi_council_in_flight{{{labels}}} {m.in_flight}")
+        return "\n".join(lines) + "\n"
+
+    def reset(self) -> None:
+        with self._lock:
+            self._models.clear()
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"')
+
+
+def serve_prometheus(collector: MetricsCollector, port: int = 9464, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+    """
+    Serves `collector` at http://host:port/metrics from a daemon thread. Call `.shutdown()` on
+    the returned server to stop it.
+    """
+
+    class _Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = collector.render_prometheus().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), _Handler)
+    threading.Thread(target=server.serve_forever, name="jedi-council-metrics", daemon=True).start()
+    logger.info("Serving Prometheus metrics on http://%s:%d/metrics", host, server.server_address[1])
+    return server
+
+
+# --- Tracing ---
+@dataclass
+class Span:
+    """An OpenTelemetry-style span for one provider attempt, with GenAI semantic-convention attributes."""
+    name: str
+    trace_id: str
+    span_id: str
+    start_ns: int
+    end_ns: Optional[int] = None
+    attributes: Dict[str, Any] = field(default_factory=dict)
+    status: str = "unset"  # "ok" or "error" once ended
+    status_message: Optional[str] = None
+
+    @property
+    def duration_ms(self) -> Optional[float]:
+        return None if self.end_ns is None else (self.end_ns - self.start_ns) / 1e6
+
+
+class TracingHook(CouncilHook):
+    """
+    Records a span per provider attempt. Finished spans go to `exporter`, or are kept in the bounded `spans` deque.
+
+    With `tracer` (an `opentelemetry.trace.Tracer`), real OpenTelemetry spans are started instead
+    and exported by the tracer's own pipeline; they nest under whatever span is current.
+    """
+
+    def __init__(self, exporter: Optional[Callable[[Span], None]] = None, tracer: Any = None, max_spans: int = 1000):
+        self.exporter = exporter
+        self.tracer = tracer
+        self.spans: Deque[Span] = deque(maxlen=max_spans)
+
+    def before_request(self, ctx: CallContext) -> None:
+        attributes = {
+            "gen_ai.system": ctx.provider,
+            "gen_ai.request.model": ctx.model,
+            "jedi_council.attempt": ctx.attempt,
+            "jedi_council.streamed": ctx.streamed,
+        }
+        name = f"chat {ctx.model}"
+        if self.tracer is not None:
+            ctx.data["span"] = self.tracer.start_span(name, attributes=attributes)
+        else:
+            ctx.data["span"] = Span(name=name, trace_id=os.urandom(16).hex(), span_id=os.urandom(8).hex(),
+                                    start_ns=time.time_ns(), attributes=attributes)
+
+    def after_response(self, ctx: CallContext, response: CouncilResponse) -> None:
+        self._end(ctx, None, {
+            "gen_ai.response.model": response.model,
+            "gen_ai.usage.input_tokens": response.usage.input_tokens,
+            "gen_ai.usage.output_tokens": response.usage.output_tokens,
+            "jedi_council.cost": response.usage.cost or 0.0,
+        })
+
+    def on_retry(self, ctx: CallContext, error: CouncilError, delay_s: float) -> None:
+        self._end(ctx, error, {"jedi_council.retry_delay_s": delay_s})
+
+    def on_error(self, ctx: CallContext, error: CouncilError) -> None:
+        if "span" not in ctx.data:
+            # The call never reached the provider (open circuit, deadline); record it as a zero-length span.
+            self.before_request(ctx)
+        self._end(ctx, error, {})
+
+    def _end(self, ctx: CallContext, error: Optional[CouncilError], attributes: Dict[str, Any]) -> None:
+        span = ctx.data.pop("span", None)
+        if span is None:
+            return
+        if error is not None:
+            attributes = {**attributes, "error.type": error.kind.value}
+        if self.tracer is not None:
+            from opentelemetry.trace import Status, StatusCode
+            span.set_attributes(attributes)
+            span.set_status(Status(StatusCode.ERROR, str(error)) if error else Status(StatusCode.OK))
+            span.end()
+            return
+        span.attributes.update(attributes)
+        span.end_ns = time.time_ns()
+        span.status, span.status_message = ("error", str(error)) if error else ("ok", None)
+        if self.exporter is not None:
+            self.exporter(span)
+        else:
+            self.spans.append(span)
@@ -0,0 +1,245 @@
+# jedi_council/mock_server.py
+"""
+A local stand-in for the OpenAI, Anthropic and Mistral chat APIs, for load tests and offline development.
+
+    with MockProviderServer(MockConfig(median_ms=300, sigma=0.5, error_rate=0.01)) as server:
+        council = TheJediCouncil(model="gpt-4o", base_url=server.base_url("openai"))
+
+Endpoints: `POST /v1/chat/completions` (OpenAI and Mistral) and `POST /v1/messages` (Anthropic),
+both with and without `stream`. Latency is drawn from a log-normal distribution, and errors can
+be injected at a configurable rate. No API keys or network are involved.
+"""
+
+import json
+import math
+import time
+import random
+import socket
+import logging
+import threading
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+_WORDS = "May the Force be with you always".split()
+
+
+@dataclass
+class MockConfig:
+    """How the stand-in behaves."""
+    median_ms: float = 200.0  # Median total response time
+    sigma: float = 0.0  # Log-normal shape; 0 gives a fixed latency, 0.5-1.0 gives a realistic long tail
+    ttft_fraction: float = 0.3  # Share of a streamed response's time spent before the first token
+    output_tokens: int = 32  # Tokens (words) per response
+    error_rate: float = 0.0  # Share of requests answered with `error_status`
+    error_status: int = 503
+    rate_limit_rate: float = 0.0  # Share of requests answered with 429 and Retry-After
+    retry_after_s: float = 1.0
+    seed: Optional[int] = None
+
+
+@dataclass
+class MockStats:
+    """What the stand-in served, to separate server time from client overhead."""
+    requests: int = 0
+    errors: int = 0
+    rate_limited: int = 0
+    service_ms_total: float = 0.0  # Time spent handling successful requests, injected latency included
+    by_path: Dict[str, int] = field(default_factory=dict)
+
+    @property
+    def mean_service_ms(self) -> float:
+        served = self.requests - self.errors - self.rate_limited
+        return self.service_ms_total / served if served > 0 else 0.0
+
+
+class MockProviderServer:
+    """Runs the stand-in on a background thread. Use as a context manager, or call `start` and `stop`."""
+
+    def __init__(self, config: Optional[MockConfig] = None, host: str = "127.0.0.1", port: int = 0):
+        self.config = config or MockConfig()
+        self.stats = MockStats()
+        self._random = random.Random(self.config.seed)
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), _make_handler(self))
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def base_url(self, provider: str) -> str:
+        """The `base_url` to give a council of `provider` ("openai", "anthropic" or "mistral")."""
+        return f"{self.url}/v1" if provider == "openai" else self.url
+
+    def start(self) -> "MockProviderServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, name="jedi-council-mock", daemon=True)
+        self._thread.start()
+        logger.info("Mock provider server listening on %s", self.url)
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "MockProviderServer":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    # --- Behaviour ---
+    def sample(self) -> Tuple[Optional[int], float]:
+        """Draws (error status or None, latency in seconds) for one request."""
+        config = self.config
+        with self._lock:
+            roll = self._random.random()
+            latency_ms = config.median_ms * (math.exp(self._random.gauss(0, config.sigma)) if config.sigma else 1.0)
+        if roll < config.rate_limit_rate:
+            return 429, 0.0
+        if roll < config.rate_limit_rate + config.error_rate:
+            return config.error_status, latency_ms / 1000
+        return None, latency_ms / 1000
+
+    def record(self, path: str, status: Optional[int], service_ms: float) -> None:
+        with self._lock:
+            stats = self.stats
+            stats.requests += 1
+            stats.by_path[path] = stats.by_path.get(path, 0) + 1
+            if status == 429:
+                stats.rate_limited += 1
+            elif status is not None:
+                stats.errors += 1
+            else:
+                stats.service_ms_total += service_ms
+
+
+def _make_handler(server: MockProviderServer):
+
+    class _Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # Keep-alive, so clients' connection pools behave as in production
+
+        def setup(self):
+            super().setup()
+            # Headers and body go out in separate writes; without this, Nagle plus delayed ACKs add ~40ms per response.
+            self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+        def do_POST(self):
+            started = time.perf_counter()
+            body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+            anthropic = self.path.rstrip("/").endswith("/messages")
+            if not anthropic and not self.path.rstrip("/").endswith("/chat/completions"):
+                self._send_json(404, {"error": {"message": f"Unknown path {self.path}", "type": "not_found"}})
+                return
+
+            status, latency_s = server.sample()
+            if status is not None:
+                time.sleep(latency_s)
+                self._send_error(status, anthropic)
+            else:
+                model = body.get("model", "mock")
+                prompt_tokens = sum(len(str(m.get("content", ""))) for m in body.get("messages", [])) // 4 + 1
+                tokens = [("" if i == 0 else " ") + _WORDS[i % len(_WORDS)] for i in range(server.config.output_tokens)]
+                if body.get("stream"):
+                    events = _anthropic_stream(model, prompt_tokens, tokens) if anthropic else _openai_stream(model, prompt_tokens, tokens)
+                    self._send_stream(events, latency_s, len(tokens))
+                else:
+                    time.sleep(latency_s)
+                    reply = _anthropic_message if anthropic else _openai_completion
+                    self._send_json(200, reply(model, prompt_tokens, tokens))
+            server.record(self.path, status, (time.perf_counter() - started) * 1000)
+
+        def _send_json(self, status: int, payload: Dict[str, Any], headers: Optional[Dict[str, str]] = None):
+            data = json.dumps(payload).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(data)
+
+        def _send_error(self, status: int, anthropic: bool):
+            message = "Rate limit exceeded (injected)" if status == 429 else "Upstream failure (injected)"
+            kind = "rate_limit_error" if status == 429 else "api_error"
+            payload = {"type": "error", "error": {"type": kind, "message": message}} if anthropic else \
+                {"error": {"message": message, "type": kind, "code": str(status)}}
+            headers = {"Retry-After": f"{server.config.retry_after_s:g}"} if status == 429 else None
+            self._send_json(status, payload, headers)
+
+        def _send_stream(self, events: Iterator[str], latency_s: float, token_count: int):
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            ttft_s = latency_s * server.config.ttft_fraction
+            per_token_s = (latency_s - ttft_s) / max(1, token_count)
+            time.sleep(ttft_s)
+            for index, event in enumerate(events):
+                if index > 1 and per_token_s:
+                    time.sleep(per_token_s)
+                data = event.encode("utf-8")
+                self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+                self.wfile.flush()
+            self.wfile.write(b"0\r\n\r\n")
+
+        def log_message(self, *args):
+            pass
+
+    return _Handler
+
+
+# --- Wire formats ---
+def _openai_completion(model: str, prompt_tokens: int, tokens: list) -> Dict[str, Any]:
+    # Mistral's chat completions share this shape.
+    return {
+        "id": "mock-completion", "object": "chat.completion", "created": int(time.time()), "model": model,
+        "choices": [{"index": 0, "message": {"role": "assistant", "content": "".join(tokens)},
+                     "finish_reason": "stop"}],
+        "usage": {"prompt_tokens": prompt_tokens, "completion_tokens": len(tokens),
+                  "total_tokens": prompt_tokens + len(tokens)},
+    }
+
+
+def _openai_stream(model: str, prompt_tokens: int, tokens: list) -> Iterator[str]:
+    def chunk(choices, usage=None):
+        payload = {"id": "mock-chunk", "object": "chat.completion.chunk", "created": int(time.time()),
+                   "model": model, "choices": choices, "usage": usage}
+        return f"data: {json.dumps(payload)}\n\n"
+
+    yield chunk([{"index": 0, "delta": {"role": "assistant", "content": ""}, "finish_reason": None}])
+    for token in tokens:
+        yield chunk([{"index": 0, "delta": {"content": token}, "finish_reason": None}])
+    yield chunk([{"index": 0, "delta": {}, "finish_reason": "stop"}],
+                {"prompt_tokens": prompt_tokens, "completion_tokens": len(tokens),
+                 "total_tokens": prompt_tokens + len(tokens)})
+    yield "data: [DONE]\n\n"
+
+
+def _anthropic_message(model: str, prompt_tokens: int, tokens: list) -> Dict[str, Any]:
+    return {
+        "id": "msg_mock", "type": "message", "role": "assistant", "model": model,
+        "content": [{"type": "text", "text": "".join(tokens)}],
+        "stop_reason": "end_turn", "stop_sequence": None,
+        "usage": {"input_tokens": prompt_tokens, "output_tokens": len(tokens)},
+    }
+
+
+def _anthropic_stream(model: str, prompt_tokens: int, tokens: list) -> Iterator[str]:
+    def event(name, payload):
+        return f"event: {name}\ndata: {json.dumps({'type': name, **payload})}\n\n"
+
+    yield event("message_start", {"message": {
+        "id": "msg_mock", "type": "message", "role": "assistant", "model": model, "content": [],
+        "stop_reason": None, "stop_sequence": None, "usage": {"input_tokens": prompt_tokens, "output_tokens": 1}}})
+    yield event("content_block_start", {"index": 0, "content_block": {"type": "text", "text": ""}})
+    for token in tokens:
+        yield event("content_block_delta", {"index": 0, "delta": {"type": "text_delta", "text": token}})
+    yield event("content_block_stop", {"index": 0})
+    yield event("message_delta", {"delta": {"stop_reason": "end_turn", "stop_sequence": None},
+                                  "usage": {"output_tokens": len(tokens)}})
+    yield event("message_stop", {})
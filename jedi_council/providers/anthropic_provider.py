@@ -0,0 +1,151 @@
+# jedi_council/providers/anthropic_provider.py
+
+import os
+import time
+import logging
+from typing import List, Dict, Any, Iterator
+
+from anthropic import Anthropic, AsyncAnthropic
+
+from jedi_council.batch import BatchRequest
+from jedi_council.clients import ClientRegistry, PoolConfig, client_registry
+from jedi_council.core import CouncilResponse, UsageInfo, LlmProvider, retry_handler, async_retry_handler
+
+logger = logging.getLogger(__name__)
+
+_EPHEMERAL = {"type": "ephemeral"}
+
+
+class _AnthropicProvider(LlmProvider):
+    provider_name = "anthropic"
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.api_key = os.environ.get("ANTHROPIC_API_KEY")
+        # Clients come from the shared registry so councils reuse warm connections.
+        self.client = client_registry.get(self.provider_name, self.api_key, self._build_client,
+                                          base_url=self.base_url, pool=self.pool)
+
+    @property
+    def async_client(self) -> AsyncAnthropic:
+        return client_registry.get_async(self.provider_name, self.api_key, self._build_async_client,
+                                         base_url=self.base_url, pool=self.pool)
+
+    # SDK-level retries are off: the council's RetryPolicy is the single place retries happen.
+    def _build_client(self, registry: ClientRegistry, pool: PoolConfig) -> Anthropic:
+        return Anthropic(api_key=self.api_key, base_url=self.base_url, max_retries=0,
+                         http_client=registry.http_client(self.provider_name, pool))
+
+    def _build_async_client(self, registry: ClientRegistry, pool: PoolConfig) -> AsyncAnthropic:
+        return AsyncAnthropic(api_key=self.api_key, base_url=self.base_url, max_retries=0,
+                              http_client=registry.http_client(self.provider_name, pool, is_async=True))
+
+    def _request_params(self, messages: List[Dict[str, str]], **kwargs) -> Dict[str, Any]:
+        """
+        Splits the system prompt out of `messages`, as the Messages API expects it separately,
+        and puts a `cache_control` breakpoint at the end of the cacheable prefix, if any. Anthropic
+        caches everything before a breakpoint, system prompt included.
+        """
+        messages, prefix = self._cache_prefix(messages)
+        system_blocks, user_messages = [], []
+        for index, message in enumerate(messages):
+            cached = index == prefix - 1
+            if message['role'] == 'system':
+                block = {"type": "text", "text": message['content']}
+                if cached:
+                    block["cache_control"] = _EPHEMERAL
+                system_blocks.append(block)
+            elif cached:
+                content = message['content']
+                blocks = list(content) if isinstance(content, list) else [{"type": "text", "text": content}]
+                blocks[-1] = {**blocks[-1], "cache_control": _EPHEMERAL}
+                user_messages.append({**message, "content": blocks})
+            else:
+                user_messages.append(message)
+
+        params = {"messages": user_messages, "temperature": 0.2, "max_tokens": 2048, **kwargs}
+        if system_blocks:
+            # Plain strings unless caching is on, so uncached requests look exactly as before.
+            if any("cache_control" in block for block in system_blocks):
+                params["system"] = system_blocks
+            else:
+                params["system"] = "\n\n".join(block["text"] for block in system_blocks)
+        return params
+
+    @retry_handler
+    def generate(self, messages: List[Dict[str, str]], **kwargs) -> CouncilResponse:
+        logger.info("Consulting Anthropic model: %s", self.model, extra={"event": "request", "model": self.model})
+        start_time = time.perf_counter()
+
+        response = self.client.messages.create(model=self.model, **self._request_params(messages, **kwargs))
+        latency_ms = (time.perf_counter() - start_time) * 1000
+        logger.info("Received wisdom from %s in %.0fms.", self.model, latency_ms,
+                    extra={"event": "response", "model": self.model, "latency_ms": latency_ms})
+        return self._to_council_response(response, latency_ms)
+
+    @async_retry_handler
+    async def agenerate(self, messages: List[Dict[str, str]], **kwargs) -> CouncilResponse:
+        logger.info("Consulting Anthropic model: %s", self.model, extra={"event": "request", "model": self.model})
+        start_time = time.perf_counter()
+
+        response = await self.async_client.messages.create(model=self.model, **self._request_params(messages, **kwargs))
+        latency_ms = (time.perf_counter() - start_time) * 1000
+        logger.info("Received wisdom from %s in %.0fms.", self.model, latency_ms,
+                    extra={"event": "response", "model": self.model, "latency_ms": latency_ms})
+        return self._to_council_response(response, latency_ms)
+
+    def stream(self, messages: List[Dict[str, str]], **kwargs) -> Iterator[str]:
+        with self.client.messages.stream(model=self.model, **self._request_params(messages, **kwargs)) as stream:
+            for text in stream.text_stream:
+                yield text
+            message = stream.get_final_message()
+        return self._anthropic_usage(message.usage), message
+
+    # --- Message Batches API ---
+    batch_max_requests = 100_000
+    batch_max_bytes = 256 * 1024 * 1024
+
+    def batch_entry(self, request: BatchRequest) -> Dict[str, Any]:
+        return {
+            "custom_id": request.custom_id,
+            "params": {"model": self.model, **self._request_params(request.messages, **request.params)},
+        }
+
+    def submit_batch(self, entries: List[Dict[str, Any]]) -> str:
+        return self.client.messages.batches.create(requests=entries).id
+
+    def batch_done(self, batch_id: str) -> bool:
+        return self.client.messages.batches.retrieve(batch_id).processing_status == "ended"
+
+    def batch_results(self, batch_id: str) -> Iterator[CouncilResponse]:
+        for entry in self.client.messages.batches.results(batch_id):
+            if entry.result.type != "succeeded":
+                yield self._batch_error(entry.custom_id, entry)
+                continue
+            message = entry.result.message
+            yield CouncilResponse(
+                text=message.content[0].text,
+                model=self.model,
+                usage=self._anthropic_usage(message.usage, batch=True),
+                latency_ms=0,
+                raw_response=entry,
+                request_id=entry.custom_id,
+            )
+
+    def _anthropic_usage(self, usage: Any, batch: bool = False) -> UsageInfo:
+        # Anthropic's input_tokens excludes cached prompt tokens; UsageInfo counts the whole prompt.
+        cache_read = getattr(usage, "cache_read_input_tokens", None)
+        cache_write = getattr(usage, "cache_creation_input_tokens", None)
+        cache_read = cache_read if isinstance(cache_read, int) else 0
+        cache_write = cache_write if isinstance(cache_write, int) else 0
+        return self._usage_info(usage.input_tokens + cache_read + cache_write, usage.output_tokens, batch=batch,
+                                cache_read_tokens=cache_read, cache_write_tokens=cache_write)
+
+    def _to_council_response(self, response: Any, latency_ms: float) -> CouncilResponse:
+        return CouncilResponse(
+            text=response.content[0].text,
+            model=self.model,
+            usage=self._anthropic_usage(response.usage),
+            latency_ms=latency_ms,
+            raw_response=response
+        )
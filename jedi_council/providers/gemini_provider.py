@@ -0,0 +1,160 @@
+# jedi_council/providers/gemini_provider.py
+
+import os
+import time
+import logging
+import threading
+from collections import OrderedDict
+from typing import List, Dict, Any, Iterator, Optional, Tuple
+
+import google.generativeai as genai
+
+from jedi_council.clients import ClientRegistry, PoolConfig, client_registry
+from jedi_council.core import CouncilResponse, UsageInfo, LlmProvider, retry_handler, async_retry_handler
+
+logger = logging.getLogger(__name__)
+
+# Model objects kept per provider, one per recent system instruction.
+SYSTEM_MODEL_CACHE_SIZE = 16
+
+# The key genai.configure was last called with; see `_GeminiProvider._configure`.
+_configured_key: Optional[str] = None
+
+
+class _GeminiProvider(LlmProvider):
+    provider_name = "gemini"
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.api_key = os.environ.get("GEMINI_API_KEY")
+        # genai.configure is process-global, so it runs once per key rather than once per council.
+        client_registry.get(self.provider_name, self.api_key, self._configure)
+        # Fix: use correct full model name
+        self.model_obj = self._new_model(None)
+        # The SDK takes the system instruction per model object, so there is one per recent system prompt,
+        # least recently used first. Session summaries change the instruction, so this has to stay bounded.
+        self._system_models: "OrderedDict[str, Any]" = OrderedDict()
+        self._system_models_lock = threading.Lock()
+
+    def _new_model(self, system_instruction: Optional[str]) -> Any:
+        return genai.GenerativeModel(
+            model_name=f"models/{self.model}",
+            generation_config=genai.types.GenerationConfig(
+                temperature=0.2,
+                max_output_tokens=1000
+            ),
+            system_instruction=system_instruction,
+        )
+
+    def _configure(self, registry: ClientRegistry, pool: PoolConfig) -> Any:
+        """
+        Points the SDK at this provider's key.
+
+        genai.configure is process-global and every GenerativeModel uses the key it was last
+        given, so only one Gemini key per process is supported. A second key takes over from
+        the first for every council, which is logged as a warning.
+        """
+        global _configured_key
+        if _configured_key is not None and _configured_key != self.api_key:
+            logger.warning("Reconfiguring Gemini with a different API key; existing Gemini councils now use it too. "
+                           "Only one Gemini key per process is supported.", extra={"model": self.model})
+        genai.configure(api_key=self.api_key)
+        _configured_key = self.api_key
+        return genai
+
+    @staticmethod
+    def _contents(messages: List[Dict[str, str]]) -> Tuple[Optional[str], List[Dict[str, Any]]]:
+        """
+        Converts messages to Gemini's structured form: (system instruction, contents).
+
+        Turns keep their roles ("assistant" becomes "model"), so an unchanged conversation
+        prefix stays byte-identical from call to call and Gemini can cache it implicitly.
+        Consecutive messages from the same role are merged into one turn.
+        """
+        system = [m["content"] for m in messages if m["role"] == "system"]
+        contents: List[Dict[str, Any]] = []
+        for message in messages:
+            if message["role"] == "system":
+                continue
+            role = "model" if message["role"] == "assistant" else "user"
+            if contents and contents[-1]["role"] == role:
+                contents[-1]["parts"].append(message["content"])
+            else:
+                contents.append({"role": role, "parts": [message["content"]]})
+        return ("\n\n".join(system) or None), contents
+
+    @staticmethod
+    def _generation_config(kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        """The call's generation parameters under GenerationConfig's names (max_tokens is max_output_tokens)."""
+        config = {"temperature": 0.2, **kwargs}
+        max_tokens = config.pop("max_tokens", None)
+        if max_tokens is not None:
+            config["max_output_tokens"] = max_tokens
+        return config
+
+    def _prepare(self, messages: List[Dict[str, str]]) -> Tuple[Any, List[Dict[str, Any]]]:
+        """The model object for the request's system instruction, and the contents to send."""
+        system, contents = self._contents(self._cache_prefix(messages)[0])
+        if system is None:
+            return self.model_obj, contents
+        with self._system_models_lock:
+            model_obj = self._system_models.get(system)
+            if model_obj is not None:
+                self._system_models.move_to_end(system)
+                return model_obj, contents
+        model_obj = self._new_model(system)
+        with self._system_models_lock:
+            self._system_models[system] = model_obj
+            while len(self._system_models) > SYSTEM_MODEL_CACHE_SIZE:
+                self._system_models.popitem(last=False)
+        return model_obj, contents
+
+    @retry_handler
+    def generate(self, messages: List[Dict[str, str]], **kwargs) -> CouncilResponse:
+        logger.info("Consulting Gemini model: %s", self.model, extra={"event": "request", "model": self.model})
+        start_time = time.perf_counter()
+        timeout = kwargs.pop("timeout", None)
+        model_obj, contents = self._prepare(messages)
+        response = model_obj.generate_content(contents, generation_config=self._generation_config(kwargs),
+                                              request_options={"timeout": timeout} if timeout else None)
+        latency_ms = (time.perf_counter() - start_time) * 1000
+        logger.info("Received wisdom from %s in %.0fms.", self.model, latency_ms,
+                    extra={"event": "response", "model": self.model, "latency_ms": latency_ms})
+        return self._to_council_response(response, latency_ms)
+
+    @async_retry_handler
+    async def agenerate(self, messages: List[Dict[str, str]], **kwargs) -> CouncilResponse:
+        logger.info("Consulting Gemini model: %s", self.model, extra={"event": "request", "model": self.model})
+        start_time = time.perf_counter()
+        timeout = kwargs.pop("timeout", None)
+        model_obj, contents = self._prepare(messages)
+        response = await model_obj.generate_content_async(contents, generation_config=self._generation_config(kwargs),
+                                                          request_options={"timeout": timeout} if timeout else None)
+        latency_ms = (time.perf_counter() - start_time) * 1000
+        logger.info("Received wisdom from %s in %.0fms.", self.model, latency_ms,
+                    extra={"event": "response", "model": self.model, "latency_ms": latency_ms})
+        return self._to_council_response(response, latency_ms)
+
+    def stream(self, messages: List[Dict[str, str]], **kwargs) -> Iterator[str]:
+        model_obj, contents = self._prepare(messages)
+        response = model_obj.generate_content(contents, generation_config=self._generation_config(kwargs), stream=True)
+        for chunk in response:
+            yield chunk.text
+        return self._gemini_usage(response), response
+
+    def _gemini_usage(self, response: Any) -> UsageInfo:
+        # Older responses carry no usage metadata; report zeros rather than failing.
+        metadata = getattr(response, "usage_metadata", None)
+        # Gemini 2.5 caches repeated prefixes implicitly and reports the hits in cached_content_token_count.
+        return self._usage_info(getattr(metadata, "prompt_token_count", 0) or 0,
+                                getattr(metadata, "candidates_token_count", 0) or 0,
+                                cache_read_tokens=getattr(metadata, "cached_content_token_count", 0) or 0)
+
+    def _to_council_response(self, response: Any, latency_ms: float) -> CouncilResponse:
+        return CouncilResponse(
+            text=response.text,
+            model=self.model,
+            usage=self._gemini_usage(response),
+            latency_ms=latency_ms,
+            raw_response=response
+        )
@@ -0,0 +1,103 @@
+# jedi_council/providers/mistral_provider.py
+
+import os
+import time
+import logging
+from typing import List, Dict, Any, Iterator
+
+from mistralai import Mistral
+
+from jedi_council.clients import ClientRegistry, PoolConfig, client_registry
+from jedi_council.core import CouncilResponse, LlmProvider, retry_handler, async_retry_handler
+
+logger = logging.getLogger(__name__)
+
+
+class _MistralProvider(LlmProvider):
+    provider_name = "mistral"
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.api_key = os.environ.get("MISTRAL_API_KEY")
+        if not self.api_key:
+            raise RuntimeError("Mistral API key not set.")
+        # Clients come from the shared registry so councils reuse warm connections.
+        self.client = client_registry.get(self.provider_name, self.api_key, self._build_client,
+                                          base_url=self.base_url, pool=self.pool)
+
+    @property
+    def async_client(self) -> Mistral:
+        # The same SDK object serves `chat.complete_async`, but its pool must belong to the running loop.
+        return client_registry.get_async(self.provider_name, self.api_key, self._build_async_client,
+                                         base_url=self.base_url, pool=self.pool)
+
+    def _build_client(self, registry: ClientRegistry, pool: PoolConfig) -> Mistral:
+        return Mistral(api_key=self.api_key, server_url=self.base_url,
+                       client=registry.http_client(self.provider_name, pool))
+
+    def _build_async_client(self, registry: ClientRegistry, pool: PoolConfig) -> Mistral:
+        return Mistral(api_key=self.api_key, server_url=self.base_url,
+                       async_client=registry.http_client(self.provider_name, pool, is_async=True))
+
+    @retry_handler
+    def generate(self, messages: List[Dict[str, str]], **kwargs) -> CouncilResponse:
+        logger.info("Consulting Mistral model: %s", self.model, extra={"event": "request", "model": self.model})
+        start_time = time.perf_counter()
+
+        # FIX: Use `.chat.complete()` instead of `.chat(...)`
+        response = self.client.chat.complete(
+            model=self.model,
+            messages=self._cache_prefix(messages)[0],  # Mistral has no prompt cache; drop the markers
+            temperature=kwargs.get("temperature", 0.2),
+            max_tokens=kwargs.get("max_tokens", 2048),
+            timeout_ms=int(kwargs["timeout"] * 1000) if kwargs.get("timeout") else None,
+        )
+
+        latency_ms = (time.perf_counter() - start_time) * 1000
+        logger.info("Received wisdom from %s in %.0fms.", self.model, latency_ms,
+                    extra={"event": "response", "model": self.model, "latency_ms": latency_ms})
+        return self._to_council_response(response, latency_ms)
+
+    @async_retry_handler
+    async def agenerate(self, messages: List[Dict[str, str]], **kwargs) -> CouncilResponse:
+        logger.info("Consulting Mistral model: %s", self.model, extra={"event": "request", "model": self.model})
+        start_time = time.perf_counter()
+
+        response = await self.async_client.chat.complete_async(
+            model=self.model,
+            messages=self._cache_prefix(messages)[0],  # Mistral has no prompt cache; drop the markers
+            temperature=kwargs.get("temperature", 0.2),
+            max_tokens=kwargs.get("max_tokens", 2048),
+            timeout_ms=int(kwargs["timeout"] * 1000) if kwargs.get("timeout") else None,
+        )
+
+        latency_ms = (time.perf_counter() - start_time) * 1000
+        logger.info("Received wisdom from %s in %.0fms.", self.model, latency_ms,
+                    extra={"event": "response", "model": self.model, "latency_ms": latency_ms})
+        return self._to_council_response(response, latency_ms)
+
+    def stream(self, messages: List[Dict[str, str]], **kwargs) -> Iterator[str]:
+        events = self.client.chat.stream(
+            model=self.model,
+            messages=self._cache_prefix(messages)[0],  # Mistral has no prompt cache; drop the markers
+            temperature=kwargs.get("temperature", 0.2),
+            max_tokens=kwargs.get("max_tokens", 2048),
+            timeout_ms=int(kwargs["timeout"] * 1000) if kwargs.get("timeout") else None,
+        )
+        chunk, usage = None, None
+        for event in events:
+            chunk = event.data
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+            if chunk.usage:
+                usage = chunk.usage
+        return self._usage_info(usage.prompt_tokens if usage else 0, usage.completion_tokens if usage else 0), chunk
+
+    def _to_council_response(self, response: Any, latency_ms: float) -> CouncilResponse:
+        return CouncilResponse(
+            text=response.choices[0].message.content,
+            model=self.model,
+            usage=self._usage_info(response.usage.prompt_tokens, response.usage.completion_tokens),
+            latency_ms=latency_ms,
+            raw_response=response
+        )
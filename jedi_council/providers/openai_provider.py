@@ -0,0 +1,171 @@
+# jedi_council/providers/openai_provider.py
+
+import os
+import json
+import time
+import hashlib
+import logging
+from typing import List, Dict, Any, Iterator
+
+from openai import OpenAI, AsyncOpenAI
+
+from jedi_council.batch import BatchRequest
+from jedi_council.clients import ClientRegistry, PoolConfig, client_registry
+from jedi_council.core import CouncilResponse, UsageInfo, LlmProvider, retry_handler, async_retry_handler
+
+logger = logging.getLogger(__name__)
+
+
+class _OpenAIProvider(LlmProvider):
+    provider_name = "openai"
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.api_key = os.environ.get("OPENAI_API_KEY")
+        # Clients come from the shared registry so councils reuse warm connections.
+        self.client = client_registry.get(self.provider_name, self.api_key, self._build_client,
+                                          base_url=self.base_url, pool=self.pool)
+
+    @property
+    def async_client(self) -> AsyncOpenAI:
+        return client_registry.get_async(self.provider_name, self.api_key, self._build_async_client,
+                                         base_url=self.base_url, pool=self.pool)
+
+    # SDK-level retries are off: the council's RetryPolicy is the single place retries happen.
+    def _build_client(self, registry: ClientRegistry, pool: PoolConfig) -> OpenAI:
+        return OpenAI(api_key=self.api_key, base_url=self.base_url, max_retries=0,
+                      http_client=registry.http_client(self.provider_name, pool))
+
+    def _build_async_client(self, registry: ClientRegistry, pool: PoolConfig) -> AsyncOpenAI:
+        return AsyncOpenAI(api_key=self.api_key, base_url=self.base_url, max_retries=0,
+                           http_client=registry.http_client(self.provider_name, pool, is_async=True))
+
+    def _request_params(self, messages: List[Dict[str, str]], **kwargs) -> Dict[str, Any]:
+        """
+        OpenAI caches prompt prefixes of 1024+ tokens automatically. When there is a cacheable prefix,
+        a `prompt_cache_key` derived from it routes requests sharing the prefix to the same cache.
+        """
+        messages, prefix = self._cache_prefix(messages)
+        params = {"messages": messages, "temperature": 0.2, "max_tokens": 2048, **kwargs}
+        if prefix and "prompt_cache_key" not in params:
+            digest = hashlib.sha256(json.dumps(messages[:prefix], sort_keys=True).encode("utf-8")).hexdigest()
+            params["prompt_cache_key"] = f"jedi-{digest[:32]}"
+        return params
+
+    @retry_handler
+    def generate(self, messages: List[Dict[str, str]], **kwargs) -> CouncilResponse:
+        logger.info("Consulting OpenAI model: %s", self.model, extra={"event": "request", "model": self.model})
+        start_time = time.perf_counter()
+
+        response = self.client.chat.completions.create(model=self.model, **self._request_params(messages, **kwargs))
+        latency_ms = (time.perf_counter() - start_time) * 1000
+        logger.info("Received wisdom from %s in %.0fms.", self.model, latency_ms,
+                    extra={"event": "response", "model": self.model, "latency_ms": latency_ms})
+        return self._to_council_response(response, latency_ms)
+
+    @async_retry_handler
+    async def agenerate(self, messages: List[Dict[str, str]], **kwargs) -> CouncilResponse:
+        logger.info("Consulting OpenAI model: %s", self.model, extra={"event": "request", "model": self.model})
+        start_time = time.perf_counter()
+
+        response = await self.async_client.chat.completions.create(model=self.model, **self._request_params(messages, **kwargs))
+        latency_ms = (time.perf_counter() - start_time) * 1000
+        logger.info("Received wisdom from %s in %.0fms.", self.model, latency_ms,
+                    extra={"event": "response", "model": self.model, "latency_ms": latency_ms})
+        return self._to_council_response(response, latency_ms)
+
+    def stream(self, messages: List[Dict[str, str]], **kwargs) -> Iterator[str]:
+        chunks = self.client.chat.completions.create(
+            model=self.model,
+            stream=True,
+            stream_options={"include_usage": True},
+            **self._request_params(messages, **kwargs)
+        )
+        chunk, usage = None, None
+        for chunk in chunks:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+            if chunk.usage:
+                usage = chunk.usage
+        # The usage totals arrive on the final chunk.
+        return self._openai_usage(usage), chunk
+
+    # --- Batch API ---
+    batch_max_requests = 50_000
+    batch_max_bytes = 200 * 1024 * 1024
+    _BATCH_TERMINAL_STATES = {"completed", "failed", "expired", "cancelled"}
+
+    def batch_entry(self, request: BatchRequest) -> Dict[str, Any]:
+        return {
+            "custom_id": request.custom_id,
+            "method": "POST",
+            "url": "/v1/chat/completions",
+            "body": {"model": self.model, **self._request_params(request.messages, **request.params)},
+        }
+
+    def submit_batch(self, entries: List[Dict[str, Any]]) -> str:
+        data = "".join(json.dumps(entry) + "\n" for entry in entries).encode("utf-8")
+        input_file = self.client.files.create(file=("batch.jsonl", data), purpose="batch")
+        batch = self.client.batches.create(
+            input_file_id=input_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h",
+        )
+        return batch.id
+
+    def batch_done(self, batch_id: str) -> bool:
+        return self.client.batches.retrieve(batch_id).status in self._BATCH_TERMINAL_STATES
+
+    def batch_results(self, batch_id: str) -> Iterator[CouncilResponse]:
+        batch = self.client.batches.retrieve(batch_id)
+        seen = set()
+        # Successful lines land in the output file; requests that failed outright land in the error file.
+        for file_id in (batch.output_file_id, batch.error_file_id):
+            if not file_id:
+                continue
+            for line in self.client.files.content(file_id).text.splitlines():
+                if not line.strip():
+                    continue
+                result = json.loads(line)
+                seen.add(result["custom_id"])
+                body = (result.get("response") or {}).get("body") or {}
+                if result.get("error") or "choices" not in body:
+                    yield self._batch_error(result["custom_id"], result)
+                    continue
+                yield CouncilResponse(
+                    text=body["choices"][0]["message"]["content"],
+                    model=self.model,
+                    usage=self._usage_info(body["usage"]["prompt_tokens"], body["usage"]["completion_tokens"], batch=True,
+                                            cache_read_tokens=((body["usage"].get("prompt_tokens_details") or {})
+                                                               .get("cached_tokens") or 0)),
+                    latency_ms=0,
+                    raw_response=result,
+                    request_id=result["custom_id"],
+                )
+        if batch.status == "completed":
+            return
+        # A failed, expired or cancelled batch leaves requests with no line in either file; report them too.
+        for line in self.client.files.content(batch.input_file_id).text.splitlines():
+            if not line.strip():
+                continue
+            custom_id = json.loads(line)["custom_id"]
+            if custom_id not in seen:
+                yield self._batch_error(custom_id, {"custom_id": custom_id, "error": {
+                    "code": f"batch_{batch.status}", "message": f"Batch {batch_id} ended {batch.status} before this request ran."}})
+
+    def _openai_usage(self, usage: Any) -> UsageInfo:
+        if usage is None:
+            return self._usage_info(0, 0)
+        # Older models and OpenAI-compatible proxies may not report prompt_tokens_details.
+        cached = getattr(getattr(usage, "prompt_tokens_details", None), "cached_tokens", None)
+        return self._usage_info(usage.prompt_tokens, usage.completion_tokens,
+                                cache_read_tokens=cached if isinstance(cached, int) else 0)
+
+    def _to_council_response(self, response: Any, latency_ms: float) -> CouncilResponse:
+        return CouncilResponse(
+            text=response.choices[0].message.content,
+            model=self.model,
+            usage=self._openai_usage(response.usage),
+            latency_ms=latency_ms,
+            raw_response=response
+        )
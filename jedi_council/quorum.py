@@ -0,0 +1,172 @@
+# jedi_council/quorum.py
+
+import re
+import time
+import asyncio
+import logging
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
+
+from jedi_council.clients import run_sync
+from jedi_council.core import TheJediCouncil, CouncilResponse
+from jedi_council.fanout import cancelled_cost, task_response
+
+logger = logging.getLogger(__name__)
+
+# Decides from the successful responses so far and the number of members still answering:
+# returns the chosen response, or None to wait for more.
+Judge = Callable[[Dict[str, CouncilResponse], int], Optional[CouncilResponse]]
+
+
+def normalize_answer(text: Optional[str]) -> str:
+    """The default voting key: case, surrounding whitespace and trailing punctuation don't count."""
+    # Refusals and content-less replies come back with text=None; they vote as an empty answer.
+    return re.sub(r"\s+", " ", text or "").strip().rstrip(".!").lower()
+
+
+@dataclass
+class CouncilVerdict:
+    """The outcome of a QuorumCouncil consultation."""
+    response: Optional[CouncilResponse]  # The chosen answer; None when the members never agreed
+    quorum_reached: bool
+    agreeing: List[str] = field(default_factory=list)  # Models whose answers matched the chosen one
+    responses: Dict[str, CouncilResponse] = field(default_factory=dict)  # Every member that finished
+    cancelled: List[str] = field(default_factory=list)  # Members stopped once the verdict was in
+    latency_ms: float = 0.0  # Wall-clock time to the verdict
+    cost: Dict[str, float] = field(default_factory=dict)  # Per member; cancelled ones at their estimated prompt cost
+
+    @property
+    def text(self) -> Optional[str]:
+        return self.response.text if self.response is not None else None
+
+    @property
+    def total_cost(self) -> float:
+        return sum(self.cost.values())
+
+    @property
+    def latencies(self) -> Dict[str, float]:
+        return {model: response.latency_ms for model, response in self.responses.items()}
+
+
+class QuorumCouncil:
+    """
+    Consults several models at once and settles on one answer.
+
+    By default an answer wins once a majority of members give it (after `normalize`). Set
+    `quorum` to accept the first K agreeing answers instead, or pass a `judge` to decide. As soon
+    as the verdict is in, the remaining calls are cancelled, so the wall-clock time is the time
+    to reach quorum rather than that of the slowest member.
+    """
+
+    def __init__(self, models: List[str], quorum: Optional[int] = None, judge: Optional[Judge] = None,
+                 normalize: Callable[[str], str] = normalize_answer, **kwargs):
+        """
+        Args:
+            models (List[str]): The council's members; each is consulted once per prompt.
+            quorum (int, optional): Agreeing answers needed. Defaults to a majority of `models`.
+            judge (Judge, optional): Decides instead of voting; called after each member answers.
+            normalize (Callable[[str], str]): Maps an answer to the key that votes are counted on.
+            **kwargs: Passed to each model's TheJediCouncil (e.g. cache, retry_policy).
+        """
+        if not models or len(set(models)) != len(models):
+            raise ValueError("QuorumCouncil needs one or more distinct models.")
+        self.models = list(models)
+        self.quorum = quorum or len(models) // 2 + 1
+        if not 1 <= self.quorum <= len(models):
+            raise ValueError(f"A quorum of {self.quorum} is impossible with {len(models)} members.")
+        self.judge = judge
+        self.normalize = normalize
+        self.councils: Dict[str, TheJediCouncil] = {model: TheJediCouncil(model=model, **kwargs) for model in self.models}
+
+    def get_wisdom(self, prompt: str | List[Dict[str, str]], **kwargs) -> CouncilVerdict:
+        """Synchronous `aget_wisdom`, run on the shared background loop so async clients are reused."""
+        return run_sync(self.aget_wisdom(prompt, **kwargs))
+
+    async def aget_wisdom(self, prompt: str | List[Dict[str, str]], **kwargs) -> CouncilVerdict:
+        """
+        Consults every member concurrently and returns as soon as the verdict is decided.
+
+        Args:
+            prompt (str or List[Dict]): A single query string or a list of message dictionaries.
+            **kwargs: Additional parameters like temperature, max_tokens, etc.
+
+        Returns:
+            A CouncilVerdict. If the members can no longer reach quorum, the calls stop early and
+            `quorum_reached` is False; when voting, `response` is then the most common answer, if any.
+        """
+        started = time.perf_counter()
+        pending: Dict[asyncio.Task, str] = {
+            asyncio.ensure_future(self.councils[model].aget_wisdom(prompt, **kwargs)): model for model in self.models
+        }
+        finished: Dict[str, CouncilResponse] = {}
+        answers: Dict[str, CouncilResponse] = {}  # Successful responses, in arrival order
+        chosen: Optional[CouncilResponse] = None
+        decided = False
+        try:
+            while pending and not decided:
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    model = pending.pop(task)
+                    finished[model] = response = task_response(task, self.councils[model])
+                    if not response.failed:
+                        answers[model] = response
+                chosen, decided = self._decide(answers, len(pending))
+        finally:
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+
+        cancelled = list(pending.values())
+        quorum_reached = chosen is not None
+        if chosen is None and self.judge is None and answers:
+            chosen = self._plurality(answers)
+        agreeing = self._agreeing(chosen, answers)
+        verdict = CouncilVerdict(
+            response=chosen,
+            quorum_reached=quorum_reached,
+            agreeing=agreeing,
+            responses=finished,
+            cancelled=cancelled,
+            latency_ms=(time.perf_counter() - started) * 1000,
+            cost=self._costs(finished, cancelled, prompt),
+        )
+        logger.info("Council verdict after %.0fms: %d/%d agreed, %s; cancelled %s.", verdict.latency_ms,
+                    len(agreeing), len(self.models), "quorum reached" if verdict.quorum_reached else "no quorum",
+                    cancelled or "none")
+        return verdict
+
+    def _decide(self, answers: Dict[str, CouncilResponse], pending: int) -> Tuple[Optional[CouncilResponse], bool]:
+        """Returns (chosen response or None, whether the consultation can stop now)."""
+        if self.judge is not None:
+            chosen = self.judge(dict(answers), pending)
+            return chosen, chosen is not None or not pending
+        votes = Counter(self.normalize(response.text) for response in answers.values())
+        if votes:
+            key, count = votes.most_common(1)[0]
+            if count >= self.quorum:
+                return next(r for r in answers.values() if self.normalize(r.text) == key), True
+            if count + pending < self.quorum:
+                return None, True  # Even if every remaining member agreed, there would be no quorum
+        elif pending < self.quorum:
+            return None, True
+        return None, not pending
+
+    def _plurality(self, answers: Dict[str, CouncilResponse]) -> CouncilResponse:
+        key, _ = Counter(self.normalize(response.text) for response in answers.values()).most_common(1)[0]
+        return next(r for r in answers.values() if self.normalize(r.text) == key)
+
+    def _agreeing(self, chosen: Optional[CouncilResponse], answers: Dict[str, CouncilResponse]) -> List[str]:
+        if chosen is None:
+            return []
+        key = self.normalize(chosen.text)
+        return [model for model, response in answers.items() if self.normalize(response.text) == key]
+
+    def _costs(self, finished: Dict[str, CouncilResponse], cancelled: List[str],
+               prompt: str | List[Dict[str, str]]) -> Dict[str, float]:
+        """Each member's cost. Cancelled calls are charged their estimated prompt tokens."""
+        costs = {model: response.usage.cost or 0.0 for model, response in finished.items()}
+        for model in cancelled:
+            costs[model] = cancelled_cost(self.councils[model], prompt)
+        return costs
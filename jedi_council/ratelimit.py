@@ -0,0 +1,225 @@
+# jedi_council/ratelimit.py
+
+import time
+import random
+import asyncio
+import logging
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, Mapping, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """
+    A token bucket that hands out reservations instead of blocking.
+
+    `reserve(n)` debits `n` tokens immediately (the balance may go negative) and returns how
+    long the caller must wait for the debt to refill. Callers therefore queue up in arrival
+    order without polling, and the same bucket serves threads and asyncio alike.
+    """
+
+    def __init__(self, per_minute: float, now: Optional[float] = None):
+        self.capacity = per_minute
+        self.rate = per_minute / 60.0  # tokens per second
+        self.tokens = per_minute
+        self.updated = time.monotonic() if now is None else now
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def reserve(self, amount: float, now: float) -> float:
+        self._refill(now)
+        # A single request larger than the bucket can never fit; let it through once the bucket is full.
+        self.tokens -= min(amount, self.capacity)
+        return max(0.0, -self.tokens / self.rate)
+
+    def set_limit(self, per_minute: float, now: float) -> None:
+        self._refill(now)
+        self.capacity = per_minute
+        self.rate = per_minute / 60.0
+        self.tokens = min(self.tokens, per_minute)
+
+    def sync_remaining(self, remaining: float, now: float) -> None:
+        """Lowers the balance to what the provider says is left, e.g. after other processes spent quota."""
+        self._refill(now)
+        self.tokens = min(self.tokens, remaining)
+
+
+@dataclass
+class RateLimitStats:
+    """Counters showing how much back-pressure a limiter applied."""
+    acquired: int = 0
+    throttled: int = 0  # Acquisitions that had to wait
+    total_wait_s: float = 0.0
+    rate_limited: int = 0  # 429 responses reported to the limiter
+
+
+class RateLimiter:
+    """
+    Client-side requests-per-minute and tokens-per-minute limiter shared by every council of a provider.
+
+    Limits can be configured up front, and are also learned from rate-limit response headers
+    (OpenAI's `x-ratelimit-*`, Anthropic's `anthropic-ratelimit-*`). They are scaled by `headroom`
+    so throughput stays just under quota. A 429 with `Retry-After` pauses every caller of the
+    provider instead of letting each one retry on its own.
+    """
+
+    def __init__(self, rpm: Optional[float] = None, tpm: Optional[float] = None, headroom: float = 0.95):
+        """
+        Args:
+            rpm (float, optional): Requests per minute. Unlimited until configured or learned.
+            tpm (float, optional): Tokens (prompt estimate + max_tokens) per minute.
+            headroom (float): Fraction of the quota to actually use.
+        """
+        self.headroom = headroom
+        self._configured = {"requests": rpm, "tokens": tpm}
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+        self.stats = RateLimitStats()
+        now = time.monotonic()
+        for kind, limit in self._configured.items():
+            if limit:
+                self._buckets[kind] = TokenBucket(limit * headroom, now)
+
+    @property
+    def rpm(self) -> Optional[float]:
+        bucket = self._buckets.get("requests")
+        return bucket.capacity if bucket else None
+
+    @property
+    def tpm(self) -> Optional[float]:
+        bucket = self._buckets.get("tokens")
+        return bucket.capacity if bucket else None
+
+    def reserve(self, tokens: int = 0) -> float:
+        """Reserves one request and `tokens` tokens; returns the seconds to wait before sending."""
+        now = time.monotonic()
+        with self._lock:
+            wait = max(0.0, self._paused_until - now)
+            if wait:
+                # Spread callers released by a shared pause so they don't all fire at once.
+                wait += random.uniform(0, min(1.0, 0.1 * wait))
+            for kind, amount in (("requests", 1), ("tokens", tokens)):
+                bucket = self._buckets.get(kind)
+                if bucket is not None and amount:
+                    wait = max(wait, bucket.reserve(amount, now))
+            self.stats.acquired += 1
+            if wait > 0:
+                self.stats.throttled += 1
+                self.stats.total_wait_s += wait
+        return wait
+
+    def acquire(self, tokens: int = 0) -> None:
+        """Blocks until a request of `tokens` tokens may be sent."""
+        wait = self.reserve(tokens)
+        if wait > 0:
+            logger.debug("Rate limiter holding request for %.2fs", wait)
+            time.sleep(wait)
+
+    async def aacquire(self, tokens: int = 0) -> None:
+        """Awaits until a request of `tokens` tokens may be sent."""
+        wait = self.reserve(tokens)
+        if wait > 0:
+            logger.debug("Rate limiter holding request for %.2fs", wait)
+            await asyncio.sleep(wait)
+
+    def pause(self, seconds: float) -> None:
+        """Holds every caller of this limiter for `seconds`, e.g. after a 429 with Retry-After."""
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+            self.stats.rate_limited += 1
+
+    def update_from_headers(self, headers: Mapping[str, str], status_code: int = 200) -> None:
+        """Adapts limits and balances from a provider response's rate-limit headers."""
+        headers = {k.lower(): v for k, v in headers.items()}
+        retry_after = parse_retry_after(headers)
+        if status_code == 429:
+            self.pause(retry_after if retry_after is not None else 1.0)
+
+        now = time.monotonic()
+        with self._lock:
+            for kind in ("requests", "tokens"):
+                limit = _first_number(headers, f"x-ratelimit-limit-{kind}", f"anthropic-ratelimit-{kind}-limit")
+                remaining = _first_number(headers, f"x-ratelimit-remaining-{kind}", f"anthropic-ratelimit-{kind}-remaining")
+                if limit:
+                    configured = self._configured[kind]
+                    per_minute = min(limit, configured) if configured else limit
+                    bucket = self._buckets.get(kind)
+                    if bucket is None:
+                        self._buckets[kind] = TokenBucket(per_minute * self.headroom, now)
+                    elif bucket.capacity != per_minute * self.headroom:
+                        bucket.set_limit(per_minute * self.headroom, now)
+                if remaining is not None and kind in self._buckets:
+                    self._buckets[kind].sync_remaining(remaining * self.headroom, now)
+
+
+def parse_retry_after(headers: Mapping[str, str]) -> Optional[float]:
+    """Seconds to wait from `retry-after-ms` or `retry-after` (delta-seconds or an HTTP date)."""
+    headers = {k.lower(): v for k, v in headers.items()}
+    if headers.get("retry-after-ms"):
+        try:
+            return float(headers["retry-after-ms"]) / 1000
+        except ValueError:
+            pass
+    value = headers.get("retry-after")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+
+def retry_after_from_error(error: BaseException) -> Optional[float]:
+    """The Retry-After of a failed SDK call, if the error carries an HTTP response."""
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None)
+    return parse_retry_after(headers) if headers else None
+
+
+def _first_number(headers: Mapping[str, str], *names: str) -> Optional[float]:
+    for name in names:
+        if name in headers:
+            try:
+                return float(headers[name])
+            except ValueError:
+                continue
+    return None
+
+
+# --- Process-wide Registry ---
+_limiters: Dict[str, RateLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(provider: str) -> RateLimiter:
+    """Returns the limiter shared by every council of `provider`, creating an unlimited one on first use."""
+    with _limiters_lock:
+        limiter = _limiters.get(provider)
+        if limiter is None:
+            limiter = _limiters[provider] = RateLimiter()
+        return limiter
+
+
+def configure_rate_limit(provider: str, rpm: Optional[float] = None, tpm: Optional[float] = None,
+                         headroom: float = 0.95) -> RateLimiter:
+    """Sets explicit quotas for `provider`, e.g. `configure_rate_limit("openai", rpm=500, tpm=30_000)`."""
+    with _limiters_lock:
+        limiter = _limiters[provider] = RateLimiter(rpm=rpm, tpm=tpm, headroom=headroom)
+        return limiter
+
+
+def reset_rate_limiters() -> None:
+    """Forgets every limiter, including learned limits."""
+    with _limiters_lock:
+        _limiters.clear()
@@ -0,0 +1,206 @@
+# jedi_council/results.py
+"""
+An append-only SQLite store for benchmark results, written one row at a time.
+
+Each row is committed as soon as it arrives, so a crash or Ctrl-C loses at most the call in
+flight. Runs can be resumed: `completed(run_id)` lists the (task, model, trial) triples that
+already succeeded. Every run goes into the same file, which makes it the benchmark history that
+`jedi_council.compare` reads. `load_results` reads a run straight into a pandas DataFrame for
+analysis.
+"""
+
+import csv
+import json
+import time
+import sqlite3
+import threading
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+# Typed columns; any other keys of a result row are kept in the `extra` JSON column.
+COLUMNS = {
+    "run_id": "TEXT NOT NULL",
+    "task_name": "TEXT NOT NULL",
+    "model": "TEXT NOT NULL",
+    "trial": "INTEGER NOT NULL DEFAULT 0",  # Repeat number of the (task, model) pair within its run
+    "timestamp": "TEXT",
+    "latency_ms": "REAL",
+    "ttft_ms": "REAL",
+    "tokens_per_sec": "REAL",
+    "input_tokens": "INTEGER",
+    "output_tokens": "INTEGER",
+    "cache_read_tokens": "INTEGER",
+    "cache_write_tokens": "INTEGER",
+    "cost": "REAL",
+    "cached": "INTEGER",
+    "error": "TEXT",  # NULL on success
+    "text": "TEXT",  # The full response text
+    "extra": "TEXT",
+}
+
+
+# Version 2 added `trial` to the results key.
+SCHEMA_VERSION = 2
+
+
+class ResultStore:
+    """Benchmark results in SQLite, keyed by (run_id, task_name, model, trial)."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        # WAL + NORMAL keeps every committed row across a process crash, without an fsync per row.
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._migrate()
+        columns = ", ".join(f"{name} {kind}" for name, kind in COLUMNS.items())
+        self._conn.execute(f"CREATE TABLE IF NOT EXISTS results ({columns},"
+                           " PRIMARY KEY (run_id, task_name, model, trial))")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS runs ("
+            " run_id TEXT PRIMARY KEY, started_at REAL NOT NULL, finished_at REAL,"
+            " suite_wall_ms REAL, metadata TEXT)"
+        )
+        # Comparisons read one model's rows across runs; run listings go by start time.
+        self._conn.execute("CREATE INDEX IF NOT EXISTS results_model_run ON results (model, run_id)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS runs_started_at ON runs (started_at)")
+        self._conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        self._conn.commit()
+
+    def _migrate(self) -> None:
+        """Rebuilds a version 1 results table, whose rows become trial 0, under the current key."""
+        columns = [row[1] for row in self._conn.execute("PRAGMA table_info(results)")]
+        if not columns or "trial" in columns:
+            return
+        self._conn.execute("ALTER TABLE results RENAME TO results_v1")
+        definitions = ", ".join(f"{name} {kind}" for name, kind in COLUMNS.items())
+        self._conn.execute(f"CREATE TABLE results ({definitions}, PRIMARY KEY (run_id, task_name, model, trial))")
+        self._conn.execute(f"INSERT INTO results ({', '.join(columns)}) SELECT {', '.join(columns)} FROM results_v1")
+        self._conn.execute("DROP TABLE results_v1")
+        self._conn.commit()
+
+    # --- Writing ---
+    def start_run(self, run_id: str, metadata: Optional[Dict[str, Any]] = None) -> None:
+        """Registers `run_id`. Restarting an existing run keeps its start time and rows."""
+        with self._lock:
+            self._conn.execute("INSERT OR IGNORE INTO runs (run_id, started_at, metadata) VALUES (?, ?, ?)",
+                               (run_id, time.time(), json.dumps(metadata or {})))
+            self._conn.commit()
+
+    def finish_run(self, run_id: str, suite_wall_ms: Optional[float] = None) -> None:
+        with self._lock:
+            self._conn.execute("UPDATE runs SET finished_at = ?, suite_wall_ms = ? WHERE run_id = ?",
+                               (time.time(), suite_wall_ms, run_id))
+            self._conn.commit()
+
+    def append(self, row: Dict[str, Any]) -> None:
+        """
+        Writes one result and commits it. A later row for the same (run_id, task_name, model,
+        trial) replaces the earlier one, so a resumed run can retry its failures.
+        """
+        values = {name: row.get(name) for name in COLUMNS if name != "extra"}
+        values["trial"] = values["trial"] or 0
+        values["cached"] = int(bool(values["cached"]))
+        extra = {k: v for k, v in row.items() if k not in COLUMNS}
+        values["extra"] = json.dumps(extra) if extra else None
+        placeholders = ", ".join("?" for _ in values)
+        with self._lock:
+            self._conn.execute(f"INSERT OR REPLACE INTO results ({', '.join(values)}) VALUES ({placeholders})",
+                               tuple(values.values()))
+            self._conn.commit()
+
+    # --- Reading ---
+    def completed(self, run_id: str) -> Set[Tuple[str, str, int]]:
+        """The (task_name, model, trial) triples of `run_id` that succeeded; a resumed run skips these."""
+        with self._lock:
+            rows = self._conn.execute("SELECT task_name, model, trial FROM results WHERE run_id = ? AND error IS NULL",
+                                      (run_id,)).fetchall()
+        return set(rows)
+
+    def latest_run_id(self, unfinished: bool = False) -> Optional[str]:
+        query = "SELECT run_id FROM runs" + (" WHERE finished_at IS NULL" if unfinished else "")
+        with self._lock:
+            row = self._conn.execute(query + " ORDER BY started_at DESC LIMIT 1").fetchone()
+        return row[0] if row else None
+
+    def runs(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            cursor = self._conn.execute("SELECT * FROM runs ORDER BY started_at")
+            names = [d[0] for d in cursor.description]
+            return [dict(zip(names, row)) for row in cursor.fetchall()]
+
+    def iter_rows(self, run_id: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """Streams result rows (all runs, or one) without loading them all into memory."""
+        query, params = "SELECT * FROM results", ()
+        if run_id is not None:
+            query, params = query + " WHERE run_id = ?", (run_id,)
+        # A separate connection, so a long read doesn't hold the writer's lock.
+        conn = sqlite3.connect(self.path)
+        try:
+            cursor = conn.execute(query + " ORDER BY rowid", params)
+            names = [d[0] for d in cursor.description]
+            for row in cursor:
+                yield dict(zip(names, row))
+        finally:
+            conn.close()
+
+    def export_csv(self, csv_path: str, run_id: str) -> int:
+        """
+        Writes `run_id` in the benchmark CSV layout, streaming row by row. Failed calls get
+        latency -1 and an "[ERROR] ..." text, as before. Returns the number of rows written.
+        """
+        with self._lock:
+            (suite_wall_ms,) = self._conn.execute("SELECT suite_wall_ms FROM runs WHERE run_id = ?",
+                                                  (run_id,)).fetchone() or (None,)
+        # The rows come from iter_rows' own connection, so writers aren't held up for the whole export.
+        fields = [name for name in COLUMNS if name not in ("error", "extra")] + ["suite_wall_ms"]
+        count = 0
+        with open(csv_path, "w", newline="", encoding="utf-8") as file:
+            writer = csv.DictWriter(file, fieldnames=fields, extrasaction="ignore")
+            writer.writeheader()
+            for row in self.iter_rows(run_id):
+                if row["error"] is not None:
+                    row["latency_ms"], row["text"] = -1, f"[ERROR] {row['error']}"
+                row["cached"] = bool(row["cached"])
+                row["suite_wall_ms"] = f"{suite_wall_ms:.0f}" if suite_wall_ms is not None else ""
+                writer.writerow(row)
+                count += 1
+        return count
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+def load_results(path: str, run_id: Optional[str] = None, as_frame: bool = True):
+    """
+    Loads results for analysis.
+
+    Args:
+        path (str): The ResultStore database.
+        run_id (str, optional): One run, or "latest". Defaults to every run.
+        as_frame (bool): Return a pandas DataFrame (requires pandas); otherwise a list of dicts.
+
+    Returns:
+        The rows, with `failed` added (True where `error` is set).
+    """
+    if run_id == "latest":
+        store = ResultStore(path)
+        run_id = store.latest_run_id()
+        store.close()
+    query, params = "SELECT *, error IS NOT NULL AS failed FROM results", ()
+    if run_id is not None:
+        query, params = query + " WHERE run_id = ?", (run_id,)
+    conn = sqlite3.connect(path)
+    try:
+        if as_frame:
+            import pandas as pd
+            frame = pd.read_sql_query(query, conn, params=params)
+            frame["cached"] = frame["cached"].astype(bool)
+            frame["failed"] = frame["failed"].astype(bool)
+            return frame
+        cursor = conn.execute(query, params)
+        names = [d[0] for d in cursor.description]
+        return [dict(zip(names, row)) for row in cursor.fetchall()]
+    finally:
+        conn.close()
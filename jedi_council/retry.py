@@ -0,0 +1,184 @@
+# jedi_council/retry.py
+
+import time
+import random
+import threading
+from enum import Enum
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Optional
+
+from jedi_council.ratelimit import retry_after_from_error
+
+
+class ErrorKind(str, Enum):
+    """How a failed call should be treated."""
+    RETRYABLE = "retryable"  # Timeouts, connection errors, 5xx: worth another attempt
+    RATE_LIMITED = "rate_limited"  # 429: retry after the provider's Retry-After
+    FATAL = "fatal"  # Auth errors, bad requests: will never succeed, so fail immediately
+    CIRCUIT_OPEN = "circuit_open"  # The provider's circuit breaker is failing fast
+    DEADLINE_EXCEEDED = "deadline_exceeded"  # The call's total deadline ran out
+    CANCELLED = "cancelled"  # The caller stopped waiting, e.g. closed a stream early
+
+
+class CouncilError(Exception):
+    """The typed failure carried by a failed `CouncilResponse.error`."""
+
+    def __init__(self, kind: ErrorKind, message: str, cause: Optional[BaseException] = None,
+                 status_code: Optional[int] = None):
+        super().__init__(message)
+        self.kind = kind
+        self.cause = cause
+        self.status_code = status_code
+
+    @classmethod
+    def from_exception(cls, error: BaseException, kind: ErrorKind) -> "CouncilError":
+        return cls(kind, f"{type(error).__name__}: {error}", cause=error, status_code=status_code_of(error))
+
+    def __repr__(self) -> str:
+        return f"CouncilError({self.kind.value!r}, {str(self)!r})"
+
+
+def status_code_of(error: BaseException) -> Optional[int]:
+    """The HTTP status behind an SDK error (openai/anthropic/mistral `status_code`, google `code`)."""
+    for attribute in ("status_code", "code"):
+        value = getattr(error, attribute, None)
+        try:
+            if value is not None and 100 <= int(value) < 600:
+                return int(value)
+        except (TypeError, ValueError):
+            continue
+    response = getattr(error, "response", None)
+    return getattr(response, "status_code", None)
+
+
+def classify_error(error: BaseException) -> ErrorKind:
+    """Sorts an exception into retryable, rate-limited or fatal."""
+    status = status_code_of(error)
+    if status == 429:
+        return ErrorKind.RATE_LIMITED
+    if status is not None:
+        if status in (408, 409, 425) or status >= 500:
+            return ErrorKind.RETRYABLE
+        if 400 <= status < 500:
+            return ErrorKind.FATAL
+    if isinstance(error, (TimeoutError, ConnectionError)):
+        return ErrorKind.RETRYABLE
+    name = type(error).__name__
+    if "Timeout" in name or "Connection" in name:
+        return ErrorKind.RETRYABLE
+    # Programming and parsing errors won't fix themselves on retry.
+    if isinstance(error, (TypeError, ValueError, KeyError, AttributeError, NotImplementedError)):
+        return ErrorKind.FATAL
+    return ErrorKind.RETRYABLE
+
+
+@dataclass
+class RetryPolicy:
+    """
+    How a provider call is retried.
+
+    Backoff uses full jitter: attempt `n` sleeps a random time in `[0, min(max_delay, base_delay * 2**(n-1))]`,
+    or the provider's Retry-After for 429s. No retry starts if it would overrun `deadline_s`, and each
+    attempt's request timeout is capped at whatever remains of the deadline.
+    """
+    max_attempts: int = 3
+    base_delay: float = 1.0
+    max_delay: float = 20.0
+    deadline_s: Optional[float] = 120.0  # Total budget for all attempts and backoff
+    request_timeout: Optional[float] = None  # Per-attempt timeout; defaults to what's left of the deadline
+    classify: Callable[[BaseException], ErrorKind] = field(default=classify_error, repr=False)
+
+    def backoff(self, attempt: int, error: BaseException, kind: ErrorKind) -> float:
+        """Seconds to wait after failed attempt number `attempt` (1-based)."""
+        if kind is ErrorKind.RATE_LIMITED:
+            retry_after = retry_after_from_error(error)
+            if retry_after is not None:
+                return retry_after
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+
+    def attempt_timeout(self, started: float) -> Optional[float]:
+        """The timeout for the next attempt, given the call started at monotonic time `started`."""
+        remaining = self.remaining(started)
+        if remaining is None:
+            return self.request_timeout
+        return remaining if self.request_timeout is None else min(self.request_timeout, remaining)
+
+    def remaining(self, started: float) -> Optional[float]:
+        if self.deadline_s is None:
+            return None
+        return self.deadline_s - (time.monotonic() - started)
+
+
+class CircuitBreaker:
+    """
+    Fails fast while a provider is down.
+
+    After `failure_threshold` consecutive retryable failures the circuit opens and calls fail
+    immediately. After `reset_timeout_s` one probe call is let through (half-open). Success
+    closes the circuit; failure opens it again. Fatal and rate-limit errors don't count: they
+    say nothing about whether the provider is up.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout_s: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout_s = reset_timeout_s
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = 0.0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.state == "closed":
+                return True
+            if self.state == "open" and time.monotonic() - self.opened_at >= self.reset_timeout_s:
+                self.state = "half_open"
+                self._probe_in_flight = False
+            if self.state == "half_open" and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.state = "closed"
+            self.failures = 0
+            self._probe_in_flight = False
+
+    def record_failure(self, kind: ErrorKind) -> None:
+        if kind is not ErrorKind.RETRYABLE:
+            with self._lock:
+                self._probe_in_flight = False
+            return
+        with self._lock:
+            self.failures += 1
+            if self.state == "half_open" or self.failures >= self.failure_threshold:
+                self.state = "open"
+                self.opened_at = time.monotonic()
+            self._probe_in_flight = False
+
+
+# --- Process-wide Registry ---
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def get_circuit_breaker(provider: str) -> CircuitBreaker:
+    """Returns the circuit breaker shared by every council of `provider`."""
+    with _breakers_lock:
+        breaker = _breakers.get(provider)
+        if breaker is None:
+            breaker = _breakers[provider] = CircuitBreaker()
+        return breaker
+
+
+def configure_circuit_breaker(provider: str, failure_threshold: int = 5, reset_timeout_s: float = 30.0) -> CircuitBreaker:
+    with _breakers_lock:
+        breaker = _breakers[provider] = CircuitBreaker(failure_threshold, reset_timeout_s)
+        return breaker
+
+
+def reset_circuit_breakers() -> None:
+    with _breakers_lock:
+        _breakers.clear()
@@ -0,0 +1,228 @@
+# jedi_council/router.py
+
+import csv
+import glob
+import random
+import logging
+import threading
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional
+
+from jedi_council.core import TheJediCouncil, CouncilResponse
+from jedi_council.stats import Ewma, QuantileSketch
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ModelStats:
+    """Online estimates for one model, updated from every call it serves."""
+    latency: QuantileSketch = field(default_factory=QuantileSketch)  # Successful, uncached calls only
+    latency_ewma: Ewma = field(default_factory=lambda: Ewma(alpha=0.2))
+    error_rate: Ewma = field(default_factory=lambda: Ewma(alpha=0.2))
+    cost: Ewma = field(default_factory=lambda: Ewma(alpha=0.1))
+    calls: int = 0
+    errors: int = 0
+
+    def record(self, latency_ms: float, cost: float, failed: bool) -> None:
+        self.calls += 1
+        self.errors += failed
+        self.error_rate.update(1.0 if failed else 0.0)
+        if not failed:
+            self.latency.add(latency_ms)
+            self.latency_ewma.update(latency_ms)
+            self.cost.update(cost)
+
+    def latency_quantile(self, q: float) -> Optional[float]:
+        """The `q` latency quantile, nudged towards the EWMA so a model that just slowed down shows it promptly."""
+        quantile = self.latency.quantile(q)
+        recent = self.latency_ewma.value
+        if quantile is None or recent is None:
+            return quantile
+        return max(quantile, recent)
+
+
+# --- Routing Policies ---
+class RoutingPolicy:
+    """Scores a model's stats; the router sends the call to the lowest score."""
+
+    def score(self, stats: ModelStats) -> float:
+        raise NotImplementedError
+
+
+@dataclass
+class MinLatency(RoutingPolicy):
+    """Minimize a latency quantile, p95 by default."""
+    quantile: float = 0.95
+
+    def score(self, stats: ModelStats) -> float:
+        return stats.latency_quantile(self.quantile)
+
+
+@dataclass
+class MinCostUnder(RoutingPolicy):
+    """Minimize cost among models whose latency quantile is under `max_latency_ms`; otherwise the fastest wins."""
+    max_latency_ms: float
+    quantile: float = 0.95
+
+    def score(self, stats: ModelStats) -> float:
+        latency = stats.latency_quantile(self.quantile)
+        if latency <= self.max_latency_ms:
+            return stats.cost.value or 0.0
+        # Every over-budget model ranks after every in-budget one, fastest first.
+        return 1e9 + latency
+
+
+@dataclass
+class Weighted(RoutingPolicy):
+    """A weighted sum of latency quantile (per second), cost (per dollar) and error rate."""
+    latency: float = 1.0
+    cost: float = 100.0
+    errors: float = 10.0
+    quantile: float = 0.95
+
+    def score(self, stats: ModelStats) -> float:
+        return (self.latency * stats.latency_quantile(self.quantile) / 1000
+                + self.cost * (stats.cost.value or 0.0)
+                + self.errors * (stats.error_rate.value or 0.0))
+
+
+class CouncilRouter:
+    """
+    Sends each call to whichever model of a pool currently looks best under a routing policy.
+
+    The router keeps online estimates for every model: a latency quantile sketch and EWMA, an
+    error-rate EWMA and a cost EWMA. Models with too few samples are tried first. A small share
+    of calls explores other models so that estimates stay fresh. Models whose recent error rate
+    is above `max_error_rate` are skipped while any healthy model remains. A failed call falls
+    back to the next-best model, so traffic moves away from slow or degraded providers on its own.
+    """
+
+    def __init__(self, models: List[str], policy: Optional[RoutingPolicy] = None, explore: float = 0.05,
+                 min_samples: int = 5, max_error_rate: float = 0.5, fallback: bool = True,
+                 seed_csv: Optional[str | Iterable[str]] = None, **kwargs):
+        """
+        Args:
+            models (List[str]): The acceptable models.
+            policy (RoutingPolicy, optional): How to rank models. Defaults to `MinLatency()` (p95).
+            explore (float): Share of calls sent to a random model to keep its estimates fresh.
+            min_samples (int): Calls a model needs before its estimates are trusted.
+            max_error_rate (float): Skip models whose recent error rate is above this.
+            fallback (bool): Retry a failed call once on the next-best model.
+            seed_csv (str or Iterable[str], optional): Benchmark CSV paths or globs to seed estimates from.
+            **kwargs: Passed to each model's TheJediCouncil (e.g. cache, retry_policy).
+        """
+        if not models:
+            raise ValueError("CouncilRouter needs at least one model.")
+        self.models = list(models)
+        self.policy = policy or MinLatency()
+        self.explore = explore
+        self.min_samples = min_samples
+        self.max_error_rate = max_error_rate
+        self.fallback = fallback
+        self.stats: Dict[str, ModelStats] = {model: ModelStats() for model in self.models}
+        self.councils: Dict[str, TheJediCouncil] = {model: TheJediCouncil(model=model, **kwargs) for model in self.models}
+        self._lock = threading.Lock()
+        if seed_csv:
+            self.seed_from_csv(seed_csv)
+
+    def ranking(self) -> List[str]:
+        """Models from best to worst right now (without exploration)."""
+        with self._lock:
+            untried = [m for m in self.models if self.stats[m].calls < self.min_samples]
+            healthy = [m for m in self.models if m not in untried and self.stats[m].latency.count
+                       and self.stats[m].error_rate.value <= self.max_error_rate]
+            degraded = [m for m in self.models if m not in untried and m not in healthy]
+            healthy.sort(key=lambda m: self.policy.score(self.stats[m]))
+            degraded.sort(key=lambda m: self.stats[m].error_rate.value)
+            # Least-sampled untried models first, so each gets its warm-up calls.
+            untried.sort(key=lambda m: self.stats[m].calls)
+        return untried + healthy + degraded
+
+    def choose(self) -> List[str]:
+        """The models to try for the next call, in order: the pick, then its fallback."""
+        ranking = self.ranking()
+        if len(ranking) > 1 and random.random() < self.explore:
+            pick = random.choice(ranking[1:])
+            ranking.remove(pick)
+            ranking.insert(0, pick)
+        return ranking[:2] if self.fallback else ranking[:1]
+
+    def record(self, model: str, response: CouncilResponse) -> None:
+        """Updates `model`'s estimates from a response. Cache hits say nothing about the provider and are skipped."""
+        if response.cached:
+            return
+        with self._lock:
+            self.stats[model].record(response.latency_ms, response.usage.cost or 0.0, response.failed)
+
+    def get_wisdom(self, prompt: str | List[Dict[str, str]], **kwargs) -> CouncilResponse:
+        """
+        Consults the best model for this call, falling back to the next best if it fails.
+
+        Args:
+            prompt (str or List[Dict]): A single query string or a list of message dictionaries.
+            **kwargs: Additional parameters like temperature, max_tokens, etc.
+
+        Returns:
+            The CouncilResponse; `response.model` says which model served it.
+        """
+        response = None
+        for model in self.choose():
+            response = self.councils[model].get_wisdom(prompt, **kwargs)
+            self.record(model, response)
+            if not response.failed:
+                break
+        return response
+
+    async def aget_wisdom(self, prompt: str | List[Dict[str, str]], **kwargs) -> CouncilResponse:
+        """Async counterpart of `get_wisdom`."""
+        response = None
+        for model in self.choose():
+            response = await self.councils[model].aget_wisdom(prompt, **kwargs)
+            self.record(model, response)
+            if not response.failed:
+                break
+        return response
+
+    def seed_from_csv(self, paths: str | Iterable[str]) -> int:
+        """
+        Seeds estimates from benchmark CSVs (e.g. `benchmark_runs/*.csv`), so routing is informed from the first call.
+
+        Args:
+            paths (str or Iterable[str]): CSV paths or glob patterns.
+
+        Returns:
+            The number of rows used. Rows for models outside the pool, and cached rows, are ignored.
+        """
+        if isinstance(paths, str):
+            paths = [paths]
+        used = 0
+        for pattern in paths:
+            for path in sorted(glob.glob(pattern)):
+                with open(path, newline="", encoding="utf-8") as file:
+                    for row in csv.DictReader(file):
+                        if row.get("model") not in self.stats or row.get("cached") == "True":
+                            continue
+                        try:
+                            latency = float(row["latency_ms"])
+                            cost = float(row.get("cost") or 0.0)
+                        except (KeyError, ValueError):
+                            continue
+                        failed = latency < 0 or (row.get("text") or "").startswith("[ERROR]")
+                        with self._lock:
+                            self.stats[row["model"]].record(latency, cost, failed)
+                        used += 1
+        logger.info("Seeded router estimates from %d benchmark rows.", used)
+        return used
+
+    def snapshot(self) -> Dict[str, Dict[str, Optional[float]]]:
+        """Current estimates per model, for dashboards and logs."""
+        with self._lock:
+            return {model: {
+                "calls": s.calls,
+                "p50_ms": s.latency.quantile(0.5),
+                "p95_ms": s.latency.quantile(0.95),
+                "ewma_ms": s.latency_ewma.value,
+                "error_rate": s.error_rate.value,
+                "cost": s.cost.value,
+            } for model, s in self.stats.items()}
@@ -0,0 +1,323 @@
+# jedi_council/runner.py
+"""
+Runs a large JSONL file of prompts through one model, sharded across worker processes.
+
+    jedi-council run --input prompts.jsonl --model gpt-4o --workers 4 --concurrency 16 --rpm 5000
+
+Worker k takes the prompts on lines k, k + N, k + 2N, ... It streams the input itself, runs
+its own event loop with at most `concurrency` calls in flight, and appends each result to its
+shard file as soon as it arrives. The shard files are the checkpoint. A killed run restarted
+with `--resume` skips every prompt that already succeeded and retries the failed ones. When all
+workers finish, the shards are merged into one JSONL file in input order.
+"""
+
+import os
+import json
+import shutil
+import asyncio
+import logging
+import multiprocessing
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+from jedi_council.batch import BatchRequest, parse_batch_request
+from jedi_council.stats import QuantileSketch
+
+logger = logging.getLogger(__name__)
+
+MANIFEST = "manifest.json"
+
+
+@dataclass
+class ShardSpec:
+    """Everything a worker process needs to run its shard."""
+    input: str
+    parts_dir: str
+    shard: int
+    workers: int
+    model: str
+    concurrency: int = 8
+    base_url: Optional[str] = None
+    rpm: Optional[float] = None  # This worker's share of the quota
+    tpm: Optional[float] = None
+    max_retry: int = 3
+
+    @property
+    def path(self) -> str:
+        return shard_path(self.parts_dir, self.shard)
+
+
+@dataclass
+class RunSummary:
+    """What one or more shards did in this session. Shards' summaries merge into the run's."""
+    completed: int = 0  # Calls made this session, failed ones included
+    failed: int = 0
+    skipped: int = 0  # Already done by an earlier session
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cost: float = 0.0
+    latency_ms: QuantileSketch = field(default_factory=QuantileSketch)
+
+    def record(self, record: Dict[str, Any]) -> None:
+        self.completed += 1
+        self.failed += record["error"]
+        self.input_tokens += record["input_tokens"] or 0
+        self.output_tokens += record["output_tokens"] or 0
+        self.cost += record["cost"] or 0.0
+        if not record["error"]:
+            self.latency_ms.add(record["latency_ms"])
+
+    def merge(self, other: "RunSummary") -> None:
+        self.completed += other.completed
+        self.failed += other.failed
+        self.skipped += other.skipped
+        self.input_tokens += other.input_tokens
+        self.output_tokens += other.output_tokens
+        self.cost += other.cost
+        self.latency_ms.merge(other.latency_ms)
+
+
+def shard_path(parts_dir: str, shard: int) -> str:
+    return os.path.join(parts_dir, f"shard-{shard:03d}.jsonl")
+
+
+def shard_requests(path: str, shard: int, workers: int) -> Iterator[Tuple[int, BatchRequest]]:
+    """Streams (line index, request) for the lines of `path` that belong to `shard`."""
+    with open(path, encoding="utf-8") as file:
+        for index, line in enumerate(file):
+            if index % workers == shard and line.strip():
+                yield index, parse_batch_request(json.loads(line), index)
+
+
+def check_input(path: str) -> int:
+    """
+    Parses every line of `path` once before any worker starts, so a malformed line stops the
+    run up front instead of failing a shard after other prompts have been paid for. Returns the
+    number of prompts.
+    """
+    count, errors = 0, []
+    with open(path, encoding="utf-8") as file:
+        for index, line in enumerate(file):
+            if not line.strip():
+                continue
+            try:
+                parse_batch_request(json.loads(line), index)
+                count += 1
+            except (ValueError, TypeError, AttributeError, KeyError) as e:  # JSONDecodeError is a ValueError
+                errors.append(f"line {index + 1}: {e}")
+    if errors:
+        more = f" (and {len(errors) - 5} more)" if len(errors) > 5 else ""
+        raise ValueError(f"{len(errors)} malformed line(s) in {path}: {'; '.join(errors[:5])}{more}")
+    return count
+
+
+def error_record(index: int, request_id: str, model: str, error: BaseException) -> Dict[str, Any]:
+    """A failed shard record for a prompt whose result couldn't be produced or recorded."""
+    return {"index": index, "request_id": request_id, "model": model, "text": f"{type(error).__name__}: {error}",
+            "input_tokens": 0, "output_tokens": 0, "cost": 0.0, "latency_ms": None, "error": True,
+            "error_kind": "fatal"}
+
+
+def load_checkpoint(path: str) -> Set[int]:
+    """
+    The line indices a shard file records as succeeded. A torn last line, left by a killed
+    worker, is cut off so appending can continue cleanly.
+    """
+    done: Set[int] = set()
+    if not os.path.exists(path):
+        return done
+    with open(path, "rb+") as file:
+        good_until = 0
+        for line in file:
+            if not line.endswith(b"\n"):
+                break
+            good_until += len(line)
+            record = json.loads(line)
+            if record["error"]:
+                done.discard(record["index"])
+            else:
+                done.add(record["index"])
+        file.truncate(good_until)
+    return done
+
+
+# --- Worker ---
+def run_shard(spec: ShardSpec) -> RunSummary:
+    """Runs one shard to completion; the entry point of each worker process."""
+    from jedi_council.core import TheJediCouncil, route_model
+    from jedi_council.ratelimit import configure_rate_limit
+
+    if spec.rpm or spec.tpm:
+        configure_rate_limit(route_model(spec.model), rpm=spec.rpm, tpm=spec.tpm)
+    council = TheJediCouncil(model=spec.model, base_url=spec.base_url, max_retry=spec.max_retry,
+                             raw_response="drop")
+    done = load_checkpoint(spec.path)
+    summary = RunSummary(skipped=len(done))
+    with open(spec.path, "a", encoding="utf-8") as out:
+        asyncio.run(_run_shard(council, spec, done, out, summary))
+    return summary
+
+
+async def _run_shard(council, spec: ShardSpec, done: Set[int], out, summary: RunSummary) -> None:
+    from jedi_council.cli import response_record
+
+    in_flight = asyncio.Semaphore(spec.concurrency)
+    pending: Set[asyncio.Task] = set()
+
+    async def consult(index: int, request: BatchRequest) -> None:
+        try:
+            try:
+                response = await council.aget_wisdom(request.messages, **request.params)
+            finally:
+                in_flight.release()
+            record = {"index": index, **response_record(response), "request_id": request.custom_id}
+        except Exception as e:
+            # Provider failures come back as failed responses; this is e.g. a hook or a result that
+            # couldn't be serialized. Record it as failed, so the rest of the shard carries on.
+            logger.exception("Prompt %s (line %d) failed outside the provider call", request.custom_id, index + 1)
+            record = error_record(index, request.custom_id, spec.model, e)
+        # One write and flush per result: the shard file doubles as the checkpoint.
+        out.write(json.dumps(record, ensure_ascii=False) + "\n")
+        out.flush()
+        summary.record(record)
+
+    # Acquiring before reading the next line keeps at most `concurrency` prompts in memory.
+    for index, request in shard_requests(spec.input, spec.shard, spec.workers):
+        if index in done:
+            continue
+        await in_flight.acquire()
+        task = asyncio.create_task(consult(index, request))
+        pending.add(task)
+        task.add_done_callback(pending.discard)
+    if pending:
+        await asyncio.gather(*pending)
+
+
+# --- Coordinator ---
+def merge_shards(parts_dir: str, workers: int, output: str) -> Tuple[int, int]:
+    """
+    Writes the latest record for each line to `output`, in input order. Only byte offsets are
+    held in memory (about 9 bytes per line), never the records themselves.
+
+    Returns:
+        (records written, how many of them failed)
+    """
+    offsets: List[array] = []
+    failures = 0
+    for shard in range(workers):
+        positions = array("q")  # Line shard + i * workers -> offset of its latest record, or -1
+        failed = array("b")
+        path = shard_path(parts_dir, shard)
+        if os.path.exists(path):
+            with open(path, "rb") as file:
+                offset = 0
+                for line in file:
+                    record = json.loads(line)
+                    position = record["index"] // workers
+                    if position >= len(positions):
+                        positions.extend([-1] * (position + 1 - len(positions)))
+                        failed.extend([0] * (position + 1 - len(failed)))
+                    positions[position] = offset
+                    failed[position] = bool(record["error"])
+                    offset += len(line)
+        offsets.append(positions)
+        failures += sum(failed)
+
+    count, lines = 0, max((len(p) for p in offsets), default=0) * workers
+    files = [open(shard_path(parts_dir, shard), "rb") if offsets[shard] else None for shard in range(workers)]
+    try:
+        with open(output + ".tmp", "wb") as out:
+            for index in range(lines):
+                shard, position = index % workers, index // workers
+                if position < len(offsets[shard]) and offsets[shard][position] >= 0:
+                    files[shard].seek(offsets[shard][position])
+                    out.write(files[shard].readline())
+                    count += 1
+    finally:
+        for file in files:
+            if file is not None:
+                file.close()
+    os.replace(output + ".tmp", output)
+    return count, failures
+
+
+def run(input_path: str, model: str, output: str, workers: int = 1, concurrency: int = 8,
+        base_url: Optional[str] = None, rpm: Optional[float] = None, tpm: Optional[float] = None,
+        max_retry: int = 3, resume: bool = False, restart: bool = False) -> Tuple[RunSummary, bool]:
+    """
+    Runs every prompt in `input` and writes the results to `output`.
+
+    Args:
+        input_path (str): JSONL prompts, in any format `jedi_council.batch.parse_batch_request` accepts.
+        model (str): The model to consult.
+        output (str): Where the merged results go. Progress is kept in `<output>.parts/` until then.
+        workers (int): Worker processes. With 1, the shard runs in this process.
+        concurrency (int): Calls in flight per worker.
+        base_url (str, optional): Alternate API endpoint, e.g. a local stand-in server.
+        rpm, tpm (float, optional): The quota for the whole run; each worker gets an equal share.
+        max_retry (int): Attempts per prompt.
+        resume (bool): Continue the run checkpointed in `<output>.parts/`.
+        restart (bool): Discard that checkpoint and start over.
+
+    Returns:
+        The aggregate RunSummary of this session, and whether any prompt in `output` failed
+        (the checkpoint is then kept, so `resume=True` retries them).
+
+    Raises:
+        ValueError: `input` has malformed lines (checked before any call), or the checkpoint
+            doesn't match this run.
+    """
+    check_input(input_path)
+    parts_dir = output + ".parts"
+    manifest = {"input": os.path.abspath(input_path), "model": model, "workers": workers}
+    manifest_path = os.path.join(parts_dir, MANIFEST)
+    if os.path.exists(parts_dir):
+        if restart:
+            shutil.rmtree(parts_dir)
+        elif not resume:
+            raise ValueError(f"{parts_dir} holds an unfinished run; pass resume=True to continue it or restart=True to discard it.")
+        else:
+            with open(manifest_path, encoding="utf-8") as file:
+                previous = json.load(file)
+            if previous != manifest:
+                raise ValueError(f"Can't resume: the checkpoint was made with {previous}, not {manifest}.")
+    os.makedirs(parts_dir, exist_ok=True)
+    with open(manifest_path, "w", encoding="utf-8") as file:
+        json.dump(manifest, file)
+
+    specs = [ShardSpec(input=input_path, parts_dir=parts_dir, shard=shard, workers=workers, model=model,
+                       concurrency=concurrency, base_url=base_url, rpm=rpm / workers if rpm else None,
+                       tpm=tpm / workers if tpm else None, max_retry=max_retry) for shard in range(workers)]
+    summary = RunSummary()
+    if workers == 1:
+        summary.merge(run_shard(specs[0]))
+    else:
+        # Spawn rather than fork: the parent may hold locks and SDK clients that shouldn't be inherited.
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+            for shard_summary in pool.map(run_shard, specs):
+                summary.merge(shard_summary)
+
+    _, failures = merge_shards(parts_dir, workers, output)
+    if not failures:
+        shutil.rmtree(parts_dir)
+    return summary, failures > 0
+
+
+def print_summary(summary: RunSummary, model: str, workers: int, wall_s: float, output: str,
+                  parts_kept: bool) -> None:
+    throughput = summary.completed / wall_s if wall_s > 0 else 0.0
+    print(f"Ran {summary.completed} prompts on {model} with {workers} worker(s) in {wall_s:.1f}s"
+          + (f" ({summary.skipped} already done)" if summary.skipped else ""))
+    print(f"   Throughput:    {throughput:.1f} req/s")
+    print(f"   Failed:        {summary.failed}")
+    print(f"   Tokens:        {summary.input_tokens} in / {summary.output_tokens} out")
+    print(f"   Cost:          ${summary.cost:.6f}")
+    sketch = summary.latency_ms
+    if sketch.count:
+        print("   Latency (ms):  " + "  ".join(f"{name}={sketch.quantile(q):.0f}" for name, q in
+                                               (("p50", 0.5), ("p95", 0.95), ("p99", 0.99), ("max", 1.0))))
+    print(f"Results: {output}")
+    if parts_kept:
+        print("Some prompts failed; rerun with --resume to retry them.")
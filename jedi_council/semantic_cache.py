@@ -0,0 +1,427 @@
+# jedi_council/semantic_cache.py
+"""
+An opt-in cache that also serves near-duplicate prompts, not just identical ones.
+
+    from jedi_council.semantic_cache import SemanticCache
+    cache = SemanticCache(path="semantic_cache", threshold=0.9, thresholds={"gpt-4o": 0.95})
+    council = TheJediCouncil(model="gpt-4o", cache=cache)
+
+A request's last message is embedded locally (no API calls) and looked up among earlier
+requests with the same model, generation parameters and preceding messages. The closest one is
+a hit if its cosine similarity reaches the model's threshold. Vectors live in a fixed-size
+matrix, memory-mapped from disk when `path` is given. Up to `ivf_min_entries` entries, search
+is exact. Beyond that, an inverted-file index (k-means cells, only the nearest `nprobe` cells
+scanned) keeps lookups well under a millisecond at 100k entries.
+
+Needs numpy: `pip install -e .[semantic]`.
+"""
+
+import os
+import re
+import json
+import time
+import zlib
+import sqlite3
+import logging
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError as e:  # pragma: no cover - depends on the environment
+    raise ImportError("The semantic cache needs numpy; install it with `pip install -e .[semantic]`.") from e
+
+from jedi_council.cache import ResponseCache, request_key
+from jedi_council.core import CouncilResponse, ERROR_COUNCIL_RESPONSE
+
+logger = logging.getLogger(__name__)
+
+_WORD = re.compile(r"\w+")
+
+# A stored entry this similar to a new one is the same prompt; its payload is replaced instead.
+_DUPLICATE_SIMILARITY = 0.999
+
+
+# --- Embedders ---
+class Embedder:
+    """
+    Turns texts into L2-normalized float32 vectors. Subclass it to plug in another model, e.g.
+    a local sentence-transformer; the cache only relies on `dim` and `embed`.
+    """
+
+    dim: int
+
+    def embed(self, texts: Sequence[str]) -> "np.ndarray":
+        """Returns a (len(texts), dim) float32 array of unit-length rows (all-zero for empty texts)."""
+        raise NotImplementedError
+
+
+class HashingEmbedder(Embedder):
+    """
+    Feature hashing of words, word pairs and character n-grams. Nothing to fit or download, and
+    stable across processes, so persisted vectors stay valid.
+
+    It catches rewordings that keep most of the words: case, punctuation, spacing, an added
+    "please", small edits to longer prompts. It does not know synonyms.
+    """
+
+    def __init__(self, dim: int = 256, char_ngram: int = 4, char_weight: float = 0.3):
+        """
+        Args:
+            dim (int): Vector size. Larger means fewer hash collisions but slower search.
+            char_ngram (int): Length of the character n-grams; 0 turns them off.
+            char_weight (float): Weight of a character n-gram relative to a word.
+        """
+        self.dim = dim
+        self.char_ngram = char_ngram
+        self.char_weight = char_weight
+
+    def features(self, text: str) -> Tuple[List[str], List[str]]:
+        """(word and word-pair features, character n-gram features) of `text`."""
+        words = _WORD.findall(text.lower())
+        terms = words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+        grams: List[str] = []
+        if self.char_ngram:
+            joined = f" {' '.join(words)} "
+            n = self.char_ngram
+            grams = ["#" + joined[i:i + n] for i in range(len(joined) - n + 1)]
+        return terms, grams
+
+    def embed(self, texts: Sequence[str]) -> "np.ndarray":
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            terms, grams = self.features(text)
+            if not terms:
+                continue
+            hashes = np.fromiter((zlib.crc32(f.encode("utf-8")) for f in terms + grams),
+                                 dtype=np.uint32, count=len(terms) + len(grams))
+            # The top bit picks the sign, so colliding features tend to cancel rather than pile up.
+            signs = np.where(hashes >> 31, -1.0, 1.0)
+            signs[len(terms):] *= self.char_weight
+            vectors[row] = np.bincount(hashes % self.dim, weights=signs, minlength=self.dim)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        vectors /= np.where(norms == 0, 1.0, norms)
+        return vectors
+
+
+# --- The Vector Index ---
+class VectorIndex:
+    """
+    A fixed-capacity cosine index over unit vectors, each tagged with an int64 namespace.
+
+    Slots are reused: once full, adding evicts the least recently used entry. Search is exact
+    until `ivf_min_entries` entries. At that point the vectors are clustered into about
+    4 * sqrt(n) cells, and a search scans only the `nprobe` cells nearest the query. The cells
+    are retrained whenever the index has doubled since they were last trained.
+    """
+
+    def __init__(self, dim: int, capacity: int, path: Optional[str] = None, nprobe: int = 8,
+                 ivf_min_entries: int = 4096, seed: int = 0):
+        """
+        Args:
+            dim (int): Vector size.
+            capacity (int): Maximum number of entries.
+            path (str, optional): A .npy file to memory-map the vectors from. In memory if omitted.
+            nprobe (int): Cells scanned per search once the inverted file is in use.
+            ivf_min_entries (int): Entries before the inverted file is trained; 0 disables it.
+            seed (int): Seed for choosing the initial k-means centroids.
+        """
+        self.dim = dim
+        self.capacity = capacity
+        self.nprobe = nprobe
+        self.ivf_min_entries = ivf_min_entries
+        self._rng = np.random.default_rng(seed)
+        if path is None:
+            self.vectors = np.zeros((capacity, dim), dtype=np.float32)
+        elif os.path.exists(path):
+            self.vectors = np.lib.format.open_memmap(path, mode="r+")
+            if self.vectors.shape != (capacity, dim) or self.vectors.dtype != np.float32:
+                raise ValueError(f"{path} holds {self.vectors.shape} {self.vectors.dtype} vectors, "
+                                 f"not ({capacity}, {dim}) float32.")
+        else:
+            self.vectors = np.lib.format.open_memmap(path, mode="w+", dtype=np.float32, shape=(capacity, dim))
+        self.namespaces = np.zeros(capacity, dtype=np.int64)
+        self.last_used = np.full(capacity, np.inf)  # inf marks a free slot
+        self.size = 0
+        self._high_water = 0  # Slots below this have been used at least once
+
+        self.centroids: Optional[np.ndarray] = None
+        self._trained_at = 0
+        self._cell_of = np.full(capacity, -1, dtype=np.int32)
+        self._cells: List[List[int]] = []
+        self._cell_arrays: Dict[int, np.ndarray] = {}  # Cell -> its slots as an array, rebuilt on change
+
+    def __len__(self) -> int:
+        return self.size
+
+    def restore(self, slot: int, namespace: int, last_used: float) -> None:
+        """Marks `slot` as holding an entry whose vector is already in `vectors` (e.g. after reopening)."""
+        if self.last_used[slot] == np.inf:
+            self.size += 1
+        self.namespaces[slot] = namespace
+        self.last_used[slot] = last_used
+        self._high_water = max(self._high_water, slot + 1)
+
+    def search(self, vector: "np.ndarray", namespace: int) -> Tuple[int, float]:
+        """The most similar entry in `namespace`: (slot, cosine similarity), or (-1, -1.0) if none."""
+        if self.centroids is None:
+            slots = None
+            scores = self.vectors[:self._high_water] @ vector
+            mask = (self.namespaces[:self._high_water] == namespace) & (self.last_used[:self._high_water] != np.inf)
+        else:
+            nearest = self.centroids @ vector
+            probe = np.argpartition(nearest, -self.nprobe)[-self.nprobe:] if self.nprobe < len(nearest) else range(len(nearest))
+            slots = np.concatenate([self._cell_array(cell) for cell in probe])
+            scores = self.vectors[slots] @ vector
+            mask = self.namespaces[slots] == namespace
+        if not mask.any():
+            return -1, -1.0
+        scores = np.where(mask, scores, -np.inf)
+        best = int(np.argmax(scores))
+        return (best if slots is None else int(slots[best])), float(scores[best])
+
+    def add(self, vector: "np.ndarray", namespace: int, now: Optional[float] = None) -> Tuple[int, Optional[int]]:
+        """
+        Stores `vector` and returns (its slot, the slot evicted to make room or None). When a
+        slot is evicted, it is the one returned.
+        """
+        evicted = None
+        if self._high_water < self.capacity:
+            slot = self._high_water
+            self._high_water += 1
+        elif self.size < self.capacity:
+            slot = int(np.argmax(self.last_used == np.inf))
+        else:
+            slot = evicted = int(np.argmin(self.last_used))
+            self.remove(slot)
+        self.vectors[slot] = vector
+        self.namespaces[slot] = namespace
+        self.last_used[slot] = time.time() if now is None else now
+        self.size += 1
+        if self.centroids is not None:
+            self._assign(slot)
+        if self.ivf_min_entries and self.size >= max(self.ivf_min_entries, 2 * self._trained_at):
+            self.train()
+        return slot, evicted
+
+    def remove(self, slot: int) -> None:
+        if self.last_used[slot] == np.inf:
+            return
+        self.last_used[slot] = np.inf
+        self.size -= 1
+        cell = self._cell_of[slot]
+        if cell >= 0:
+            self._cells[cell].remove(slot)
+            self._cell_arrays.pop(cell, None)
+            self._cell_of[slot] = -1
+
+    def touch(self, slot: int, now: Optional[float] = None) -> None:
+        self.last_used[slot] = time.time() if now is None else now
+
+    def train(self, iterations: int = 8, sample_per_cell: int = 32) -> None:
+        """(Re)clusters the stored vectors into cells for the inverted-file search."""
+        started = time.perf_counter()
+        occupied = np.flatnonzero(self.last_used[:self._high_water] != np.inf)
+        cells = max(1, min(len(occupied), int(4 * np.sqrt(len(occupied)))))
+        sample = self._rng.choice(occupied, size=min(len(occupied), cells * sample_per_cell), replace=False)
+        data = self.vectors[np.sort(sample)]
+        centroids = data[self._rng.choice(len(data), size=cells, replace=False)].copy()
+        for _ in range(iterations):
+            nearest = self._nearest(data, centroids)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, nearest, data)
+            norms = np.linalg.norm(sums, axis=1, keepdims=True)
+            centroids = np.where(norms > 0, sums / np.where(norms == 0, 1.0, norms), centroids)  # Empty cells keep their centroid
+        self.centroids = centroids.astype(np.float32)
+        self._trained_at = len(occupied)
+
+        self._cell_of[:] = -1
+        self._cells = [[] for _ in range(cells)]
+        self._cell_arrays = {}
+        for slot, cell in zip(occupied.tolist(), self._nearest(self.vectors[occupied], self.centroids).tolist()):
+            self._cell_of[slot] = cell
+            self._cells[cell].append(slot)
+        logger.info("Trained %d cells over %d vectors in %.0fms", cells, len(occupied),
+                    (time.perf_counter() - started) * 1000)
+
+    def _assign(self, slot: int) -> None:
+        cell = int(np.argmax(self.centroids @ self.vectors[slot]))
+        self._cell_of[slot] = cell
+        self._cells[cell].append(slot)
+        self._cell_arrays.pop(cell, None)
+
+    def _cell_array(self, cell: int) -> "np.ndarray":
+        array = self._cell_arrays.get(cell)
+        if array is None:
+            array = self._cell_arrays[cell] = np.array(self._cells[cell], dtype=np.int64)
+        return array
+
+    @staticmethod
+    def _nearest(data: "np.ndarray", centroids: "np.ndarray", chunk: int = 8192) -> "np.ndarray":
+        """Index of the nearest centroid for each row, computed in chunks to bound memory."""
+        return np.concatenate([np.argmax(data[i:i + chunk] @ centroids.T, axis=1)
+                               for i in range(0, len(data), chunk)]) if len(data) else np.zeros(0, dtype=np.int64)
+
+    def flush(self) -> None:
+        if isinstance(self.vectors, np.memmap):
+            self.vectors.flush()
+
+
+# --- The Cache ---
+@dataclass(frozen=True)
+class SemanticKey:
+    """What `SemanticCache.key` computes once per request, for both the lookup and the store."""
+    model: str
+    namespace: int  # Hash of model, params and every message but the last; these must match exactly
+    vector: "np.ndarray"
+
+
+@dataclass
+class SemanticCacheStats:
+    """Counters for a `SemanticCache`."""
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    similarity_sum: float = 0.0  # Over hits
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    @property
+    def mean_similarity(self) -> float:
+        return self.similarity_sum / self.hits if self.hits else 0.0
+
+
+class SemanticCache:
+    """
+    A response cache that also serves near-duplicate prompts. A drop-in for ResponseCache:
+    pass one as `TheJediCouncil(model, cache=SemanticCache(...))`.
+
+    Hits come back with `cached=True` and a `latency_ms` equal to the lookup time, embedding
+    included. Error responses are never cached. Because a near-duplicate may deserve a different
+    answer, set the threshold as high as your hit rate allows, and higher per model where needed.
+    """
+
+    def __init__(self, embedder: Optional[Embedder] = None, threshold: float = 0.9,
+                 thresholds: Optional[Dict[str, float]] = None, max_entries: int = 100_000,
+                 path: Optional[str] = None, nprobe: int = 8, ivf_min_entries: int = 4096):
+        """
+        Args:
+            embedder (Embedder, optional): Defaults to a 256-dimensional HashingEmbedder.
+            threshold (float): Minimum cosine similarity for a hit.
+            thresholds (Dict[str, float], optional): Per-model overrides of `threshold`.
+            max_entries (int): Size bound; the least recently used entry is evicted past it.
+            path (str, optional): Directory for the memory-mapped vectors and a SQLite file of
+                responses. Memory-only if omitted. Reopen it with the same embedder and max_entries.
+            nprobe (int): Cells scanned per lookup once the inverted file is in use.
+            ivf_min_entries (int): Entries before lookups switch from exact to inverted-file search.
+        """
+        self.embedder = embedder or HashingEmbedder()
+        self.threshold = threshold
+        self.thresholds = dict(thresholds or {})
+        self.path = path
+        self.stats = SemanticCacheStats()
+        self._lock = threading.Lock()
+        self._payloads: Dict[int, Dict[str, Any]] = {}
+        self._conn: Optional[sqlite3.Connection] = None
+        if path is not None:
+            os.makedirs(path, exist_ok=True)
+        self._index_args = dict(dim=self.embedder.dim, capacity=max_entries, nprobe=nprobe,
+                                ivf_min_entries=ivf_min_entries,
+                                path=os.path.join(path, "vectors.npy") if path else None)
+        self.index = VectorIndex(**self._index_args)
+        if path is not None:
+            self._open(os.path.join(path, "entries.db"))
+
+    def threshold_for(self, model: str) -> float:
+        return self.thresholds.get(model, self.threshold)
+
+    def key(self, model: str, messages: List[Dict[str, Any]], params: Dict[str, Any]) -> SemanticKey:
+        *context, last = messages
+        content = last.get("content", "")
+        text = content if isinstance(content, str) else json.dumps(content, sort_keys=True, default=str)
+        scope = request_key(model, [*context, {"role": last.get("role")}], params)
+        return SemanticKey(model=model, namespace=int(scope[:15], 16), vector=self.embedder.embed([text])[0])
+
+    def get(self, key: SemanticKey) -> Optional[CouncilResponse]:
+        start_time = time.perf_counter()
+        with self._lock:
+            slot, similarity = self.index.search(key.vector, key.namespace)
+            if slot < 0 or similarity < self.threshold_for(key.model):
+                self.stats.misses += 1
+                return None
+            self.index.touch(slot)
+            payload = self._load(slot)
+            self.stats.hits += 1
+            self.stats.similarity_sum += similarity
+        # Building the key embedded the prompt, so that time counts as lookup time too.
+        return ResponseCache._from_payload(payload, latency_ms=(time.perf_counter() - start_time) * 1000)
+
+    def put(self, key: SemanticKey, response: CouncilResponse) -> None:
+        if response.text == ERROR_COUNCIL_RESPONSE or not key.vector.any():
+            return
+        payload = ResponseCache._to_payload(response)
+        with self._lock:
+            slot, similarity = self.index.search(key.vector, key.namespace)
+            if slot < 0 or similarity < _DUPLICATE_SIMILARITY:
+                slot, evicted = self.index.add(key.vector, key.namespace)
+                if evicted is not None:
+                    self.stats.evictions += 1
+            else:
+                self.index.touch(slot)
+            self._store(slot, key.namespace, payload)
+
+    def clear(self) -> None:
+        with self._lock:
+            # Vectors left in the memory map are unreachable once their entries are gone.
+            self.index = VectorIndex(**self._index_args)
+            self._payloads.clear()
+            if self._conn is not None:
+                self._conn.execute("DELETE FROM entries")
+                self._conn.commit()
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def close(self) -> None:
+        with self._lock:
+            self.index.flush()
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    # --- Payload storage ---
+    def _open(self, db_path: str) -> None:
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            " slot INTEGER PRIMARY KEY, namespace INTEGER NOT NULL,"
+            " payload TEXT NOT NULL, last_used REAL NOT NULL)"
+        )
+        self._conn.commit()
+        for slot, namespace, last_used in self._conn.execute("SELECT slot, namespace, last_used FROM entries"):
+            if slot < self.index.capacity:
+                self.index.restore(slot, namespace, last_used)
+        if self.index.ivf_min_entries and len(self.index) >= self.index.ivf_min_entries:
+            self.index.train()
+
+    def _load(self, slot: int) -> Dict[str, Any]:
+        if self._conn is None:
+            return self._payloads[slot]
+        payload, = self._conn.execute("SELECT payload FROM entries WHERE slot = ?", (slot,)).fetchone()
+        self._conn.execute("UPDATE entries SET last_used = ? WHERE slot = ?", (self.index.last_used[slot], slot))
+        self._conn.commit()
+        return json.loads(payload)
+
+    def _store(self, slot: int, namespace: int, payload: Dict[str, Any]) -> None:
+        if self._conn is None:
+            self._payloads[slot] = payload
+            return
+        # The vector is already in the memory map; the row makes it reachable after a reopen.
+        self._conn.execute("INSERT OR REPLACE INTO entries (slot, namespace, payload, last_used) VALUES (?, ?, ?, ?)",
+                           (slot, namespace, json.dumps(payload), self.index.last_used[slot]))
+        self._conn.commit()
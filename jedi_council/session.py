@@ -0,0 +1,235 @@
+# jedi_council/session.py
+"""
+Multi-turn conversations whose prompt size stays within a token budget.
+
+    session = CouncilSession(TheJediCouncil(model="gpt-4o"), system="You are Yoda.", summarize=True)
+    for question in questions:
+        response = session.ask(question)
+    print(session.total_saved_tokens)
+
+The session keeps the conversation and a running token count, so a turn costs one count of
+the new message instead of a recount of the whole history. Pinned messages (the system prompt
+and any fixed prefix) are always sent first. When the next request would go over budget, the
+oldest turns are dropped, or folded into a summary with `summarize`. Trimming goes well below
+the budget, to `trim_to`, so that it happens only every few turns. In between, the prompt
+prefix stays byte-identical, and the providers' prompt caches keep hitting.
+"""
+
+import logging
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from jedi_council.core import TheJediCouncil, CouncilResponse, CACHE_MARKER
+from jedi_council.utils.tokens import count_message_tokens
+
+logger = logging.getLogger(__name__)
+
+# Prompt-token budgets per model: well inside the context windows, where long prompts start to
+# cost noticeably more time and money per turn.
+SESSION_BUDGETS = {
+    "gpt-4o": 16_000,
+    "gpt-3.5-turbo": 8_000,
+    "claude-3-haiku-20240307": 16_000,
+    "claude-3-5-sonnet-20240620": 16_000,
+    "gemini-1.5-pro": 16_000,
+    "mistral-7b": 8_000,
+}
+DEFAULT_SESSION_BUDGET = 8_000
+
+SUMMARY_PROMPT = ("Summarize the conversation below for your own later reference, in a few sentences. "
+                  "Keep facts, names, numbers, decisions and open questions; drop pleasantries.")
+SUMMARY_HEADER = "Summary of the earlier conversation:\n"
+
+
+@dataclass
+class Turn:
+    """One exchange: the user's message and the reply, with their token count."""
+    messages: List[Dict[str, Any]]
+    tokens: int
+
+
+@dataclass
+class TurnStats:
+    """What one successful `ask` sent, compared with resending the whole conversation."""
+    sent_tokens: int  # Estimated prompt tokens of the request
+    full_tokens: int  # Estimated prompt tokens had the full history been sent
+    dropped_turns: int = 0  # Turns trimmed before this request
+    summarized: bool = False  # Whether the trimmed turns were folded into the summary
+
+    @property
+    def saved_tokens(self) -> int:
+        return self.full_tokens - self.sent_tokens
+
+
+class CouncilSession:
+    """
+    A conversation with one council that trims its own history to a token budget.
+
+    Turns are sequential: don't call `ask` on one session from several threads or tasks at once.
+    """
+
+    def __init__(self, council: TheJediCouncil, system: Optional[str] = None,
+                 pinned: Optional[List[Dict[str, Any]]] = None, budget_tokens: Optional[int] = None,
+                 reserve_tokens: int = 1024, trim_to: float = 0.6,
+                 summarize: "bool | TheJediCouncil" = False, summary_tokens: int = 300,
+                 mark_prefix: bool = True):
+        """
+        Args:
+            council (TheJediCouncil): The council to converse with.
+            system (str, optional): System prompt; pinned ahead of `pinned`.
+            pinned (List[Dict], optional): Messages sent first on every turn and never trimmed,
+                e.g. instructions or few-shot examples.
+            budget_tokens (int, optional): Prompt plus reply tokens per request. Defaults to
+                SESSION_BUDGETS for the model, else DEFAULT_SESSION_BUDGET.
+            reserve_tokens (int): Room kept for the reply when a call doesn't pass `max_tokens`.
+            trim_to (float): When trimming, drop turns until the prompt fits in this share of the budget.
+            summarize (bool or TheJediCouncil): Fold trimmed turns into a running summary instead of
+                dropping them. Pass a council, e.g. a cheaper model, to have it write the summaries.
+            summary_tokens (int): `max_tokens` for each summary.
+            mark_prefix (bool): Mark the end of the pinned messages as a cacheable prefix (see
+                `CACHE_MARKER`).
+        """
+        if not 0 < trim_to <= 1:
+            raise ValueError("trim_to must be in (0, 1].")
+        self.council = council
+        self.model = council._provider.model
+        self.budget_tokens = budget_tokens or SESSION_BUDGETS.get(self.model, DEFAULT_SESSION_BUDGET)
+        self.reserve_tokens = reserve_tokens
+        self.trim_to = trim_to
+        self.summarizer: Optional[TheJediCouncil] = council if summarize is True else (summarize or None)
+        self.summary_tokens = summary_tokens
+
+        self.pinned: List[Dict[str, Any]] = ([{"role": "system", "content": system}] if system else []) + list(pinned or [])
+        if mark_prefix and self.pinned:
+            self.pinned[-1] = {**self.pinned[-1], CACHE_MARKER: True}
+        self.summary: Optional[Dict[str, Any]] = None
+        self.turns: Deque[Turn] = deque()
+        self.turn_stats: List[TurnStats] = []
+
+        self._pinned_tokens = sum(self._count(m) for m in self.pinned)
+        self._summary_tokens = 0
+        self._turn_tokens = 0  # Sum over self.turns
+        self._history_tokens = 0  # Sum over every turn ever recorded, trimmed ones included
+
+    # --- Conversation ---
+    def ask(self, prompt: "str | Dict[str, Any]", **kwargs) -> CouncilResponse:
+        """
+        Sends `prompt` as the next user turn, with as much history as the budget allows.
+
+        Args:
+            prompt (str or Dict): The user's message, as text or a message dictionary.
+            **kwargs: Passed to `get_wisdom` (e.g. temperature, max_tokens).
+
+        Returns:
+            The CouncilResponse. A successful exchange is added to the history; a failed one is
+            not, so the same prompt can simply be asked again.
+        """
+        message = self._user_message(prompt)
+        new_tokens = self._count(message)
+        dropped = self._trim(new_tokens, kwargs)
+        summarized = False
+        if dropped and self.summarizer is not None:
+            summary = self.summarizer.get_wisdom(self._summary_request(dropped), max_tokens=self.summary_tokens)
+            summarized = self._set_summary(summary)
+        messages, stats = self._request(message, new_tokens, len(dropped), summarized)
+        response = self.council.get_wisdom(messages, **kwargs)
+        self._record(message, new_tokens, response, stats)
+        return response
+
+    async def aask(self, prompt: "str | Dict[str, Any]", **kwargs) -> CouncilResponse:
+        """Async counterpart of `ask`."""
+        message = self._user_message(prompt)
+        new_tokens = self._count(message)
+        dropped = self._trim(new_tokens, kwargs)
+        summarized = False
+        if dropped and self.summarizer is not None:
+            summary = await self.summarizer.aget_wisdom(self._summary_request(dropped), max_tokens=self.summary_tokens)
+            summarized = self._set_summary(summary)
+        messages, stats = self._request(message, new_tokens, len(dropped), summarized)
+        response = await self.council.aget_wisdom(messages, **kwargs)
+        self._record(message, new_tokens, response, stats)
+        return response
+
+    @property
+    def messages(self) -> List[Dict[str, Any]]:
+        """The history the next request will start from: pinned, summary, then the kept turns."""
+        window = list(self.pinned)
+        if self.summary is not None:
+            window.append(self.summary)
+        for turn in self.turns:
+            window.extend(turn.messages)
+        return window
+
+    @property
+    def tokens(self) -> int:
+        """Estimated tokens of `messages`."""
+        return self._pinned_tokens + self._summary_tokens + self._turn_tokens
+
+    @property
+    def total_saved_tokens(self) -> int:
+        return sum(stats.saved_tokens for stats in self.turn_stats)
+
+    # --- Internals ---
+    def _count(self, message: Dict[str, Any]) -> int:
+        return count_message_tokens(message, self.model)
+
+    @staticmethod
+    def _user_message(prompt: "str | Dict[str, Any]") -> Dict[str, Any]:
+        return {"role": "user", "content": prompt} if isinstance(prompt, str) else dict(prompt)
+
+    def _trim(self, new_tokens: int, kwargs: Dict[str, Any]) -> List[Turn]:
+        """Pops the oldest turns if the next request would go over budget, and returns them."""
+        limit = self.budget_tokens - (kwargs.get("max_tokens") or self.reserve_tokens)
+        if self.tokens + new_tokens <= limit:
+            return []
+        target = int(limit * self.trim_to)
+        dropped: List[Turn] = []
+        while self.turns and self.tokens + new_tokens > target:
+            turn = self.turns.popleft()
+            self._turn_tokens -= turn.tokens
+            dropped.append(turn)
+        if self.tokens + new_tokens > limit:
+            logger.warning("Session with %s is over budget even without history: %d tokens for a limit of %d.",
+                           self.model, self.tokens + new_tokens, limit, extra={"model": self.model})
+        return dropped
+
+    def _summary_request(self, dropped: List[Turn]) -> List[Dict[str, str]]:
+        lines = [self.summary["content"][len(SUMMARY_HEADER):]] if self.summary is not None else []
+        for turn in dropped:
+            lines.extend(f"{m['role'].capitalize()}: {m['content']}" for m in turn.messages)
+        return [{"role": "system", "content": SUMMARY_PROMPT}, {"role": "user", "content": "\n".join(lines)}]
+
+    def _set_summary(self, response: CouncilResponse) -> bool:
+        """Replaces the summary with `response`. If the call failed, the turns are simply dropped."""
+        if response.failed:
+            logger.warning("Couldn't summarize the trimmed turns (%s); dropping them.", response.error,
+                           extra={"model": self.model})
+            return False
+        self.summary = {"role": "system", "content": SUMMARY_HEADER + response.text}
+        self._summary_tokens = self._count(self.summary)
+        return True
+
+    def _request(self, message: Dict[str, Any], new_tokens: int, dropped: int,
+                 summarized: bool) -> Tuple[List[Dict[str, Any]], TurnStats]:
+        messages = self.messages
+        messages.append(message)
+        stats = TurnStats(
+            sent_tokens=self.tokens + new_tokens,
+            full_tokens=self._pinned_tokens + self._history_tokens + new_tokens,
+            dropped_turns=dropped,
+            summarized=summarized,
+        )
+        return messages, stats
+
+    def _record(self, message: Dict[str, Any], new_tokens: int, response: CouncilResponse, stats: TurnStats) -> None:
+        if response.failed:
+            return
+        self.turn_stats.append(stats)
+        reply = {"role": "assistant", "content": response.text}
+        turn = Turn(messages=[message, reply], tokens=new_tokens + self._count(reply))
+        self.turns.append(turn)
+        self._turn_tokens += turn.tokens
+        self._history_tokens += turn.tokens
+        logger.debug("Session turn %d with %s: sent %d tokens, saved %d.", len(self.turn_stats), self.model,
+                     stats.sent_tokens, stats.saved_tokens, extra={"model": self.model})
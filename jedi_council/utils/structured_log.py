@@ -0,0 +1,186 @@
+# jedi_council/utils/structured_log.py
+"""
+Non-blocking JSON-lines logging for services embedding the council.
+
+    from jedi_council.utils.structured_log import install_queue_logging
+    logs = install_queue_logging(path="council.jsonl", sample_rate=0.01, per_model={"gpt-4o": 0.1})
+    ...
+    logs.stop()  # Flushes what's queued; also runs at interpreter exit
+
+Calling threads only put the record on a queue. Formatting, JSON encoding and I/O happen on a
+background listener thread. Routine per-call records (the `event` "request" and "response"
+records of successful calls) can be sampled per model. Warnings and errors are always kept.
+Importing this module changes nothing; only `install_queue_logging` touches logging config.
+"""
+
+import sys
+import json
+import queue
+import atexit
+import random
+import logging
+import threading
+import logging.handlers
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, TextIO
+
+# Record events that may be sampled; anything else, and anything at WARNING or above, is always logged.
+SAMPLED_EVENTS = frozenset({"request", "response"})
+
+# Attributes every LogRecord has; anything else on a record came from `extra=` and goes into the JSON.
+_RECORD_ATTRS = frozenset(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime", "taskName"}
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record: time, level, logger, message and any `extra=` fields."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry: Dict[str, Any] = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class SuccessSampler(logging.Filter):
+    """
+    Keeps a share of routine per-call records, per model.
+
+    Args:
+        rate (float): Share of sampled events kept for models not in `per_model`.
+        per_model (Dict[str, float], optional): Rates for specific models.
+        seed (int, optional): Seed the sampling, e.g. in tests.
+    """
+
+    def __init__(self, rate: float = 1.0, per_model: Optional[Dict[str, float]] = None, seed: Optional[int] = None):
+        super().__init__()
+        self.rate = rate
+        self.per_model = dict(per_model or {})
+        self.kept = 0
+        self.dropped = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING or getattr(record, "event", None) not in SAMPLED_EVENTS:
+            return True
+        rate = self.per_model.get(getattr(record, "model", None), self.rate)
+        with self._lock:
+            keep = rate >= 1.0 or self._random.random() < rate
+            if keep:
+                self.kept += 1
+            else:
+                self.dropped += 1
+        return keep
+
+
+class _LazyQueueHandler(logging.handlers.QueueHandler):
+    """
+    Enqueues records unformatted, so the message is built on the listener thread.
+
+    The stock QueueHandler formats each record on the calling thread before queueing it.
+    When the queue is full, DEBUG and INFO records are dropped and counted rather than blocking
+    the caller. Warnings and errors wait for room, so they are never lost.
+    """
+
+    def __init__(self, log_queue: "queue.Queue"):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        if record.levelno >= logging.WARNING:
+            self.queue.put(record)
+            return
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class QueueLogging:
+    """A running queue-logging setup, returned by `install_queue_logging`."""
+
+    def __init__(self, logger: logging.Logger, handler: _LazyQueueHandler, listener: logging.handlers.QueueListener,
+                 sampler: SuccessSampler, propagate: bool):
+        self.logger = logger
+        self.handler = handler
+        self.listener = listener
+        self.sampler = sampler
+        self._propagate = propagate
+        self._stopped = False
+
+    @property
+    def dropped(self) -> int:
+        """Records lost because the queue was full (sampled-out records are counted by `sampler`)."""
+        return self.handler.dropped
+
+    def stop(self) -> None:
+        """Detaches from the logger and flushes everything still queued."""
+        if self._stopped:
+            return
+        self._stopped = True
+        self.logger.removeHandler(self.handler)
+        self.logger.propagate = self._propagate
+        self.listener.stop()
+        for handler in self.listener.handlers:
+            handler.close()
+        atexit.unregister(self.stop)
+
+
+def install_queue_logging(stream: Optional[TextIO] = None, path: Optional[str] = None, level: str = "INFO",
+                          sample_rate: float = 1.0, per_model: Optional[Dict[str, float]] = None,
+                          logger_name: str = "jedi_council", max_queue: int = 10_000,
+                          propagate: bool = False, seed: Optional[int] = None) -> QueueLogging:
+    """
+    Routes `logger_name`'s records through a queue to a background JSON-lines writer.
+
+    Args:
+        stream (TextIO, optional): Write here. Defaults to stderr unless `path` is given.
+        path (str, optional): Append to this file.
+        level (str): Minimum level for `logger_name`.
+        sample_rate (float): Share of successful-call records kept (see SuccessSampler).
+        per_model (Dict[str, float], optional): Per-model sample rates.
+        logger_name (str): The logger to attach to; defaults to the whole package.
+        max_queue (int): Records that can wait for the writer; beyond that, INFO and below are dropped,
+            not blocked on.
+        propagate (bool): Also pass records on to the host application's root handlers.
+        seed (int, optional): Seed for the sampler.
+
+    Returns:
+        A QueueLogging; call `stop()` to flush and detach.
+    """
+    handlers: List[logging.Handler] = []
+    if path is not None:
+        handlers.append(logging.FileHandler(path, encoding="utf-8"))
+    if stream is not None or path is None:
+        handlers.append(logging.StreamHandler(stream or sys.stderr))
+    for handler in handlers:
+        handler.setFormatter(JsonFormatter())
+
+    log_queue: "queue.Queue" = queue.Queue(max_queue)
+    listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    handler = _LazyQueueHandler(log_queue)
+    # Sampling happens before queueing, so sampled-out records cost the caller almost nothing.
+    sampler = SuccessSampler(sample_rate, per_model, seed)
+    handler.addFilter(sampler)
+
+    logger = logging.getLogger(logger_name)
+    previous_propagate = logger.propagate
+    logger.setLevel(level.upper())
+    logger.addHandler(handler)
+    logger.propagate = propagate
+    listener.start()
+
+    logs = QueueLogging(logger, handler, listener, sampler, previous_propagate)
+    atexit.register(logs.stop)
+    return logs
@@ -0,0 +1,47 @@
+# jedi_council/utils/tokens.py
+"""
+Local token counting for budgeting prompts, with no API calls.
+
+With tiktoken installed (`pip install tiktoken`), counts use the model's encoding. Models
+tiktoken doesn't know, such as Claude, Gemini and Mistral, are counted with o200k_base, which
+comes within a few percent. Without tiktoken, counts fall back to ~4 characters per token.
+Encodings are loaded once per model and cached.
+"""
+
+from functools import lru_cache
+from typing import Any, Callable, Dict, Optional
+
+# Per-message overhead of the chat format (role and separators), as OpenAI documents it.
+MESSAGE_OVERHEAD_TOKENS = 4
+
+FALLBACK_ENCODING = "o200k_base"
+
+
+@lru_cache(maxsize=None)
+def get_tokenizer(model: str) -> Optional[Callable[[str], Any]]:
+    """The cached encode function for `model`, or None when tiktoken isn't installed."""
+    try:
+        import tiktoken
+    except ImportError:
+        return None
+    try:
+        encoding = tiktoken.encoding_for_model(model)
+    except KeyError:
+        encoding = tiktoken.get_encoding(FALLBACK_ENCODING)
+    return encoding.encode
+
+
+def count_tokens(text: str, model: str) -> int:
+    encode = get_tokenizer(model)
+    if encode is None:
+        return (len(text) + 3) // 4
+    return len(encode(text, disallowed_special=()))
+
+
+def count_message_tokens(message: Dict[str, Any], model: str) -> int:
+    """Tokens a chat message takes up in a prompt, format overhead included."""
+    content = message.get("content", "")
+    if not isinstance(content, str):
+        # Multi-part content: count the text parts only.
+        content = " ".join(part.get("text", "") for part in content if isinstance(part, dict))
+    return count_tokens(content, model) + MESSAGE_OVERHEAD_TOKENS
@@ -1,14 +1,39 @@
 # Add model cost info per 1K tokens (sample values)
+# Optional "cache_read" / "cache_write" prices apply to prompt tokens served from / written to a provider's prefix cache.
 MODEL_COSTS = {
-    "gpt-4o": {"prompt": 0.005, "completion": 0.015},
+    "gpt-4o": {"prompt": 0.005, "completion": 0.015, "cache_read": 0.0025},
     "gpt-3.5-turbo": {"prompt": 0.001, "completion": 0.002},
-    "claude-3-haiku-20240307": {"prompt": 0.00025, "completion": 0.00125},
+    "claude-3-haiku-20240307": {"prompt": 0.00025, "completion": 0.00125, "cache_read": 0.00003, "cache_write": 0.0003},
     "mistral-7b": {"prompt": 0.0002, "completion": 0.0006},
     "models/gemini-1.5-pro": {"prompt": 0.000125, "completion": 0.000375},
 }
 
-def estimate_cost(model: str, input_tokens: int, output_tokens: int) -> float:
+# OpenAI and Anthropic bill their asynchronous batch endpoints at half the synchronous rate.
+BATCH_DISCOUNT = 0.5
+
+# Defaults for models without explicit cache prices, as multiples of the prompt price.
+CACHE_READ_MULTIPLIER = 0.5
+CACHE_WRITE_MULTIPLIER = 1.0
+
+def estimate_cost(model: str, input_tokens: int, output_tokens: int, batch: bool = False,
+                  cache_read_tokens: int = 0, cache_write_tokens: int = 0) -> float:
+    """
+    Estimated dollar cost of a call. `input_tokens` is the whole prompt; the cache read and write
+    tokens are the parts of it that hit or were written to the provider's prefix cache.
+    """
     cost = MODEL_COSTS.get(model)
     if not cost:
         return 0.0
-    return round((input_tokens / 1000) * cost["prompt"] + (output_tokens / 1000) * cost["completion"], 6)
\ No newline at end of file
+    uncached = max(0, input_tokens - cache_read_tokens - cache_write_tokens)
+    total = ((uncached / 1000) * cost["prompt"]
+             + (cache_read_tokens / 1000) * cost.get("cache_read", cost["prompt"] * CACHE_READ_MULTIPLIER)
+             + (cache_write_tokens / 1000) * cost.get("cache_write", cost["prompt"] * CACHE_WRITE_MULTIPLIER)
+             + (output_tokens / 1000) * cost["completion"])
+    if batch:
+        total *= BATCH_DISCOUNT
+    return round(total, 6)
+
+def estimate_request_tokens(messages: list, max_tokens: int = 0) -> int:
+    """Rough token footprint of a request for rate limiting: ~4 characters per token, plus max_tokens."""
+    chars = sum(len(str(m.get("content", ""))) for m in messages)
+    return chars // 4 + 4 * len(messages) + max_tokens
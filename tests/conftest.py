@@ -0,0 +1,17 @@
+import pytest
+
+from jedi_council.hooks import reset_hooks
+from jedi_council.ratelimit import reset_rate_limiters
+from jedi_council.retry import reset_circuit_breakers
+
+
+@pytest.fixture(autouse=True)
+def _fresh_provider_state():
+    # Limiters, circuit breakers and hooks are process-wide; don't let one test's state leak into the next.
+    reset_rate_limiters()
+    reset_circuit_breakers()
+    reset_hooks()
+    yield
+    reset_rate_limiters()
+    reset_circuit_breakers()
+    reset_hooks()
@@ -0,0 +1,37 @@
+import asyncio
+
+from jedi_council.core import TheJediCouncil, ERROR_COUNCIL_RESPONSE
+
+
+def test_aget_wisdom_uses_async_client(mocker):
+    mock_response = mocker.MagicMock()
+    mock_response.choices[0].message.content = "Async wisdom"
+    mock_response.usage.prompt_tokens = 7
+    mock_response.usage.completion_tokens = 11
+
+    council = TheJediCouncil(model="gpt-4o")
+    create = mocker.AsyncMock(return_value=mock_response)
+    # Async clients are created per event loop, so patch the SDK method rather than one instance.
+    mocker.patch("openai.resources.chat.completions.AsyncCompletions.create", create)
+
+    response = asyncio.run(council.aget_wisdom("Test message"))
+
+    assert response.text == "Async wisdom"
+    assert response.usage.input_tokens == 7
+    assert response.usage.output_tokens == 11
+    create.assert_awaited_once()
+    assert create.await_args.kwargs["messages"] == [{"role": "user", "content": "Test message"}]
+
+
+def test_async_retry_awaits_backoff(mocker):
+    council = TheJediCouncil(model="gpt-4o", max_retry=2)
+    mocker.patch("openai.resources.chat.completions.AsyncCompletions.create",
+                 mocker.AsyncMock(side_effect=RuntimeError("boom")))
+    sleep = mocker.patch("jedi_council.core.asyncio.sleep", mocker.AsyncMock())
+
+    response = asyncio.run(council.aget_wisdom("Test message"))
+
+    assert response.text == ERROR_COUNCIL_RESPONSE
+    assert response.attempts == 2
+    # One jittered backoff between the two attempts, drawn from [0, base_delay].
+    assert len(sleep.await_args_list) == 1 and 0 <= sleep.await_args.args[0] <= 1.0
@@ -0,0 +1,157 @@
+import json
+import threading
+from email.parser import BytesParser
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from jedi_council.core import TheJediCouncil
+from jedi_council.batch import BatchRequest, BatchJob, BatchSubmitError, chunk_entries
+from jedi_council.cli import main
+from jedi_council.clients import client_registry
+from jedi_council.utils.utils import estimate_cost
+
+
+class _BatchStandIn(BaseHTTPRequestHandler):
+    """A local stand-in for the OpenAI Batch and Anthropic Message Batches endpoints."""
+    protocol_version = "HTTP/1.1"
+    files, batches = {}, {}
+    end_status, answered = "completed", None  # How OpenAI batches end, and how many lines get an output
+
+    def _reply(self, payload, content_type="application/json"):
+        body = payload if isinstance(payload, bytes) else json.dumps(payload).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _body(self):
+        return self.rfile.read(int(self.headers["Content-Length"]))
+
+    def do_POST(self):
+        host = f"http://{self.headers['Host']}"
+        if self.path == "/v1/files":
+            head = f"Content-Type: {self.headers['Content-Type']}\r\n\r\n".encode()
+            upload = BytesParser().parsebytes(head + self._body())
+            content = next(p.get_payload(decode=True) for p in upload.get_payload() if p.get_filename())
+            file_id = f"file-{len(self.files)}"
+            self.files[file_id] = content
+            self._reply({"id": file_id, "object": "file", "bytes": len(content), "created_at": 0,
+                         "filename": "batch.jsonl", "purpose": "batch", "status": "processed"})
+        elif self.path == "/v1/batches":
+            request = json.loads(self._body())
+            lines = [json.loads(l) for l in self.files[request["input_file_id"]].splitlines()]
+            output = "\n".join(json.dumps({
+                "custom_id": line["custom_id"],
+                "response": {"status_code": 200, "body": {
+                    "choices": [{"message": {"content": f"echo {line['body']['messages'][-1]['content']}"}}],
+                    "usage": {"prompt_tokens": 1000, "completion_tokens": 1000}}},
+                "error": None,
+            }) for line in lines[:self.answered])
+            output_id = f"file-{len(self.files)}"
+            self.files[output_id] = output.encode()
+            batch_id = f"batch_{len(self.batches)}"
+            self.batches[batch_id] = {"id": batch_id, "object": "batch", "endpoint": "/v1/chat/completions",
+                                      "input_file_id": request["input_file_id"], "completion_window": "24h",
+                                      "created_at": 0, "status": "in_progress", "output_file_id": output_id}
+            self._reply(self.batches[batch_id])
+        elif self.path == "/v1/messages/batches":
+            requests = json.loads(self._body())["requests"]
+            batch_id = f"msgbatch_{len(self.batches)}"
+            self.files[batch_id] = "\n".join(json.dumps({"custom_id": r["custom_id"], "result": {
+                "type": "succeeded", "message": {
+                    "id": "msg", "type": "message", "role": "assistant", "model": r["params"]["model"],
+                    "content": [{"type": "text", "text": f"echo {r['params']['messages'][-1]['content']}"}],
+                    "stop_reason": "end_turn", "usage": {"input_tokens": 10, "output_tokens": 20}}}})
+                for r in requests).encode()
+            self.batches[batch_id] = {"id": batch_id, "type": "message_batch", "processing_status": "in_progress",
+                                      "results_url": f"{host}/v1/messages/batches/{batch_id}/results"}
+            self._reply(self.batches[batch_id])
+
+    def do_GET(self):
+        parts = self.path.strip("/").split("/")
+        if parts[:2] == ["v1", "files"]:
+            self._reply(self.files[parts[2]], "application/octet-stream")
+        elif parts[-1] == "results":
+            self._reply(self.files[parts[-2]], "application/binary")
+        else:
+            batch = self.batches[parts[-1]]
+            # Each batch reports "in progress" once before finishing, to exercise polling.
+            reply = dict(batch)
+            batch["status"] = self.end_status
+            batch["processing_status"] = "ended"
+            self._reply(reply)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def base_url():
+    _BatchStandIn.files, _BatchStandIn.batches = {}, {}
+    _BatchStandIn.end_status, _BatchStandIn.answered = "completed", None
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _BatchStandIn)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    client_registry.clear()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    client_registry.clear()
+
+
+def test_chunk_entries_respects_count_and_size_limits():
+    entries = [{"custom_id": str(i), "body": "x" * 10} for i in range(5)]
+    assert [len(c) for c in chunk_entries(entries, max_requests=2, max_bytes=10_000)] == [2, 2, 1]
+    assert [len(c) for c in chunk_entries(entries, max_requests=100, max_bytes=90)] == [2, 2, 1]
+
+
+def test_openai_batch_round_trip(base_url, mocker):
+    council = TheJediCouncil(model="gpt-4o", base_url=f"{base_url}/v1")
+    mocker.patch.object(council._provider, "batch_max_requests", 2)
+    requests = [BatchRequest(custom_id=f"q-{i}", messages=[{"role": "user", "content": f"prompt {i}"}]) for i in range(3)]
+
+    job = council.submit_batch(requests)
+    assert len(job.batch_ids) == 2 and job.request_count == 3
+
+    responses = list(council.collect_batch(BatchJob.from_json(job.to_json()), poll_interval=0))
+    assert [(r.request_id, r.text) for r in responses] == [("q-0", "echo prompt 0"), ("q-1", "echo prompt 1"),
+                                                          ("q-2", "echo prompt 2")]
+    assert responses[0].usage.cost == estimate_cost("gpt-4o", 1000, 1000) / 2
+
+
+def test_expired_batch_reports_unanswered_requests(base_url):
+    _BatchStandIn.end_status, _BatchStandIn.answered = "expired", 1
+    council = TheJediCouncil(model="gpt-4o", base_url=f"{base_url}/v1")
+    requests = [BatchRequest(custom_id=f"q-{i}", messages=[{"role": "user", "content": f"prompt {i}"}]) for i in range(3)]
+
+    responses = list(council.collect_batch(council.submit_batch(requests), poll_interval=0))
+
+    assert [(r.request_id, r.failed) for r in responses] == [("q-0", False), ("q-1", True), ("q-2", True)]
+    assert responses[1].raw_response["error"]["code"] == "batch_expired"
+
+
+def test_partial_submit_keeps_the_submitted_batches(mocker):
+    council = TheJediCouncil(model="gpt-4o")
+    mocker.patch.object(council._provider, "batch_max_requests", 2)
+    mocker.patch.object(council._provider, "submit_batch", side_effect=["batch_0", RuntimeError("file too large")])
+    requests = [BatchRequest(custom_id=f"q-{i}", messages=[{"role": "user", "content": f"prompt {i}"}]) for i in range(3)]
+
+    with pytest.raises(BatchSubmitError, match="file too large") as raised:
+        council.submit_batch(requests)
+    assert raised.value.job.batch_ids == ["batch_0"] and raised.value.job.request_count == 2
+
+
+def test_cli_batch_with_anthropic(base_url, tmp_path, monkeypatch):
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "test")
+    prompts = tmp_path / "requests.jsonl"
+    prompts.write_text('{"request_id": "user-001", "title": "Hi", "body": "there"}\n{"prompt": "second"}\n')
+    job, results = tmp_path / "job.json", tmp_path / "results.jsonl"
+
+    assert main(["batch", "submit", "--model", "claude-3-haiku-20240307", "--input", str(prompts),
+                 "--job", str(job), "--base-url", base_url]) == 0
+    assert main(["batch", "collect", "--job", str(job), "--output", str(results),
+                 "--poll-interval", "0", "--base-url", base_url]) == 0
+
+    records = [json.loads(line) for line in results.read_text().splitlines()]
+    assert [(r["request_id"], r["text"]) for r in records] == [("user-001", "echo Hi\n\nthere"), ("request-1", "echo second")]
+    assert records[0]["output_tokens"] == 20
@@ -0,0 +1,50 @@
+from jedi_council.core import TheJediCouncil, CouncilResponse, UsageInfo, ERROR_COUNCIL_RESPONSE
+from jedi_council.cache import ResponseCache, request_key
+
+
+def _response(text="Cached wisdom"):
+    return CouncilResponse(text=text, model="gpt-4o", usage=UsageInfo(3, 5, 0.001), latency_ms=900, raw_response=None)
+
+
+def test_request_key_is_canonical():
+    messages = [{"role": "user", "content": "hi"}]
+    assert request_key("gpt-4o", messages, {"temperature": 0, "max_tokens": 5}) == \
+        request_key("gpt-4o", messages, {"max_tokens": 5, "temperature": 0})
+    assert request_key("gpt-4o", messages, {}) != request_key("gpt-4o-mini", messages, {})
+
+
+def test_get_wisdom_serves_repeats_from_cache(mocker):
+    generate = mocker.patch("jedi_council.core._OpenAIProvider.generate", return_value=_response())
+    cache = ResponseCache()
+    council = TheJediCouncil(model="gpt-4o", cache=cache)
+
+    first = council.get_wisdom("Test message", temperature=0)
+    second = council.get_wisdom("Test message", temperature=0)
+
+    assert generate.call_count == 1
+    assert not first.cached
+    assert second.cached and second.text == "Cached wisdom"
+    assert second.latency_ms < 900
+    assert cache.stats.memory_hits == 1 and cache.stats.misses == 1
+
+
+def test_disk_tier_persists_and_evicts(tmp_path):
+    path = str(tmp_path / "cache.db")
+    cache = ResponseCache(path=path, max_disk_entries=2)
+    for i in range(3):
+        cache.put(f"key-{i}", _response(f"wisdom {i}"))
+    cache.put("failed", _response(ERROR_COUNCIL_RESPONSE))
+
+    reopened = ResponseCache(path=path)
+    assert len(reopened.disk) == 2
+    assert reopened.get("key-0") is None
+    assert reopened.get("key-2").text == "wisdom 2"
+    assert reopened.get("failed") is None
+    assert reopened.stats.disk_hits == 1 and reopened.stats.misses == 2
+
+
+def test_ttl_expires_entries(tmp_path, mocker):
+    cache = ResponseCache(path=str(tmp_path / "cache.db"), ttl_s=60)
+    cache.put("key", _response())
+    mocker.patch("jedi_council.cache.time.time", return_value=10 ** 12)
+    assert cache.get("key") is None
@@ -0,0 +1,78 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from jedi_council.core import TheJediCouncil
+from jedi_council.clients import client_registry, PoolConfig
+
+
+class _ChatHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, so connections can be reused
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers["Content-Length"]))
+        body = json.dumps({
+            "id": "chatcmpl-1", "object": "chat.completion", "created": 0, "model": "gpt-4o",
+            "choices": [{"index": 0, "finish_reason": "stop",
+                         "message": {"role": "assistant", "content": "Pooled wisdom"}}],
+            "usage": {"prompt_tokens": 3, "completion_tokens": 2, "total_tokens": 5},
+        }).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def base_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _ChatHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    client_registry.clear()
+    yield f"http://127.0.0.1:{server.server_address[1]}/v1"
+    server.shutdown()
+    client_registry.clear()
+
+
+def test_councils_share_client_and_warm_connections(base_url):
+    first = TheJediCouncil(model="gpt-4o", base_url=base_url)
+    second = TheJediCouncil(model="gpt-4o", base_url=base_url)
+    assert first._provider.client is second._provider.client
+
+    assert first.get_wisdom("Hello").text == "Pooled wisdom"
+    assert second.get_wisdom("Hello again").text == "Pooled wisdom"
+
+    stats = client_registry.stats("openai")
+    assert stats.clients_created == 1 and stats.client_hits == 1
+    assert stats.requests == 2
+    assert stats.connections_opened == 1 and stats.connections_reused == 1
+
+
+def test_pool_settings_are_part_of_the_key(base_url):
+    default = TheJediCouncil(model="gpt-4o", base_url=base_url)
+    tuned = TheJediCouncil(model="gpt-4o", base_url=base_url, pool=PoolConfig(max_connections=5, timeout=5.0))
+    assert default._provider.client is not tuned._provider.client
+    assert tuned._provider.client.timeout.read == 5.0
+
+
+def test_a_second_gemini_key_is_warned_about(monkeypatch, caplog):
+    from jedi_council.providers import gemini_provider
+
+    configure = []
+    monkeypatch.setattr(gemini_provider.genai, "configure", lambda api_key: configure.append(api_key))
+    monkeypatch.setattr(gemini_provider, "_configured_key", None)
+    client_registry.clear()
+    try:
+        for key in ("key-a", "key-a", "key-b"):
+            monkeypatch.setenv("GEMINI_API_KEY", key)
+            TheJediCouncil(model="gemini-1.5-pro")
+    finally:
+        client_registry.clear()
+
+    assert configure == ["key-a", "key-b"]  # Once per key
+    assert [r.message for r in caplog.records if "different API key" in r.message]
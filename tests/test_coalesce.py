@@ -0,0 +1,110 @@
+import time
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from jedi_council.core import TheJediCouncil, CouncilResponse, UsageInfo
+from jedi_council.coalesce import SingleFlight
+
+
+def _response(text="Shared wisdom"):
+    return CouncilResponse(text=text, model="gpt-4o", usage=UsageInfo(3, 5), latency_ms=50, raw_response=None)
+
+
+def test_concurrent_threads_share_one_call(mocker):
+    release = threading.Event()
+
+    def slow_generate(messages, **kwargs):
+        release.wait(5)
+        return _response()
+
+    generate = mocker.patch("jedi_council.core._OpenAIProvider.generate", side_effect=slow_generate)
+    council = TheJediCouncil(model="gpt-4o", coalesce=True)
+    flight = council.single_flight
+
+    def ask():
+        return council.get_wisdom("Same question", temperature=0)
+
+    with ThreadPoolExecutor(max_workers=5) as pool:
+        futures = [pool.submit(ask) for _ in range(5)]
+        while flight.stats.calls < 5:
+            time.sleep(0.001)
+        release.set()
+        responses = [f.result() for f in futures]
+
+    assert generate.call_count == 1
+    assert all(r is responses[0] for r in responses)
+    assert flight.stats.leaders == 1 and flight.stats.coalesced == 4
+    assert flight.in_flight == 0
+
+    # Different params are a different request.
+    council.get_wisdom("Same question", temperature=1)
+    assert generate.call_count == 2
+
+
+def test_thread_errors_reach_every_waiter():
+    flight = SingleFlight()
+    started, release = threading.Event(), threading.Event()
+
+    def boom():
+        started.set()
+        release.wait(5)
+        raise ValueError("upstream broke")
+
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        leader = pool.submit(flight.do, "k", boom)
+        started.wait(5)
+        waiters = [pool.submit(flight.do, "k", boom) for _ in range(2)]
+        while flight.stats.coalesced < 2:
+            time.sleep(0.001)
+        release.set()
+        for future in [leader, *waiters]:
+            with pytest.raises(ValueError, match="upstream broke"):
+                future.result()
+
+    # The failed flight is forgotten, so the next call goes upstream again.
+    assert flight.do("k", lambda: "recovered") == "recovered"
+    assert flight.stats.leaders == 2
+
+
+def test_async_calls_share_one_task(mocker):
+    calls = 0
+
+    async def agenerate(messages, **kwargs):
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return _response()
+
+    mocker.patch("jedi_council.core._OpenAIProvider.agenerate", side_effect=agenerate)
+    council = TheJediCouncil(model="gpt-4o", coalesce=SingleFlight())
+
+    async def main():
+        return await asyncio.gather(*(council.aget_wisdom("Same question") for _ in range(10)))
+
+    responses = asyncio.run(main())
+    assert calls == 1
+    assert all(r is responses[0] for r in responses)
+    assert council.single_flight.stats.coalesced == 9
+
+
+def test_async_cancelled_caller_does_not_cancel_the_flight():
+    flight = SingleFlight()
+
+    async def upstream():
+        await asyncio.sleep(0.05)
+        raise RuntimeError("late failure")
+
+    async def main():
+        first = asyncio.create_task(flight.ado("k", upstream))
+        second = asyncio.create_task(flight.ado("k", upstream))
+        await asyncio.sleep(0)
+        first.cancel()
+        with pytest.raises(RuntimeError, match="late failure"):
+            await second
+        assert first.cancelled()
+
+    asyncio.run(main())
+    assert flight.in_flight == 0
@@ -0,0 +1,76 @@
+import dataclasses
+
+import pytest
+from openai.types.chat import ChatCompletion
+
+from jedi_council.core import TheJediCouncil, CouncilResponse, UsageInfo, RawJSON, ERROR_COUNCIL_RESPONSE
+from jedi_council.columnar import ResponseBatch
+from jedi_council.retry import CouncilError, ErrorKind
+
+COMPLETION = {
+    "id": "chatcmpl-1", "object": "chat.completion", "created": 0, "model": "gpt-4o",
+    "choices": [{"index": 0, "finish_reason": "stop", "message": {"role": "assistant", "content": "Lean wisdom"}}],
+    "usage": {"prompt_tokens": 3, "completion_tokens": 2, "total_tokens": 5},
+}
+
+
+def _council(mocker, raw_response):
+    council = TheJediCouncil(model="gpt-4o", raw_response=raw_response)
+    mocker.patch.object(council._provider.client.chat.completions, "create",
+                        return_value=ChatCompletion.model_validate(COMPLETION))
+    return council
+
+
+def test_raw_response_modes(mocker):
+    assert isinstance(_council(mocker, "keep").get_wisdom("Hi").raw_response, ChatCompletion)
+    assert _council(mocker, "drop").get_wisdom("Hi").raw_response is None
+    assert _council(mocker, "on_error").get_wisdom("Hi").raw_response is None
+
+    raw = _council(mocker, "json").get_wisdom("Hi").raw_response
+    assert isinstance(raw, RawJSON)
+    assert raw.decode()["choices"][0]["message"]["content"] == "Lean wisdom"
+
+    with pytest.raises(ValueError, match="raw_response"):
+        TheJediCouncil(model="gpt-4o", raw_response="sometimes")
+
+
+def test_responses_have_no_instance_dict():
+    usage = UsageInfo(3, 2, 0.01)
+    response = CouncilResponse(text="t", model="gpt-4o", usage=usage, latency_ms=1.0, raw_response=None)
+    assert not hasattr(response, "__dict__") and not hasattr(usage, "__dict__")
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        usage.cost = 0
+
+
+def test_response_batch_round_trips():
+    error = CouncilError(ErrorKind.RATE_LIMITED, "slow down")
+    responses = [
+        CouncilResponse(text="Ünïcode wisdom", model="gpt-4o", usage=UsageInfo(10, 4, 0.002, cache_read_tokens=6),
+                        latency_ms=120.5, raw_response=object(), ttft_ms=40.0, request_id="task-1"),
+        CouncilResponse(text=ERROR_COUNCIL_RESPONSE, model="claude-3-haiku-20240307", usage=UsageInfo(0, 0, None),
+                        latency_ms=900.0, raw_response=None, error=error, attempts=3),
+        CouncilResponse(text="", model="gpt-4o", usage=UsageInfo(1, 0, 0.001), latency_ms=5.0, raw_response=None,
+                        cached=True),
+    ]
+    batch = ResponseBatch.from_responses(responses)
+
+    assert len(batch) == 3
+    assert batch.text(-1) == "" and batch.model(1) == "claude-3-haiku-20240307"
+    assert batch.total_cost == pytest.approx(0.003)
+    assert list(batch.column("failed")) == [0, 1, 0]
+
+    first, failed, cached = batch
+    assert first == dataclasses.replace(responses[0], raw_response=None)
+    assert failed.error is error and failed.failed and failed.usage.cost is None and failed.attempts == 3
+    assert cached.cached and cached.ttft_ms is None
+
+    columns = batch.to_columns()
+    assert columns["request_id"] == ["task-1", None, None]
+    assert columns["error_kind"] == [None, "rate_limited", None]
+    with pytest.raises(IndexError):
+        batch[3]
+
+    # Content-less replies (e.g. tool calls) come back with text=None.
+    batch.append(CouncilResponse(text=None, model="gpt-4o", usage=UsageInfo(5, 3, 0.001), latency_ms=80.0,
+                                 raw_response=None))
+    assert batch.text(3) == ""
@@ -0,0 +1,68 @@
+import random
+
+import pytest
+
+from jedi_council.cli import main
+from jedi_council.compare import bootstrap_change, compare_runs, percentile
+from jedi_council.results import ResultStore
+
+TASKS = ["Summarization", "Code Generation"]
+
+
+def _record(store, run_id, latency, tokens_per_sec=50.0, trials=10, seed=0):
+    """Stores `trials` results per task and model; `latency` maps model -> median latency in ms."""
+    rng = random.Random(seed)
+    store.start_run(run_id)
+    for model, median in latency.items():
+        for task_index, task in enumerate(TASKS):
+            for trial in range(trials):
+                store.append({"run_id": run_id, "task_name": task, "model": model, "trial": trial,
+                              "latency_ms": median * (1 + task_index) * rng.uniform(0.9, 1.1),
+                              "tokens_per_sec": tokens_per_sec * rng.uniform(0.9, 1.1),
+                              "cost": 0.001, "cached": False, "error": None})
+    store.finish_run(run_id)
+
+
+@pytest.fixture
+def history(tmp_path):
+    path = str(tmp_path / "results.sqlite")
+    store = ResultStore(path)
+    _record(store, "base", {"gpt-4o": 400, "claude-3-haiku-20240307": 300}, seed=1)
+    _record(store, "same", {"gpt-4o": 400, "claude-3-haiku-20240307": 300}, seed=2)
+    _record(store, "slow", {"gpt-4o": 560, "claude-3-haiku-20240307": 300}, seed=3)
+    return path, store
+
+
+def test_regressions_are_flagged_per_model(history):
+    _, store = history
+    verdicts = {(c.model, c.metric): c for c in compare_runs(store, "base", "slow")}
+
+    slow = verdicts[("gpt-4o", "latency_p50")]
+    assert slow.regressed and 0.3 < slow.change < 0.5 and slow.ci[0] > 0.05
+    assert not verdicts[("claude-3-haiku-20240307", "latency_p50")].regressed
+    assert verdicts[("gpt-4o", "cost")].verdict == "no significant change"
+    assert not any(c.regressed for c in compare_runs(store, "base", "same"))
+
+    few = compare_runs(store, "base", "slow", metrics=["latency_p95"], min_samples=50)
+    assert {c.verdict for c in few} == {"insufficient data"}
+    with pytest.raises(ValueError, match="No run"):
+        compare_runs(store, "base", "missing")
+
+
+def test_bootstrap_keeps_the_task_mix():
+    # Fast and slow tasks: pooled resampling would swing the median; stratified resampling doesn't.
+    baseline = {"fast": [10.0] * 20, "slow": [1000.0] * 20}
+    change, (low, high) = bootstrap_change(baseline, baseline, lambda v: percentile(v, 50), rng=random.Random(0))
+    assert change == 0 and low == high == 0
+    assert percentile([1, 2, 3, 4], 50) == 2.5
+
+
+def test_compare_command_exit_codes(history, capsys):
+    path, _ = history
+    assert main(["compare", "--results", path, "--baseline", "base", "--candidate", "same"]) == 0
+    assert main(["compare", "--results", path, "--baseline", "base"]) == 1  # "slow" is the latest run
+    out = capsys.readouterr().out
+    assert "2 regression(s)." in out  # gpt-4o latency p50 and p95
+    assert main(["compare", "--results", path, "--baseline", "nope"]) == 2
+    assert main(["compare", "--results", path, "--list"]) == 0
+    assert "slow" in capsys.readouterr().out
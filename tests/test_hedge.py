@@ -0,0 +1,99 @@
+import asyncio
+
+import pytest
+
+from jedi_council.core import CouncilResponse, UsageInfo, ERROR_COUNCIL_RESPONSE
+from jedi_council.hedge import HedgedCouncil
+from jedi_council.retry import CouncilError, ErrorKind
+
+
+def _replier(model, delay_s, text="wisdom", cost=0.01, calls=None):
+    async def aget_wisdom(prompt, **kwargs):
+        if calls is not None:
+            calls.append(model)
+        await asyncio.sleep(delay_s)
+        if text is None:
+            return CouncilResponse(text=ERROR_COUNCIL_RESPONSE, model=model, usage=UsageInfo(0, 0), latency_ms=0,
+                                   raw_response=None, error=CouncilError(ErrorKind.FATAL, "nope"))
+        return CouncilResponse(text=text, model=model, usage=UsageInfo(10, 10, cost), latency_ms=delay_s * 1000,
+                               raw_response=None)
+    return aget_wisdom
+
+
+def _hedged(mocker, replies, **kwargs):
+    mocker.patch.dict("os.environ", {"ANTHROPIC_API_KEY": "test"})
+    council = HedgedCouncil("gpt-4o", ["claude-3-haiku-20240307"], **kwargs)
+    cancelled = []
+    for model, reply in zip(council.models, replies):
+        async def guarded(prompt, _reply=reply, _model=model, **kw):
+            try:
+                return await _reply(prompt, **kw)
+            except asyncio.CancelledError:
+                cancelled.append(_model)
+                raise
+        council.councils[model].aget_wisdom = guarded
+    return council, cancelled
+
+
+def test_fast_primary_never_hedges(mocker):
+    calls = []
+    council, _ = _hedged(mocker, [_replier("gpt-4o", 0.01, calls=calls),
+                                  _replier("claude-3-haiku-20240307", 0.01, calls=calls)], hedge_delay_ms=200)
+
+    response = council.get_wisdom("Test message")
+
+    assert response.model == "gpt-4o"
+    assert response.hedge.launched == ["gpt-4o"] and response.hedge.hedge_cost == 0
+    assert calls == ["gpt-4o"]
+
+
+def test_slow_primary_is_hedged_and_cancelled(mocker):
+    council, cancelled = _hedged(mocker, [_replier("gpt-4o", 5), _replier("claude-3-haiku-20240307", 0.01)],
+                                 hedge_delay_ms=20)
+
+    response = council.get_wisdom("Test message")
+
+    assert response.hedge.winner == "claude-3-haiku-20240307"
+    assert response.hedge.launched == ["gpt-4o", "claude-3-haiku-20240307"]
+    assert cancelled == ["gpt-4o"]
+    assert response.hedge.hedge_cost > 0  # the cancelled primary's estimated prompt cost
+
+
+def test_failed_primary_falls_back_without_waiting(mocker):
+    council, _ = _hedged(mocker, [_replier("gpt-4o", 0, text=None), _replier("claude-3-haiku-20240307", 0)],
+                         hedge_delay_ms=10_000)
+
+    response = asyncio.run(asyncio.wait_for(council.aget_wisdom("Test message"), timeout=2))
+
+    assert response.model == "claude-3-haiku-20240307" and not response.failed
+
+
+def test_hedge_delay_is_learned_from_primary_latency(mocker):
+    council, _ = _hedged(mocker, [_replier("gpt-4o", 0), _replier("claude-3-haiku-20240307", 0)],
+                         hedge_percentile=90, min_samples=10, initial_delay_ms=1234)
+    assert council.current_delay_ms == 1234
+
+    for latency in range(1, 101):
+        council.record_latency(latency)
+    assert council.current_delay_ms == 90  # Nearest rank: 90 of the 100 samples are <= 90
+
+
+def test_sync_calls_share_one_event_loop(mocker):
+    loops = []
+
+    async def aget_wisdom(prompt, **kwargs):
+        loops.append(asyncio.get_running_loop())
+        return await _replier("gpt-4o", 0)(prompt)
+
+    council, _ = _hedged(mocker, [aget_wisdom, _replier("claude-3-haiku-20240307", 0)], hedge_delay_ms=1000)
+    council.get_wisdom("Test message")
+    council.get_wisdom("Test message")
+
+    assert len(loops) == 2 and loops[0] is loops[1] and loops[0].is_running()
+
+
+def test_models_must_be_distinct():
+    with pytest.raises(ValueError, match="distinct"):
+        HedgedCouncil("gpt-4o", ["gpt-4o"])
+    with pytest.raises(ValueError, match="at least one backup"):
+        HedgedCouncil("gpt-4o", [])
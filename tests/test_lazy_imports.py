@@ -0,0 +1,26 @@
+import sys
+import json
+import subprocess
+
+SDKS = ["openai", "anthropic", "google.generativeai", "mistralai"]
+
+PROBE = f"""
+import sys, json, logging
+import jedi_council.core as core
+after_import = [m for m in {SDKS!r} if m in sys.modules]
+root_handlers = len(logging.getLogger().handlers)
+core.TheJediCouncil(model="gpt-4o")
+print(json.dumps({{"after_import": after_import, "root_handlers": root_handlers,
+                  "after_construct": [m for m in {SDKS!r} if m in sys.modules]}}))
+"""
+
+
+def test_providers_load_lazily_without_import_side_effects():
+    out = subprocess.run([sys.executable, "-W", "ignore", "-c", PROBE],
+                         capture_output=True, text=True, check=True,
+                         env={"OPENAI_API_KEY": "test", "PATH": ""})
+    result = json.loads(out.stdout.strip().splitlines()[-1])
+
+    assert result["after_import"] == []
+    assert result["root_handlers"] == 0
+    assert result["after_construct"] == ["openai"]
@@ -1,7 +1,76 @@
+import io
+import json
+import queue
 import logging
+import threading
+
+from jedi_council.utils.structured_log import _LazyQueueHandler, install_queue_logging
+
 
 def test_logging_structure(caplog):
     logger = logging.getLogger("jedi_council.core")
     with caplog.at_level(logging.INFO):
         logger.info("Testing log output")
     assert any("Testing log output" in message for message in caplog.messages)
+
+
+class _ThreadRecorder:
+    """A log argument that records which thread formatted it."""
+
+    def __init__(self):
+        self.formatted_on = None
+
+    def __str__(self):
+        self.formatted_on = threading.current_thread().name
+        return "recorded"
+
+
+def test_queue_logging_writes_json_off_the_calling_thread():
+    package_logger = logging.getLogger("jedi_council")
+    handlers_before = list(package_logger.handlers)
+    stream = io.StringIO()
+    logs = install_queue_logging(stream=stream)
+    argument = _ThreadRecorder()
+
+    logging.getLogger("jedi_council.providers.openai_provider").info(
+        "Received wisdom from %s in %.0fms (%s).", "gpt-4o", 812.4, argument,
+        extra={"event": "response", "model": "gpt-4o", "latency_ms": 812.4})
+    logs.stop()
+
+    (line,) = stream.getvalue().splitlines()
+    entry = json.loads(line)
+    assert entry["message"] == "Received wisdom from gpt-4o in 812ms (recorded)."
+    assert entry["level"] == "INFO" and entry["model"] == "gpt-4o" and entry["latency_ms"] == 812.4
+    assert argument.formatted_on != threading.current_thread().name
+    assert package_logger.handlers == handlers_before
+
+
+def test_sampling_drops_successes_but_never_errors():
+    stream = io.StringIO()
+    logs = install_queue_logging(stream=stream, sample_rate=0.0, per_model={"claude-3-haiku-20240307": 1.0})
+    log = logging.getLogger("jedi_council.core")
+
+    for _ in range(50):
+        log.info("ok", extra={"event": "response", "model": "gpt-4o"})
+    log.info("ok", extra={"event": "response", "model": "claude-3-haiku-20240307"})
+    log.error("gpt-4o failed", extra={"event": "error", "model": "gpt-4o"})
+    log.info("Convening The Jedi Council")  # Not a per-call event, so never sampled
+    logs.stop()
+
+    messages = [json.loads(line)["message"] for line in stream.getvalue().splitlines()]
+    assert messages == ["ok", "gpt-4o failed", "Convening The Jedi Council"]
+    assert logs.sampler.dropped == 50 and logs.sampler.kept == 1
+
+
+def test_full_queue_drops_info_but_waits_for_warnings():
+    log_queue = queue.Queue(1)
+    handler = _LazyQueueHandler(log_queue)
+    record = lambda level, msg: logging.LogRecord("jedi_council", level, __file__, 1, msg, (), None)
+
+    handler.emit(record(logging.INFO, "first"))
+    handler.emit(record(logging.INFO, "dropped"))
+    assert handler.dropped == 1
+
+    threading.Timer(0.05, log_queue.get).start()  # The listener frees a slot
+    handler.emit(record(logging.ERROR, "kept"))
+    assert handler.dropped == 1 and log_queue.get_nowait().msg == "kept"
@@ -0,0 +1,113 @@
+import urllib.request
+
+import httpx
+import openai
+
+from jedi_council.core import TheJediCouncil
+from jedi_council.hooks import CouncilHook, add_hook
+from jedi_council.metrics import MetricsCollector, TracingHook, serve_prometheus
+from jedi_council.retry import RetryPolicy
+
+
+def _completion(mocker, text="Wisdom"):
+    completion = mocker.MagicMock()
+    completion.choices[0].message.content = text
+    completion.usage.prompt_tokens, completion.usage.completion_tokens = 10, 20
+    completion.usage.prompt_tokens_details = None
+    return completion
+
+
+def _server_error():
+    request = httpx.Request("POST", "https://api.openai.com/v1/chat/completions")
+    return openai.APIStatusError("down", response=httpx.Response(503, request=request), body=None)
+
+
+def test_collector_records_latency_tokens_retries_and_failures(mocker):
+    metrics = add_hook(MetricsCollector())
+    council = TheJediCouncil(model="gpt-4o", retry_policy=RetryPolicy(max_attempts=2))
+    mocker.patch("jedi_council.core.time.sleep")
+    mocker.patch.object(council._provider.client.chat.completions, "create",
+                        side_effect=[_server_error(), _completion(mocker), _server_error(), _server_error()])
+
+    assert not council.get_wisdom("Test message").failed
+    assert council.get_wisdom("Test message").failed
+
+    stats = metrics.snapshot()["gpt-4o"]
+    assert stats["responses"] == 1 and stats["failures"] == 1 and stats["retries"] == 2
+    assert stats["errors"] == {"retryable": 3}
+    assert stats["in_flight"] == 0
+    assert stats["input_tokens"] == 10 and stats["output_tokens"] == 20 and stats["cost"] > 0
+    assert stats["p50_ms"] is not None and stats["tokens_per_sec_p50"] > 0
+
+    text = metrics.render_prometheus()
+    assert 'jedi_council_request_latency_seconds_bucket{provider="openai",model="gpt-4o",le="+Inf"} 1' in text
+    assert 'jedi_council_retries_total{provider="openai",model="gpt-4o"} 2' in text
+    assert 'jedi_council_errors_total{provider="openai",model="gpt-4o",kind="retryable"} 3' in text
+
+
+def test_per_council_hooks_and_broken_hooks_do_not_fail_calls(mocker):
+    class Broken(CouncilHook):
+        def before_request(self, ctx):
+            raise RuntimeError("bad hook")
+
+    metrics = MetricsCollector()
+    council = TheJediCouncil(model="gpt-4o", hooks=[Broken(), metrics])
+    mocker.patch.object(council._provider.client.chat.completions, "create", return_value=_completion(mocker))
+
+    assert council.get_wisdom("Test message").text == "Wisdom"
+    assert metrics.snapshot()["gpt-4o"]["responses"] == 1
+    assert TheJediCouncil(model="gpt-4o")._provider.hooks == []
+
+
+def test_tracing_spans_and_streamed_ttft(mocker):
+    spans = add_hook(TracingHook())
+    metrics = add_hook(MetricsCollector())
+    council = TheJediCouncil(model="gpt-4o")
+
+    def chunk(content, usage=None):
+        c = mocker.MagicMock()
+        c.choices = [mocker.MagicMock()] if content else []
+        if content:
+            c.choices[0].delta.content = content
+        c.usage = usage
+        return c
+
+    usage = mocker.MagicMock(prompt_tokens=5, completion_tokens=2, prompt_tokens_details=None)
+    mocker.patch.object(council._provider.client.chat.completions, "create",
+                        return_value=iter([chunk("Hel"), chunk("lo"), chunk(None, usage)]))
+
+    assert council.stream_wisdom("Test message").final_response().text == "Hello"
+
+    [span] = spans.spans
+    assert span.status == "ok" and span.duration_ms >= 0
+    assert span.attributes["gen_ai.request.model"] == "gpt-4o"
+    assert span.attributes["gen_ai.usage.output_tokens"] == 2 and span.attributes["jedi_council.streamed"]
+    assert metrics.snapshot()["gpt-4o"]["ttft_p50_ms"] is not None
+
+
+def test_abandoned_stream_ends_span_and_in_flight(mocker):
+    spans = add_hook(TracingHook())
+    metrics = add_hook(MetricsCollector())
+    council = TheJediCouncil(model="gpt-4o")
+    chunk = mocker.MagicMock()
+    chunk.choices[0].delta.content = "Hel"
+    mocker.patch.object(council._provider.client.chat.completions, "create", return_value=iter([chunk, chunk]))
+
+    deltas = iter(council.stream_wisdom("Test message"))
+    assert next(deltas) == "Hel"
+    deltas.close()
+
+    [span] = spans.spans
+    assert span.status == "error" and span.attributes["error.type"] == "cancelled"
+    snapshot = metrics.snapshot()["gpt-4o"]
+    assert snapshot["in_flight"] == 0 and snapshot["errors"] == {"cancelled": 1}
+
+def test_prometheus_endpoint():
+    metrics = MetricsCollector()
+    server = serve_prometheus(metrics, port=0)
+    try:
+        with urllib.request.urlopen(f"http://127.0.0.1:{server.server_address[1]}/metrics") as reply:
+            body = reply.read().decode()
+        assert "# TYPE jedi_council_request_latency_seconds histogram" in body
+    finally:
+        server.shutdown()
@@ -0,0 +1,58 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from jedi_council.core import TheJediCouncil
+from jedi_council.clients import client_registry
+from jedi_council.mock_server import MockConfig, MockProviderServer
+from jedi_council.retry import ErrorKind, RetryPolicy
+
+MODELS = {"openai": "gpt-4o", "anthropic": "claude-3-haiku-20240307", "mistral": "mistral-large-latest"}
+
+
+@pytest.fixture
+def server(monkeypatch):
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "mock")
+    monkeypatch.setenv("MISTRAL_API_KEY", "mock")
+    client_registry.clear()
+    with MockProviderServer(MockConfig(median_ms=5, output_tokens=6, seed=1)) as server:
+        yield server
+    client_registry.clear()
+
+
+@pytest.mark.parametrize("provider", sorted(MODELS))
+def test_speaks_each_wire_format(server, provider):
+    council = TheJediCouncil(model=MODELS[provider], base_url=server.base_url(provider))
+
+    response = council.get_wisdom("Test message")
+    streamed = council.stream_wisdom("Test message").final_response()
+
+    assert response.text == streamed.text == "May the Force be with you"
+    assert response.usage.output_tokens == streamed.usage.output_tokens == 6
+    assert streamed.ttft_ms is not None
+
+
+def test_injected_errors_are_retried_and_typed(server):
+    server.config.rate_limit_rate, server.config.retry_after_s = 1.0, 0
+    council = TheJediCouncil(model="gpt-4o", base_url=server.base_url("openai"),
+                             retry_policy=RetryPolicy(max_attempts=2))
+
+    response = council.get_wisdom("Test message")
+
+    assert response.error.kind is ErrorKind.RATE_LIMITED and response.attempts == 2
+    assert server.stats.rate_limited == 2
+
+
+def test_load_test_report(tmp_path):
+    report_path = tmp_path / "report.json"
+    script = Path(__file__).resolve().parents[1] / "benchmarking" / "load_test.py"
+    subprocess.run([sys.executable, str(script), "--mode", "open", "--rps", "20", "--duration", "1",
+                    "--ramp-up", "0", "--mock-latency-ms", "5", "--json", str(report_path)],
+                   check=True, capture_output=True, env={"PATH": "", "PYTHONPATH": str(script.parents[1])})
+
+    report = json.loads(report_path.read_text())
+    assert report["requests"] == 20 and report["error_rate"] == 0
+    assert report["latency_ms"]["p50"] > 0 and report["client_overhead_ms"] is not None
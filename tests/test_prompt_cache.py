@@ -0,0 +1,68 @@
+from types import SimpleNamespace
+
+import pytest
+
+from jedi_council.core import TheJediCouncil
+from jedi_council.utils.utils import estimate_cost
+
+SYSTEM = {"role": "system", "content": "You are a Jedi archivist. " * 200}
+
+
+def test_cached_tokens_are_priced_at_the_discounted_rate():
+    full = estimate_cost("claude-3-haiku-20240307", input_tokens=10_000, output_tokens=0)
+    read = estimate_cost("claude-3-haiku-20240307", input_tokens=10_000, output_tokens=0, cache_read_tokens=9_000)
+    write = estimate_cost("claude-3-haiku-20240307", input_tokens=10_000, output_tokens=0, cache_write_tokens=9_000)
+    assert read == pytest.approx(1_000 / 1000 * 0.00025 + 9_000 / 1000 * 0.00003)
+    assert read < full < write
+    # Models without explicit cache prices fall back to the default read multiplier.
+    assert estimate_cost("gpt-3.5-turbo", 2000, 0, cache_read_tokens=1000) == pytest.approx(0.0015)
+
+
+def test_anthropic_marks_system_prompt_and_counts_cache_tokens(mocker):
+    mocker.patch.dict("os.environ", {"ANTHROPIC_API_KEY": "test"})
+    council = TheJediCouncil(model="claude-3-haiku-20240307", prompt_cache=True)
+    message = mocker.MagicMock()
+    message.content[0].text = "Wisdom"
+    message.usage = SimpleNamespace(input_tokens=20, output_tokens=5, cache_read_input_tokens=1200,
+                                    cache_creation_input_tokens=0)
+    create = mocker.patch.object(council._provider.client.messages, "create", return_value=message)
+
+    response = council.get_wisdom([SYSTEM, {"role": "user", "content": "Who founded the Order?"}])
+
+    system = create.call_args.kwargs["system"]
+    assert system == [{"type": "text", "text": SYSTEM["content"], "cache_control": {"type": "ephemeral"}}]
+    assert create.call_args.kwargs["messages"] == [{"role": "user", "content": "Who founded the Order?"}]
+    assert response.usage.input_tokens == 1220 and response.usage.cache_read_tokens == 1200
+    assert response.usage.cache_hit_ratio == pytest.approx(1200 / 1220)
+    assert response.usage.cost == estimate_cost("claude-3-haiku-20240307", 1220, 5, cache_read_tokens=1200)
+
+
+def test_anthropic_breakpoint_on_marked_message(mocker):
+    mocker.patch.dict("os.environ", {"ANTHROPIC_API_KEY": "test"})
+    provider = TheJediCouncil(model="claude-3-haiku-20240307")._provider
+
+    params = provider._request_params([SYSTEM, {"role": "user", "content": "A long document", "cache": True},
+                                       {"role": "user", "content": "Question"}])
+
+    assert params["system"] == SYSTEM["content"]  # no breakpoint here; the later one covers it
+    assert params["messages"][0]["content"] == [{"type": "text", "text": "A long document",
+                                                 "cache_control": {"type": "ephemeral"}}]
+    assert params["messages"][1] == {"role": "user", "content": "Question"}
+
+
+def test_openai_strips_markers_and_records_cached_tokens(mocker):
+    council = TheJediCouncil(model="gpt-4o")
+    completion = mocker.MagicMock()
+    completion.choices[0].message.content = "Wisdom"
+    completion.usage = SimpleNamespace(prompt_tokens=2000, completion_tokens=10,
+                                       prompt_tokens_details=SimpleNamespace(cached_tokens=1536))
+    create = mocker.patch.object(council._provider.client.chat.completions, "create", return_value=completion)
+
+    response = council.get_wisdom([{**SYSTEM, "cache": True}, {"role": "user", "content": "Question"}])
+    again = council.get_wisdom([{**SYSTEM, "cache": True}, {"role": "user", "content": "Another question"}])
+
+    first, second = (call.kwargs for call in create.call_args_list)
+    assert first["messages"][0] == SYSTEM
+    assert first["prompt_cache_key"] == second["prompt_cache_key"]
+    assert response.usage.cache_read_tokens == 1536 and again.usage.cache_write_tokens == 0
+    assert response.usage.cost < estimate_cost("gpt-4o", 2000, 10)
@@ -0,0 +1,98 @@
+import asyncio
+import time
+
+import pytest
+
+from jedi_council.core import CouncilResponse, UsageInfo, ERROR_COUNCIL_RESPONSE
+from jedi_council.quorum import QuorumCouncil
+from jedi_council.retry import CouncilError, ErrorKind
+
+MODELS = ["gpt-4o", "claude-3-haiku-20240307", "mistral-large-latest"]
+
+
+def _member(model, delay_s, text, cost=0.01):
+    async def aget_wisdom(prompt, **kwargs):
+        await asyncio.sleep(delay_s)
+        if text is None:
+            return CouncilResponse(text=ERROR_COUNCIL_RESPONSE, model=model, usage=UsageInfo(0, 0), latency_ms=0,
+                                   raw_response=None, error=CouncilError(ErrorKind.FATAL, "nope"))
+        return CouncilResponse(text=text, model=model, usage=UsageInfo(10, 10, cost), latency_ms=delay_s * 1000,
+                               raw_response=None)
+    return aget_wisdom
+
+
+def _council(mocker, replies, **kwargs):
+    mocker.patch.dict("os.environ", {"ANTHROPIC_API_KEY": "test", "MISTRAL_API_KEY": "test"})
+    council = QuorumCouncil(MODELS, **kwargs)
+    for model, (delay_s, text) in zip(MODELS, replies):
+        council.councils[model].aget_wisdom = _member(model, delay_s, text)
+    return council
+
+
+def test_majority_stops_at_quorum_and_cancels_the_rest(mocker):
+    council = _council(mocker, [(0.01, "Yes."), (0.02, "yes"), (2.0, "No")])
+
+    started = time.perf_counter()
+    verdict = council.get_wisdom("Is Chewbacca strong?")
+
+    assert time.perf_counter() - started < 1.0
+    assert verdict.quorum_reached and verdict.text == "Yes."
+    assert verdict.agreeing == ["gpt-4o", "claude-3-haiku-20240307"]
+    assert verdict.cancelled == ["mistral-large-latest"]
+    assert set(verdict.responses) == {"gpt-4o", "claude-3-haiku-20240307"}
+    assert verdict.cost["gpt-4o"] == 0.01 and "mistral-large-latest" in verdict.cost
+    assert verdict.total_cost == pytest.approx(sum(verdict.cost.values()))
+
+
+def test_stops_once_quorum_is_impossible(mocker):
+    council = _council(mocker, [(0.01, "Yes"), (0.02, None), (2.0, "No")], quorum=3)
+
+    verdict = council.get_wisdom("Is Chewbacca strong?")
+
+    assert not verdict.quorum_reached
+    assert verdict.cancelled == ["mistral-large-latest"]
+    assert verdict.text == "Yes"  # The most common answer so far, for reference
+    assert verdict.responses["claude-3-haiku-20240307"].failed
+
+
+def test_judge_decides(mocker):
+    council = _council(mocker, [(0.01, "short"), (0.02, "a much longer answer"), (2.0, "x")],
+                       judge=lambda answers, pending: max(answers.values(), key=lambda r: len(r.text))
+                       if len(answers) >= 2 else None)
+
+    verdict = council.get_wisdom("Explain.")
+
+    assert verdict.quorum_reached and verdict.text == "a much longer answer"
+    assert verdict.cancelled == ["mistral-large-latest"]
+
+
+def test_member_that_raises_counts_as_failed(mocker):
+    council = _council(mocker, [(0.01, "Yes"), (0.02, "Yes"), (0.01, "No")], quorum=2)
+
+    async def boom(prompt, **kwargs):
+        raise RuntimeError("socket closed")
+    council.councils["claude-3-haiku-20240307"].aget_wisdom = boom
+
+    verdict = council.get_wisdom("Is Chewbacca strong?")
+
+    failed = verdict.responses["claude-3-haiku-20240307"]
+    assert failed.failed and "socket closed" in str(failed.error)
+    assert not verdict.quorum_reached and verdict.cost["claude-3-haiku-20240307"] == 0.0
+
+def test_member_without_text_still_votes(mocker):
+    council = _council(mocker, [(0.01, "Yes"), (0.02, "No"), (0.03, "yes.")])
+    none_reply = _member("claude-3-haiku-20240307", 0.02, "placeholder")
+
+    async def refusal(prompt, **kwargs):
+        response = await none_reply(prompt, **kwargs)
+        response.text = None  # e.g. an OpenAI refusal or a tool-call-only reply
+        return response
+    council.councils["claude-3-haiku-20240307"].aget_wisdom = refusal
+
+    verdict = council.get_wisdom("Is Chewbacca strong?")
+
+    assert verdict.quorum_reached and verdict.agreeing == ["gpt-4o", "mistral-large-latest"]
+
+def test_invalid_quorum():
+    with pytest.raises(ValueError):
+        QuorumCouncil(["gpt-4o"], quorum=2)
@@ -0,0 +1,76 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from jedi_council.core import TheJediCouncil
+from jedi_council.clients import client_registry
+from jedi_council.ratelimit import RateLimiter, get_rate_limiter, parse_retry_after, reset_rate_limiters
+
+
+def test_buckets_back_pressure_instead_of_failing():
+    limiter = RateLimiter(rpm=60, tpm=6000, headroom=1.0)
+    assert limiter.reserve(tokens=100) == 0
+    # The token bucket is the binding constraint: 6000 tokens/min refill at 100 tokens/s.
+    wait = limiter.reserve(tokens=6000)
+    assert 0.9 < wait <= 1.0
+    assert limiter.stats.throttled == 1
+
+
+def test_limits_and_pauses_are_learned_from_headers():
+    limiter = RateLimiter()
+    assert limiter.reserve() == 0  # unlimited until told otherwise
+
+    limiter.update_from_headers({"x-ratelimit-limit-requests": "600", "x-ratelimit-remaining-requests": "0",
+                                 "x-ratelimit-limit-tokens": "90000"})
+    assert limiter.rpm == 570 and limiter.tpm == 85500
+    assert limiter.reserve() > 0
+
+    limiter.update_from_headers({"Retry-After": "3"}, status_code=429)
+    assert limiter.reserve() >= 3
+    assert limiter.stats.rate_limited == 1
+
+
+def test_parse_retry_after_variants():
+    assert parse_retry_after({"retry-after-ms": "250"}) == 0.25
+    assert parse_retry_after({"Retry-After": "2"}) == 2.0
+    assert parse_retry_after({"Retry-After": "Wed, 21 Oct 2015 07:28:00 GMT"}) == 0.0
+    assert parse_retry_after({}) is None
+
+
+class _QuotaHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers["Content-Length"]))
+        body = json.dumps({"id": "1", "object": "chat.completion", "created": 0, "model": "gpt-4o",
+                           "choices": [{"index": 0, "finish_reason": "stop",
+                                        "message": {"role": "assistant", "content": "ok"}}],
+                           "usage": {"prompt_tokens": 1, "completion_tokens": 1, "total_tokens": 2}}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("x-ratelimit-limit-requests", "1000")
+        self.send_header("x-ratelimit-remaining-requests", "999")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def test_councils_share_limiter_fed_by_response_headers():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _QuotaHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    client_registry.clear()
+    reset_rate_limiters()
+    try:
+        council = TheJediCouncil(model="gpt-4o", base_url=f"http://127.0.0.1:{server.server_address[1]}/v1")
+        assert council.get_wisdom("Hello").text == "ok"
+        limiter = get_rate_limiter("openai")
+        assert limiter is council._provider.rate_limiter
+        assert limiter.rpm == 950
+        assert limiter.stats.acquired == 1
+    finally:
+        server.shutdown()
+        client_registry.clear()
+        reset_rate_limiters()
@@ -0,0 +1,73 @@
+import csv
+import sqlite3
+
+from jedi_council.results import ResultStore, load_results
+
+
+def _row(task, model, error=None, **fields):
+    row = {"run_id": "run-1", "task_name": task, "model": model, "latency_ms": 120, "input_tokens": 10,
+           "output_tokens": 5, "cost": 0.001, "cached": False, "error": error,
+           "text": None if error else "Line one\nline two, \"quoted\"", **fields}
+    return row
+
+
+def test_rows_are_durable_and_runs_resume(tmp_path):
+    path = str(tmp_path / "results.sqlite")
+    store = ResultStore(path)
+    store.start_run("run-1")
+    store.append(_row("Summarization", "gpt-4o"))
+    store.append(_row("Summarization", "gemini-1.5-pro", error="timeout"))
+    # Simulate a crash: no finish_run, no close.
+
+    reopened = ResultStore(path)
+    assert reopened.latest_run_id(unfinished=True) == "run-1"
+    assert reopened.completed("run-1") == {("Summarization", "gpt-4o", 0)}
+
+    # Retrying the failed pair replaces its row.
+    reopened.append(_row("Summarization", "gemini-1.5-pro"))
+    reopened.finish_run("run-1", suite_wall_ms=2500)
+    assert len(reopened.completed("run-1")) == 2
+    assert reopened.latest_run_id(unfinished=True) is None
+    assert reopened.runs()[0]["suite_wall_ms"] == 2500
+
+
+def test_full_text_and_extra_fields_round_trip(tmp_path):
+    path = str(tmp_path / "results.sqlite")
+    store = ResultStore(path)
+    store.append(_row("Code Generation", "gpt-4o", trial=3, region="eu"))
+
+    (row,) = load_results(path, run_id="run-1", as_frame=False)
+    assert row["text"] == "Line one\nline two, \"quoted\""
+    assert row["trial"] == 3 and row["extra"] == '{"region": "eu"}'
+    assert row["failed"] == 0
+
+
+def test_export_csv_keeps_the_benchmark_layout(tmp_path):
+    path = str(tmp_path / "results.sqlite")
+    store = ResultStore(path)
+    store.start_run("run-1")
+    store.append(_row("Summarization", "gpt-4o"))
+    store.append(_row("Summarization", "mistral-large-latest", error="503"))
+    store.finish_run("run-1", suite_wall_ms=1234.4)
+
+    csv_path = tmp_path / "run.csv"
+    assert store.export_csv(str(csv_path), "run-1") == 2
+    with open(csv_path, newline="", encoding="utf-8") as file:
+        ok, failed = list(csv.DictReader(file))
+    assert ok["text"] == "Line one\nline two, \"quoted\"" and ok["suite_wall_ms"] == "1234"
+    assert failed["latency_ms"] == "-1" and failed["text"] == "[ERROR] 503"
+
+
+def test_version_1_stores_are_migrated(tmp_path):
+    path = str(tmp_path / "results.sqlite")
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE results (run_id TEXT NOT NULL, task_name TEXT NOT NULL, model TEXT NOT NULL,"
+                 " latency_ms REAL, error TEXT, PRIMARY KEY (run_id, task_name, model))")
+    conn.execute("INSERT INTO results VALUES ('old', 'Summarization', 'gpt-4o', 250, NULL)")
+    conn.commit()
+    conn.close()
+
+    store = ResultStore(path)
+    store.append(_row("Summarization", "gpt-4o", trial=1))
+    assert store.completed("old") == {("Summarization", "gpt-4o", 0)}
+    assert [(r["run_id"], r["trial"], r["latency_ms"]) for r in store.iter_rows()] == [("old", 0, 250), ("run-1", 1, 120)]
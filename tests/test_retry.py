@@ -0,0 +1,110 @@
+import httpx
+import openai
+
+from jedi_council.core import TheJediCouncil, ERROR_COUNCIL_RESPONSE
+from jedi_council.retry import (CircuitBreaker, ErrorKind, RetryPolicy, classify_error,
+                                configure_circuit_breaker)
+
+
+def _status_error(status, headers=None):
+    request = httpx.Request("POST", "https://api.openai.com/v1/chat/completions")
+    response = httpx.Response(status, request=request, headers=headers or {})
+    return openai.APIStatusError("failed", response=response, body=None)
+
+
+def _council(mocker, side_effect, **policy):
+    council = TheJediCouncil(model="gpt-4o", retry_policy=RetryPolicy(**policy))
+    create = mocker.patch.object(council._provider.client.chat.completions, "create", side_effect=side_effect)
+    sleep = mocker.patch("jedi_council.core.time.sleep")
+    return council, create, sleep
+
+
+def test_classify_error():
+    assert classify_error(_status_error(401)) is ErrorKind.FATAL
+    assert classify_error(_status_error(400)) is ErrorKind.FATAL
+    assert classify_error(_status_error(429)) is ErrorKind.RATE_LIMITED
+    assert classify_error(_status_error(503)) is ErrorKind.RETRYABLE
+    assert classify_error(TimeoutError()) is ErrorKind.RETRYABLE
+    assert classify_error(openai.APIConnectionError(request=httpx.Request("GET", "https://x"))) is ErrorKind.RETRYABLE
+
+
+def test_backoff_is_jittered_and_capped():
+    policy = RetryPolicy(base_delay=1.0, max_delay=4.0)
+    delays = [policy.backoff(attempt, RuntimeError(), ErrorKind.RETRYABLE) for attempt in range(1, 10) for _ in range(20)]
+    assert all(0 <= delay <= 4.0 for delay in delays)
+    assert len(set(delays)) > 1
+    assert policy.backoff(1, _status_error(429, {"retry-after": "7"}), ErrorKind.RATE_LIMITED) == 7.0
+
+
+def test_fatal_errors_are_not_retried(mocker):
+    council, create, sleep = _council(mocker, _status_error(401), max_attempts=5)
+
+    response = council.get_wisdom("Test message")
+
+    assert response.failed and response.text == ERROR_COUNCIL_RESPONSE
+    assert response.error.kind is ErrorKind.FATAL and response.error.status_code == 401
+    assert response.attempts == 1
+    assert create.call_count == 1 and not sleep.called
+
+
+def test_retryable_errors_retry_then_succeed(mocker):
+    ok = mocker.MagicMock()
+    ok.choices[0].message.content = "Recovered"
+    ok.usage.prompt_tokens, ok.usage.completion_tokens = 5, 5
+    council, create, sleep = _council(mocker, [_status_error(503), ok], max_attempts=3)
+
+    response = council.get_wisdom("Test message")
+
+    assert response.text == "Recovered" and response.error is None
+    assert response.attempts == 2 and sleep.call_count == 1
+    assert create.call_args.kwargs["timeout"] <= 120.0
+
+
+def test_deadline_stops_retries(mocker):
+    council, create, _ = _council(mocker, _status_error(429, {"retry-after": "60"}), max_attempts=5, deadline_s=10)
+
+    response = council.get_wisdom("Test message")
+
+    # The provider asks for a 60s wait, which would overrun the 10s deadline.
+    assert response.error.kind is ErrorKind.DEADLINE_EXCEEDED
+    assert response.attempts == 1 and create.call_count == 1
+
+
+def test_rate_limiter_wait_counts_against_the_deadline(mocker):
+    council, create, _ = _council(mocker, [], deadline_s=10)
+    clock = [0.0]
+    mocker.patch("jedi_council.core.time.monotonic", side_effect=lambda: clock[0])
+    # The limiter holds the call for 30s, past the 10s deadline.
+    mocker.patch.object(council._provider, "_throttle", side_effect=lambda *a, **k: clock.__setitem__(0, 30.0))
+
+    response = council.get_wisdom("Test message")
+
+    assert response.error.kind is ErrorKind.DEADLINE_EXCEEDED and "rate limiter" in str(response.error)
+    assert create.call_count == 0
+
+def test_circuit_opens_and_fails_fast(mocker):
+    configure_circuit_breaker("openai", failure_threshold=2, reset_timeout_s=60)
+    council, create, _ = _council(mocker, _status_error(500), max_attempts=2)
+
+    first = council.get_wisdom("Test message")
+    second = council.get_wisdom("Test message")
+
+    assert first.error.kind is ErrorKind.RETRYABLE and first.attempts == 2
+    assert second.error.kind is ErrorKind.CIRCUIT_OPEN and second.attempts == 0
+    assert create.call_count == 2
+
+
+def test_circuit_half_opens_after_reset_timeout(mocker):
+    clock = mocker.patch("jedi_council.retry.time.monotonic", return_value=100.0)
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout_s=30)
+    breaker.record_failure(ErrorKind.RETRYABLE)
+    assert breaker.state == "open" and not breaker.allow()
+
+    clock.return_value = 131.0
+    assert breaker.allow()  # the single half-open probe
+    assert not breaker.allow()
+    breaker.record_success()
+    assert breaker.state == "closed" and breaker.allow()
+
+    breaker.record_failure(ErrorKind.FATAL)
+    assert breaker.failures == 0
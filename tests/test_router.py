@@ -0,0 +1,96 @@
+import csv
+
+import pytest
+
+from jedi_council.core import CouncilResponse, UsageInfo, ERROR_COUNCIL_RESPONSE
+from jedi_council.retry import CouncilError, ErrorKind
+from jedi_council.router import CouncilRouter, MinCostUnder, MinLatency
+from jedi_council.stats import Ewma, QuantileSketch
+
+MODELS = ["gpt-4o", "gpt-4o-mini"]
+
+
+def _response(model, latency_ms, cost=0.001, failed=False):
+    if failed:
+        return CouncilResponse(text=ERROR_COUNCIL_RESPONSE, model=model, usage=UsageInfo(0, 0), latency_ms=latency_ms,
+                               raw_response=None, error=CouncilError(ErrorKind.RETRYABLE, "down"))
+    return CouncilResponse(text="wisdom", model=model, usage=UsageInfo(10, 10, cost), latency_ms=latency_ms,
+                           raw_response=None)
+
+
+def test_quantile_sketch_is_within_relative_accuracy():
+    sketch = QuantileSketch(relative_accuracy=0.01)
+    for value in range(1, 10_001):
+        sketch.add(value)
+    assert sketch.quantile(0.5) == pytest.approx(5000, rel=0.02)
+    assert sketch.quantile(0.95) == pytest.approx(9500, rel=0.02)
+    assert len(sketch.buckets) < 500
+
+    other = QuantileSketch(relative_accuracy=0.01)
+    other.add(20_000, count=10_000)
+    sketch.merge(other)
+    assert sketch.quantile(0.75) == pytest.approx(20_000, rel=0.02)
+
+
+def test_ewma_tracks_recent_values():
+    ewma = Ewma(alpha=0.5)
+    ewma.update(100)
+    ewma.update(0)
+    assert ewma.value == 50
+
+
+def test_routes_to_lowest_p95_and_shifts_when_a_model_slows(mocker):
+    router = CouncilRouter(MODELS, policy=MinLatency(), explore=0, min_samples=3)
+    for _ in range(10):
+        router.record("gpt-4o", _response("gpt-4o", 300))
+        router.record("gpt-4o-mini", _response("gpt-4o-mini", 900))
+    assert router.choose() == ["gpt-4o", "gpt-4o-mini"]
+
+    for _ in range(5):
+        router.record("gpt-4o", _response("gpt-4o", 5000))
+    assert router.ranking()[0] == "gpt-4o-mini"
+
+
+def test_cost_under_latency_budget():
+    router = CouncilRouter(MODELS, policy=MinCostUnder(max_latency_ms=1000), explore=0, min_samples=1)
+    router.record("gpt-4o", _response("gpt-4o", 400, cost=0.01))
+    router.record("gpt-4o-mini", _response("gpt-4o-mini", 700, cost=0.0005))
+    assert router.ranking()[0] == "gpt-4o-mini"
+
+    router.record("gpt-4o-mini", _response("gpt-4o-mini", 9000, cost=0.0005))
+    assert router.ranking()[0] == "gpt-4o"
+
+
+def test_failed_call_falls_back_and_degrades_the_model(mocker):
+    router = CouncilRouter(MODELS, explore=0, min_samples=1)
+    router.record("gpt-4o", _response("gpt-4o", 100))
+    router.record("gpt-4o-mini", _response("gpt-4o-mini", 800))
+    primary = mocker.patch.object(router.councils["gpt-4o"], "get_wisdom", return_value=_response("gpt-4o", 50, failed=True))
+    backup = mocker.patch.object(router.councils["gpt-4o-mini"], "get_wisdom", return_value=_response("gpt-4o-mini", 800))
+
+    response = router.get_wisdom("Test message")
+
+    assert response.model == "gpt-4o-mini" and not response.failed
+    primary.assert_called_once()
+    backup.assert_called_once()
+    for _ in range(5):
+        router.get_wisdom("Test message")
+    assert router.ranking()[0] == "gpt-4o-mini"  # error rate is now above max_error_rate
+
+
+def test_seed_from_benchmark_csv(tmp_path):
+    path = tmp_path / "benchmark_1.csv"
+    with open(path, "w", newline="") as file:
+        writer = csv.DictWriter(file, fieldnames=["task_name", "model", "latency_ms", "cost", "text"])
+        writer.writeheader()
+        for _ in range(5):
+            writer.writerow({"task_name": "t", "model": "gpt-4o", "latency_ms": 2000, "cost": 0.01, "text": "ok"})
+            writer.writerow({"task_name": "t", "model": "gpt-4o-mini", "latency_ms": 600, "cost": 0.001, "text": "ok"})
+        writer.writerow({"task_name": "t", "model": "gpt-4o-mini", "latency_ms": -1, "cost": 0, "text": "[ERROR] boom"})
+        writer.writerow({"task_name": "t", "model": "claude-3-haiku-20240307", "latency_ms": 1, "cost": 0, "text": "ok"})
+
+    router = CouncilRouter(MODELS, explore=0, seed_csv=str(tmp_path / "*.csv"))
+
+    assert router.stats["gpt-4o-mini"].calls == 6 and router.stats["gpt-4o-mini"].errors == 1
+    assert router.ranking()[0] == "gpt-4o-mini"
+    assert router.snapshot()["gpt-4o"]["p95_ms"] == pytest.approx(2000, rel=0.02)
@@ -0,0 +1,114 @@
+import json
+import os
+
+import pytest
+
+from jedi_council.cli import main
+from jedi_council.mock_server import MockConfig, MockProviderServer
+from jedi_council.retry import reset_circuit_breakers
+from jedi_council.runner import load_checkpoint, merge_shards, run, shard_path
+
+
+@pytest.fixture
+def prompts(tmp_path):
+    path = tmp_path / "prompts.jsonl"
+    lines = [json.dumps({"id": f"p{i}", "prompt": f"Question {i}"}) for i in range(7)]
+    lines.insert(3, "")  # Blank lines are skipped but keep their line number
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return str(path)
+
+
+def _records(path):
+    with open(path, encoding="utf-8") as file:
+        return [json.loads(line) for line in file]
+
+
+def test_run_writes_results_in_input_order(prompts, tmp_path, capsys):
+    output = str(tmp_path / "results.jsonl")
+    with MockProviderServer(MockConfig(median_ms=5, output_tokens=3)) as server:
+        code = main(["run", "--input", prompts, "--model", "gpt-4o", "--output", output,
+                     "--concurrency", "4", "--base-url", server.base_url("openai")])
+
+    assert code == 0
+    records = _records(output)
+    assert [r["request_id"] for r in records] == [f"p{i}" for i in range(7)]
+    assert all(not r["error"] and r["text"] == "May the Force" for r in records)
+    assert not os.path.exists(output + ".parts")
+    assert "Ran 7 prompts on gpt-4o" in capsys.readouterr().out
+
+
+def test_failed_run_resumes_and_retries_only_failures(prompts, tmp_path):
+    output = str(tmp_path / "results.jsonl")
+    with MockProviderServer(MockConfig(median_ms=1, error_rate=1.0)) as server:
+        summary, failed = run(prompts, "gpt-4o", output, max_retry=1, base_url=server.base_url("openai"))
+    assert failed and summary.failed == 7
+    assert os.path.exists(output + ".parts")
+
+    with pytest.raises(ValueError, match="unfinished run"):
+        run(prompts, "gpt-4o", output)
+
+    reset_circuit_breakers()  # A resumed run is normally a fresh process
+    with MockProviderServer(MockConfig(median_ms=1)) as server:
+        summary, failed = run(prompts, "gpt-4o", output, resume=True, base_url=server.base_url("openai"))
+        assert server.stats.requests == 7
+    assert not failed and summary.completed == 7
+    assert [r["error"] for r in _records(output)] == [False] * 7
+
+
+def test_malformed_input_stops_the_run_before_any_call(prompts, tmp_path):
+    with open(prompts, "a", encoding="utf-8") as file:
+        file.write('{"bogus": 1}\nnot json\n')
+    output = str(tmp_path / "results.jsonl")
+    with MockProviderServer(MockConfig(median_ms=1)) as server:
+        with pytest.raises(ValueError, match=r"2 malformed line\(s\).*line 9: .*line 10: "):
+            run(prompts, "gpt-4o", output, base_url=server.base_url("openai"))
+        assert server.stats.requests == 0
+    assert not os.path.exists(output + ".parts")
+
+
+def test_a_result_that_cant_be_recorded_fails_only_its_prompt(prompts, tmp_path, mocker):
+    from jedi_council.cli import response_record
+    calls = []
+
+    def record(response):
+        calls.append(response)
+        if len(calls) == 3:
+            raise TypeError("not JSON serializable")
+        return response_record(response)
+    mocker.patch("jedi_council.cli.response_record", side_effect=record)
+    output = str(tmp_path / "results.jsonl")
+    with MockProviderServer(MockConfig(median_ms=1)) as server:
+        summary, failed = run(prompts, "gpt-4o", output, concurrency=1, base_url=server.base_url("openai"))
+
+    assert failed and summary.completed == 7 and summary.failed == 1
+    records = _records(output)
+    assert [r["error"] for r in records] == [False, False, True, False, False, False, False]
+    assert records[2]["text"] == "TypeError: not JSON serializable" and records[2]["request_id"] == "p2"
+
+
+def test_checkpoint_skips_done_lines_and_drops_a_torn_write(tmp_path):
+    parts = str(tmp_path / "results.jsonl.parts")
+    os.makedirs(parts)
+    record = {"index": 2, "request_id": "p2", "error": False}
+    with open(shard_path(parts, 0), "w", encoding="utf-8") as file:
+        file.write(json.dumps({"index": 0, "request_id": "p0", "error": True}) + "\n")
+        file.write(json.dumps(record) + "\n")
+        file.write('{"index": 4, "requ')  # The worker was killed mid-write
+
+    assert load_checkpoint(shard_path(parts, 0)) == {2}
+    with open(shard_path(parts, 1), "w", encoding="utf-8") as file:
+        file.write(json.dumps({"index": 1, "request_id": "p1", "error": False}) + "\n")
+    count, failures = merge_shards(parts, 2, str(tmp_path / "merged.jsonl"))
+    assert (count, failures) == (3, 1)
+    assert [r["index"] for r in _records(tmp_path / "merged.jsonl")] == [0, 1, 2]
+
+
+def test_multiple_worker_processes(prompts, tmp_path):
+    output = str(tmp_path / "results.jsonl")
+    with MockProviderServer(MockConfig(median_ms=5)) as server:
+        summary, failed = run(prompts, "gpt-4o", output, workers=3, concurrency=2,
+                              base_url=server.base_url("openai"))
+        assert server.stats.requests == 7
+
+    assert not failed and summary.completed == 7 and summary.latency_ms.count == 7
+    assert [r["request_id"] for r in _records(output)] == [f"p{i}" for i in range(7)]
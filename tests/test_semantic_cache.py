@@ -0,0 +1,72 @@
+import pytest
+
+np = pytest.importorskip("numpy")  # Only in the `semantic` extra
+
+from jedi_council.core import TheJediCouncil, CouncilResponse, UsageInfo  # noqa: E402
+from jedi_council.semantic_cache import HashingEmbedder, SemanticCache, VectorIndex  # noqa: E402
+
+
+def _response(text="Cached wisdom"):
+    return CouncilResponse(text=text, model="gpt-4o", usage=UsageInfo(3, 5, 0.001), latency_ms=900, raw_response=None)
+
+
+def _unit_vectors(count, dim, seed=0):
+    vectors = np.random.default_rng(seed).standard_normal((count, dim)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def test_near_duplicates_are_served_from_cache(mocker):
+    generate = mocker.patch("jedi_council.core._OpenAIProvider.generate", return_value=_response())
+    cache = SemanticCache()
+    council = TheJediCouncil(model="gpt-4o", cache=cache)
+
+    council.get_wisdom("What is the capital of Naboo?", temperature=0)
+    reworded = council.get_wisdom("what is the capital of naboo, please", temperature=0)
+    assert reworded.cached and reworded.text == "Cached wisdom"
+    assert generate.call_count == 1
+
+    council.get_wisdom("What is the capital of Alderaan?", temperature=0)  # Different question
+    council.get_wisdom("What is the capital of Naboo?", temperature=1)  # Different params
+    council.get_wisdom([{"role": "system", "content": "Be brief."},
+                        {"role": "user", "content": "What is the capital of Naboo?"}], temperature=0)
+    assert generate.call_count == 4
+    assert cache.stats.hits == 1 and cache.stats.misses == 4 and cache.stats.mean_similarity > 0.9
+
+    strict = SemanticCache(thresholds={"gpt-4o": 0.999})
+    strict.put(strict.key("gpt-4o", [{"role": "user", "content": "What is the capital of Naboo?"}], {}), _response())
+    assert strict.get(strict.key("gpt-4o", [{"role": "user", "content": "capital of Naboo, please?"}], {})) is None
+
+
+def test_index_switches_to_inverted_file_and_evicts_lru():
+    vectors = _unit_vectors(600, 32)
+    index = VectorIndex(dim=32, capacity=600, ivf_min_entries=256, nprobe=4)
+    for i, vector in enumerate(vectors):
+        index.add(vector, namespace=i % 2, now=float(i))
+    assert index.centroids is not None and len(index) == 600
+
+    slot, similarity = index.search(vectors[123], namespace=1)
+    assert slot == 123 and similarity == pytest.approx(1.0)
+    assert index.search(vectors[123], namespace=7) == (-1, -1.0)
+
+    index.touch(0, now=1000.0)
+    slot, evicted = index.add(_unit_vectors(1, 32, seed=1)[0], namespace=0, now=1001.0)
+    assert evicted == slot == 1  # Slot 0 was used recently, so slot 1 is the oldest
+    assert len(index) == 600
+
+
+def test_persisted_cache_reopens(tmp_path):
+    path = str(tmp_path / "semantic")
+    cache = SemanticCache(path=path, max_entries=2)
+    for question in ("Who trained Luke?", "Who trained Anakin?", "Who trained Obi-Wan?"):
+        cache.put(cache.key("gpt-4o", [{"role": "user", "content": question}], {}), _response(question))
+    assert cache.stats.evictions == 1
+    cache.close()
+
+    reopened = SemanticCache(path=path, max_entries=2)
+    assert len(reopened) == 2
+    hit = reopened.get(reopened.key("gpt-4o", [{"role": "user", "content": "who trained obi-wan"}], {}))
+    assert hit.cached and hit.text == "Who trained Obi-Wan?"
+    assert reopened.get(reopened.key("gpt-4o", [{"role": "user", "content": "Who trained Luke?"}], {})) is None
+
+    with pytest.raises(ValueError, match="float32"):
+        SemanticCache(HashingEmbedder(dim=64), path=path, max_entries=2)
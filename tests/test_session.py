@@ -0,0 +1,118 @@
+from google.generativeai import protos
+
+from jedi_council.core import TheJediCouncil, CouncilResponse, UsageInfo, CACHE_MARKER
+from jedi_council.providers.gemini_provider import _GeminiProvider
+from jedi_council.retry import CouncilError, ErrorKind
+from jedi_council.session import CouncilSession, SUMMARY_PROMPT, SUMMARY_HEADER
+
+
+def _reply(text):
+    return CouncilResponse(text=text, model="gpt-4o", usage=UsageInfo(10, 5, 0.001), latency_ms=100, raw_response=None)
+
+
+def _answer(messages, **kwargs):
+    if messages[0]["content"] == SUMMARY_PROMPT:
+        return _reply("The user asked about lightsabers.")
+    return _reply("A Jedi's weapon is their lightsaber. " * 3)
+
+
+QUESTION = "Tell me, wise master, what should a young padawan know about building a lightsaber? " * 2
+
+
+def test_history_is_trimmed_to_the_budget(mocker):
+    generate = mocker.patch("jedi_council.core._OpenAIProvider.generate", side_effect=_answer)
+    session = CouncilSession(TheJediCouncil(model="gpt-4o"), system="You are Yoda.",
+                             budget_tokens=400, reserve_tokens=50)
+
+    for _ in range(12):
+        assert not session.ask(QUESTION).failed
+
+    sent = [call.args[0] for call in generate.call_args_list]
+    assert all(messages[0] == {"role": "system", "content": "You are Yoda.", CACHE_MARKER: True} for messages in sent)
+    assert all(stats.sent_tokens <= 350 for stats in session.turn_stats)
+    assert len(sent[-1]) < 2 * 12
+    # Trimming goes down to trim_to of the budget, so it happens only every few turns.
+    trims = [i for i, stats in enumerate(session.turn_stats) if stats.dropped_turns]
+    assert 1 < len(trims) < 12 and all(b - a > 1 for a, b in zip(trims, trims[1:]))
+    assert session.turn_stats[-1].saved_tokens > 0 and session.total_saved_tokens > 0
+    assert session.messages[-2:] == [{"role": "user", "content": QUESTION},
+                                     {"role": "assistant", "content": _answer(sent[-1]).text}]
+
+
+def test_trimmed_turns_are_summarized(mocker):
+    generate = mocker.patch("jedi_council.core._OpenAIProvider.generate", side_effect=_answer)
+    session = CouncilSession(TheJediCouncil(model="gpt-4o"), system="You are Yoda.", budget_tokens=400,
+                             reserve_tokens=50, summarize=True)
+
+    for _ in range(6):
+        session.ask(QUESTION)
+
+    summarized = next(stats for stats in session.turn_stats if stats.summarized)
+    assert summarized.dropped_turns > 0
+    last = generate.call_args_list[-1].args[0]
+    assert last[1] == {"role": "system", "content": SUMMARY_HEADER + "The user asked about lightsabers."}
+    assert last[-1] == {"role": "user", "content": QUESTION}
+
+
+def test_failed_turns_are_not_recorded(mocker):
+    council = TheJediCouncil(model="gpt-4o")
+    failed = council._provider._failed_response(CouncilError(ErrorKind.RETRYABLE, "down"), attempts=1, started=0.0)
+    mocker.patch("jedi_council.core._OpenAIProvider.generate", return_value=failed)
+    session = CouncilSession(council)
+
+    session.ask("Hello?", max_tokens=None)
+    assert session.messages == [] and session.turn_stats == []
+
+
+def test_gemini_session_summarizes(mocker, monkeypatch):
+    monkeypatch.setenv("GEMINI_API_KEY", "test")
+    requests = []
+
+    def generate_content(request, **options):
+        requests.append(request)
+        summarizing = request.system_instruction.parts[0].text == SUMMARY_PROMPT
+        text = "The user asked about lightsabers." if summarizing else "A Jedi's weapon is their lightsaber. " * 3
+        return protos.GenerateContentResponse(candidates=[{"content": {"role": "model", "parts": [{"text": text}]}}])
+
+    # Mock the SDK's transport, so the real GenerativeModel still validates the generation config.
+    client = mocker.MagicMock()
+    client.generate_content.side_effect = generate_content
+    mocker.patch("google.generativeai.client.get_default_generative_client", return_value=client)
+    session = CouncilSession(TheJediCouncil(model="gemini-1.5-pro"), system="You are Yoda.", budget_tokens=400,
+                             reserve_tokens=50, summarize=True, summary_tokens=123)
+
+    for _ in range(6):
+        assert not session.ask(QUESTION).failed
+
+    assert any(stats.summarized for stats in session.turn_stats)
+    summary_request = next(r for r in requests if r.system_instruction.parts[0].text == SUMMARY_PROMPT)
+    assert summary_request.generation_config.max_output_tokens == 123
+
+
+def test_gemini_keeps_a_bounded_set_of_system_models(mocker):
+    mocker.patch("jedi_council.providers.gemini_provider.SYSTEM_MODEL_CACHE_SIZE", 2)
+    provider = _GeminiProvider(model="gemini-1.5-pro")
+    new_model = mocker.patch.object(provider, "_new_model", side_effect=lambda system: object())
+
+    first, _ = provider._prepare([{"role": "system", "content": "A"}, {"role": "user", "content": "Hi"}])
+    for system in ("B", "A", "C"):
+        provider._prepare([{"role": "system", "content": system}, {"role": "user", "content": "Hi"}])
+
+    assert list(provider._system_models) == ["A", "C"]  # "B" was least recently used
+    assert provider._system_models["A"] is first and new_model.call_count == 3
+
+
+def test_gemini_gets_structured_contents():
+    system, contents = _GeminiProvider._contents([
+        {"role": "system", "content": "You are Yoda."},
+        {"role": "user", "content": "Hi"},
+        {"role": "assistant", "content": "Hello, young one."},
+        {"role": "user", "content": "Teach me."},
+        {"role": "user", "content": "Please."},
+    ])
+    assert system == "You are Yoda."
+    assert contents == [
+        {"role": "user", "parts": ["Hi"]},
+        {"role": "model", "parts": ["Hello, young one."]},
+        {"role": "user", "parts": ["Teach me.", "Please."]},
+    ]
@@ -0,0 +1,90 @@
+import httpx
+import openai
+import pytest
+
+from jedi_council.core import TheJediCouncil, CouncilStream
+from jedi_council.retry import ErrorKind, RetryPolicy
+
+
+def _chunk(mocker, content=None, usage=None):
+    chunk = mocker.MagicMock()
+    chunk.choices = [mocker.MagicMock()] if content is not None else []
+    if content is not None:
+        chunk.choices[0].delta.content = content
+    chunk.usage = usage
+    return chunk
+
+
+def test_stream_wisdom_yields_deltas_then_full_response(mocker):
+    usage = mocker.Mock(prompt_tokens=4, completion_tokens=6)
+    chunks = [_chunk(mocker, "Do"), _chunk(mocker, " or do not."), _chunk(mocker, usage=usage)]
+
+    council = TheJediCouncil(model="gpt-4o")
+    create = mocker.patch.object(council._provider.client.chat.completions, "create", return_value=iter(chunks))
+
+    stream = council.get_wisdom("Teach me", stream=True)
+    assert isinstance(stream, CouncilStream)
+    assert list(stream) == ["Do", " or do not."]
+
+    response = stream.response
+    assert response.text == "Do or do not."
+    assert response.usage.input_tokens == 4
+    assert response.usage.output_tokens == 6
+    assert response.usage.cost > 0
+    assert response.ttft_ms is not None and response.ttft_ms <= response.latency_ms
+    assert create.call_args.kwargs["stream"] is True
+
+
+def test_final_response_drains_stream(mocker):
+    usage = mocker.Mock(prompt_tokens=1, completion_tokens=1)
+    council = TheJediCouncil(model="gpt-4o")
+    mocker.patch.object(council._provider.client.chat.completions, "create",
+                        return_value=iter([_chunk(mocker, "Yes"), _chunk(mocker, usage=usage)]))
+
+    response = council.stream_wisdom("Teach me").final_response()
+    assert response.text == "Yes"
+
+
+def _server_error():
+    request = httpx.Request("POST", "https://api.openai.com/v1/chat/completions")
+    return openai.APIStatusError("down", response=httpx.Response(503, request=request), body=None)
+
+
+def test_stream_setup_is_retried_until_the_first_delta(mocker):
+    usage = mocker.Mock(prompt_tokens=1, completion_tokens=1)
+    council = TheJediCouncil(model="gpt-4o", retry_policy=RetryPolicy(max_attempts=3))
+    sleep = mocker.patch("jedi_council.core.time.sleep")
+    mocker.patch.object(council._provider.client.chat.completions, "create",
+                        side_effect=[_server_error(), iter([_chunk(mocker, "Yes"), _chunk(mocker, usage=usage)])])
+
+    response = council.stream_wisdom("Teach me").final_response()
+
+    assert response.text == "Yes" and response.attempts == 2 and sleep.call_count == 1
+    assert council._provider.circuit_breaker.failures == 0  # Reset by the success
+
+
+def test_stream_that_keeps_failing_yields_a_failed_response(mocker):
+    council = TheJediCouncil(model="gpt-4o", retry_policy=RetryPolicy(max_attempts=2))
+    mocker.patch("jedi_council.core.time.sleep")
+    mocker.patch.object(council._provider.client.chat.completions, "create", side_effect=_server_error())
+
+    stream = council.stream_wisdom("Teach me")
+
+    assert list(stream) == []
+    assert stream.response.failed and stream.response.error.kind is ErrorKind.RETRYABLE
+    assert stream.response.attempts == 2 and council._provider.circuit_breaker.failures == 2
+
+
+def test_failure_after_the_first_delta_is_raised(mocker):
+    council = TheJediCouncil(model="gpt-4o")
+
+    def chunks():
+        yield _chunk(mocker, "Do")
+        raise _server_error()
+    mocker.patch.object(council._provider.client.chat.completions, "create", return_value=chunks())
+
+    stream = iter(council.stream_wisdom("Teach me"))
+    assert next(stream) == "Do"
+    with pytest.raises(openai.APIStatusError):
+        next(stream)
+    assert council._provider.circuit_breaker.failures == 1